@@ -1,81 +1,30 @@
 import cv2
 import customtkinter as ctk
-from tkinter import messagebox
+from tkinter import messagebox, filedialog
 from PIL import Image, ImageDraw
 from customtkinter import CTkImage
-import requests # <-- ADDED: For HIBP check
-import hashlib # <-- ADDED: For HIBP check (SHA-1 hashing)
-from zxcvbn import zxcvbn # <-- ADDED: For password strength
-import random # <-- ADDED: For password generation
-import string # <-- ADDED: For password generation
-
-
-# --------------------- HIBP Checker Function ---------------------
-def check_hibp(password):
-    """Checks if a password has been pwned using the HIBP API."""
-    sha1pass = hashlib.sha1(password.encode('utf-8')).hexdigest().upper()
-    prefix = sha1pass[:5]
-    suffix = sha1pass[5:]
-    url = f'https://api.pwnedpasswords.com/range/{prefix}'
-    
-    try:
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            hashes = (line.split(':') for line in response.text.splitlines())
-            for h, count in hashes:
-                if h == suffix:
-                    return int(count)
-            return 0
-        else:
-            print(f"HIBP API error: Status code {response.status_code}")
-            return -1 # Error indicator
-    except requests.exceptions.RequestException as e:
-        print(f"HIBP connection error: {e}")
-        return -2 # Connection error indicator
-
-
-# --------------------- Password Strength Checker Function ---------------------
-def check_password_strength(password):
-    """
-    Evaluates password strength using zxcvbn.
-    Returns a score (0-4) and a suggestion string.
-    """
-    if not password:
-        return 0, "Password is empty."
-    results = zxcvbn(password)
-    score = results['score']
-    
-    if score == 0:
-        suggestion = "Very Weak (Only 1 or 2 distinct characters or short length)"
-    elif score == 1:
-        suggestion = "Weak (Short, simple, or common patterns)"
-    elif score == 2:
-        suggestion = "Fair (Better mix, but could be longer or more complex)"
-    elif score == 3:
-        suggestion = "Good (Long, varied characters, not easily guessed)"
-    elif score == 4:
-        suggestion = "Strong (Excellent combination of length and complexity)"
-    else:
-        suggestion = "Unknown Strength"
-
-    return score, suggestion
-
-
-# --------------------- Password Generator Function ---------------------
-def generate_password(length=16):
-    """Generates a secure, random password."""
-    chars = string.ascii_letters + string.digits + string.punctuation
-    # Ensure at least one of each type for strength
-    password = [
-        random.choice(string.ascii_lowercase),
-        random.choice(string.ascii_uppercase),
-        random.choice(string.digits),
-        random.choice(string.punctuation)
-    ]
-    # Fill the rest of the length randomly
-    password += [random.choice(chars) for _ in range(length - len(password))]
-    random.shuffle(password)
-    return "".join(password)
+import csv
+import os
+import queue
+import sys
+import threading
+from credcore import check_hibp, check_password_strength, open_vault, tracing
+from credcore.importer import iter_file_chunks
+from credcore.policy import DEFAULT_POLICY
+from credcore.reaudit import BreachReauditor
+from credcore.retention import PURGE_INTERVAL
+from credcore.scoring import BulkScorer
+from credcore.strength import STRENGTH_COLORS
+from credcore.tracing import span, traced, tracer
+from screens import SCREEN_CACHE_SIZE, ChunkedRenderer, IdleBuilder, ScreenCache, run_steps
+
+SUB_SCREENS = ("passkeys", "wifi", "codes", "deleted")
+REAUDIT_TICK_MS = 1000  # how often the background breach re-audit gets a turn
+PERF_REFRESH_MS = 500  # performance overlay update interval
+PAGE_SIZE = 200  # rows per sub-screen page; only this many are fetched and rendered
+REPORT_MAX_LINES = 1000  # items listed per report section; a longer text box makes Tk crawl
+CHANGES_POLL_MS = 200  # how often changes pushed by the vault daemon are picked up
+PREBUILD_SCREENS = True  # build the likely next screen while idle on the main screen
 
 
 # --------------------- Splash Video ---------------------
@@ -104,6 +53,7 @@ def play_video(video_path="C:/Users/HP/Downloads/creadlocklogo.mp4"):
 
 
 # --------------------- Gradient Creation ---------------------
+@traced("create_gradient")
 def create_gradient(width, height, start_color, end_color):
     gradient = Image.new("RGB", (width, height), color=0)
     draw = ImageDraw.Draw(gradient)
@@ -116,21 +66,48 @@ def create_gradient(width, height, start_color, end_color):
     return gradient
 
 
+# --------------------- Window Helpers ---------------------
+def maximize(window):
+    """state("zoomed") on Windows and macOS; Tk on X11 rejects that state and has a -zoomed attribute instead."""
+    if window.tk.call("tk", "windowingsystem") == "x11":
+        window.attributes("-zoomed", True)
+    else:
+        window.state("zoomed")
+
+
 # --------------------- Main App ---------------------
 class App(ctk.CTk):
-    def __init__(self):
+    def __init__(self, vault=None):
         super().__init__()
         self.withdraw()  # hide root until login succeeds
         self.overrideredirect(True)  # stop flashing small window
         self.after(0, self.withdraw)
 
-        self.screens = {}
+        self.screens = ScreenCache(self.build_screen, capacity=SCREEN_CACHE_SIZE)
+        self.idle_builder = IdleBuilder(self)
+        self.renderer = ChunkedRenderer(self)
         self.history = []
         self.history_index = -1
 
-        # Storage
-        self.data = {"wifi": [], "passkeys": [], "codes": []}
-        self.deleted = {"usernames": [], "codes": []}
+        # Storage: in memory, or SQLite when CREDLOCK_VAULT_DB names a database file,
+        # unless a vault daemon connection is passed in (see __main__)
+        self.vault = vault if vault is not None else open_vault(os.environ.get("CREDLOCK_VAULT_DB"))
+        self.data = self.vault.data
+        self.deleted = self.vault.deleted
+        self.index = self.vault.index
+        self.audit_results = {}
+        self.scorer = BulkScorer()  # worker processes start on the first audit
+        self.purge_job = self.after(PURGE_INTERVAL * 1000, self.purge_expired)
+        self.reauditor = None  # started by unlocked(); no HIBP traffic while the lock screen shows
+        self.reaudit_job = None
+        self.changes_job = None
+        if hasattr(self.vault, "changes"):
+            self.changes_job = self.after(CHANGES_POLL_MS, self.apply_remote_changes)
+
+        # F12 shows live hot-path timings (and traces while the overlay is open)
+        self.perf_window = None
+        self.trace_by_default = tracer.enabled
+        self.bind_all("<F12>", self.toggle_perf_overlay, add="+")
 
         self.protocol("WM_DELETE_WINDOW", self.close_app)
 
@@ -146,7 +123,7 @@ class App(ctk.CTk):
     # ---------------- Main Screen ----------------
     def main_screen(self):
         window = ctk.CTkToplevel(self)
-        window.state("zoomed")
+        maximize(window)
         window.configure(fg_color="white")
         window.title("Credlock - Main")
         window.protocol("WM_DELETE_WINDOW", self.close_app)
@@ -164,6 +141,24 @@ class App(ctk.CTk):
         except Exception as e:
             print("Image not found:", e)
 
+        # Export / Backup / Report buttons
+        tools_frame = ctk.CTkFrame(window, fg_color="white")
+        tools_frame.pack(fill="x", padx=20)
+        for text, command in (("Backup", self.backup_vault), ("Export", self.export_vault),
+                              ("Reused", self.show_reuse_report), ("Similar", self.show_similarity_report)):
+            ctk.CTkButton(
+                tools_frame,
+                text=text,
+                width=110,
+                height=35,
+                corner_radius=15,
+                fg_color="#5a5a5a",
+                hover_color="#3c3c3c",
+                text_color="white",
+                font=("Arial", 14, "bold"),
+                command=command,
+            ).pack(side="right", padx=5)
+
         # Search bar
         search_frame = ctk.CTkFrame(window, fg_color="white")
         search_frame.pack(fill="x", pady=10)
@@ -229,15 +224,28 @@ class App(ctk.CTk):
         return window
 
     # ---------------- Sub Screens ----------------
+    @traced("sub_screen")
     def sub_screen(self, name):
+        return run_steps(self.sub_screen_steps(name))
+
+    def sub_screen_steps(self, name, hidden=False):
+        """
+        Builds a category screen one piece per step; each `yield` hands control
+        back to the idle builder so prebuilding never blocks input for long.
+        """
         window = ctk.CTkToplevel(self)
-        window.state("zoomed")
+        if hidden:
+            window.withdraw()
+        else:
+            maximize(window)
         window.configure(fg_color="white")
         window.title(f"Credlock - {name.capitalize()}")
         window.protocol("WM_DELETE_WINDOW", self.close_app)
+        yield
 
         # Gradient bar
         self.gradient_bar(window, 100)
+        yield
 
         # Frame for Back and Create buttons
         button_frame = ctk.CTkFrame(window, fg_color="white")
@@ -274,6 +282,38 @@ class App(ctk.CTk):
             )
             create_btn.pack(side="right")
 
+            # Import button
+            import_btn = ctk.CTkButton(
+                button_frame,
+                text="Import CSV",
+                width=130,
+                height=40,
+                corner_radius=20,
+                fg_color="#5a5a5a",
+                hover_color="#3c3c3c",
+                text_color="white",
+                font=("Arial", 16, "bold"),
+                command=lambda n=name: self.import_credentials(n),
+            )
+            import_btn.pack(side="right", padx=10)
+
+        # Audit button
+        if name in ["wifi", "passkeys"]:
+            audit_btn = ctk.CTkButton(
+                button_frame,
+                text="Audit Strength",
+                width=130,
+                height=40,
+                corner_radius=20,
+                fg_color="#5a5a5a",
+                hover_color="#3c3c3c",
+                text_color="white",
+                font=("Arial", 16, "bold"),
+                command=lambda n=name: self.audit_strength(n),
+            )
+            audit_btn.pack(side="right", padx=10)
+        yield
+
         # Search bar
         search_frame = ctk.CTkFrame(window, fg_color="white")
         search_frame.pack(fill="x", pady=10)
@@ -286,6 +326,35 @@ class App(ctk.CTk):
         )
         search_entry.pack(pady=5)
 
+        # Selection bar (multi-select delete / restore)
+        select_frame = ctk.CTkFrame(window, fg_color="white")
+        select_frame.pack(fill="x", padx=20)
+        window.selected = {}
+        window.row_vars = {}
+        window.rows = {}  # name -> row frame, so a single row can be flagged in place
+        window.select_all = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(select_frame, text="Select all", variable=window.select_all, text_color="black",
+                        command=lambda: self.toggle_select_all(name, window)).pack(side="left", padx=10)
+        ctk.CTkButton(
+            select_frame,
+            text="Restore selected" if name == "deleted" else "Delete selected",
+            fg_color="green" if name == "deleted" else "red",
+            text_color="white",
+            command=lambda: self.apply_selection(name, window),
+        ).pack(side="left", padx=10)
+        window.page = 0
+        window.next_btn = ctk.CTkButton(select_frame, text="▶", width=40,
+                                        command=lambda: self.go_page(name, window, 1))
+        window.next_btn.pack(side="right", padx=(0, 10))
+        window.page_label = ctk.CTkLabel(select_frame, text="Page 1", text_color="black")
+        window.page_label.pack(side="right", padx=5)
+        window.prev_btn = ctk.CTkButton(select_frame, text="◀", width=40,
+                                        command=lambda: self.go_page(name, window, -1))
+        window.prev_btn.pack(side="right", padx=(10, 0))
+        if name == "deleted":
+            ctk.CTkButton(select_frame, text="Purge all", fg_color="black", text_color="white",
+                          command=self.purge_all_deleted).pack(side="right", padx=10)
+
         # Content frame
         content = ctk.CTkFrame(window, fg_color="white")
         content.pack(expand=True, fill="both", padx=20, pady=20)
@@ -293,8 +362,10 @@ class App(ctk.CTk):
         window.search_entry = search_entry
 
         # Bind search
-        search_entry.bind("<KeyRelease>", lambda e, cat=name: self.refresh_screen(cat))
-        self.refresh_screen(name)
+        search_entry.bind("<KeyRelease>", lambda e, cat=name: self.search_screen(cat))
+        yield
+
+        self.render_screen(name, window)
         return window
 
     # ---------------- Show No Pass Image ----------------
@@ -341,36 +412,70 @@ class App(ctk.CTk):
             
             hibp_label = ctk.CTkLabel(frm, text="", text_color="grey", font=("Arial", 10))
             hibp_label.place(relx=0.5, y=200, anchor="center")
-            
+
+            reuse_label = ctk.CTkLabel(frm, text="", text_color="grey", font=("Arial", 10))
+            reuse_label.place(relx=0.5, y=218, anchor="center")
+
+            def describe(keys):
+                names = ", ".join(f"{name} ({cat})" for cat, name in keys[:3])
+                more = f" and {len(keys) - 3} more" if len(keys) > 3 else ""
+                return names + more
+
+            def update_reuse_info():
+                # Digest and LSH bucket lookups, cheap enough to run on every keystroke
+                # (an SQLite vault gives no similarity hints until its index is built in the background)
+                password = password_entry.get()
+                users = self.vault.reuse.users(password) if password else []
+                similar = self.vault.similar.similar(password) if password else []
+                if users:
+                    reuse_label.configure(text=f"⚠️ Already used by {describe(users)}", text_color="red")
+                elif similar:
+                    keys = [key for key, _ in similar]
+                    reuse_label.configure(text=f"Similar to the password of {describe(keys)}", text_color="orange")
+                else:
+                    reuse_label.configure(text="", text_color="grey")
+
             def update_password_info(event=None):
                 password = password_entry.get()
+                update_reuse_info()
                 score, suggestion = check_password_strength(password)
                 
                 # Update Strength Label
-                color = ["red", "orange", "pink", "green", "dark green"][min(score, 4)]
+                color = STRENGTH_COLORS[min(score, 4)]
                 strength_label.configure(text=f"Strength: {suggestion}", text_color=color)
 
-                # Update HIBP Label (Run in a thread for non-blocking UI if this were a production app)
-                # For this example, we'll run it directly but note it might briefly block the UI.
+                # Update HIBP Label off the Tk thread; no retries, the next key press checks again anyway
                 if len(password) >= 8 and score >= 2: # Only check if it's potentially strong enough
                     hibp_label.configure(text="Checking HIBP...", text_color="blue")
-                    count = check_hibp(password)
-                    if count > 0:
-                        hibp_label.configure(text=f"⚠️ Pwned {count} times! Change ASAP!", text_color="red")
-                    elif count == 0:
-                        hibp_label.configure(text="✅ Not found in public breaches.", text_color="green")
-                    else:
-                        hibp_label.configure(text="HIBP check failed.", text_color="grey")
+
+                    def show_hibp(count, error):
+                        if not hibp_label.winfo_exists() or password_entry.get() != password:
+                            return  # window closed or the user kept typing; a newer check owns the label
+                        if error is None and count > 0:
+                            hibp_label.configure(text=f"⚠️ Pwned {count} times! Change ASAP!", text_color="red")
+                        elif error is None and count == 0:
+                            hibp_label.configure(text="✅ Not found in public breaches.", text_color="green")
+                        else:
+                            hibp_label.configure(text="HIBP check failed.", text_color="grey")
+
+                    self.run_in_background(lambda: check_hibp(password, retries=0), show_hibp)
                 else:
                     hibp_label.configure(text="", text_color="grey")
 
             password_entry.bind("<KeyRelease>", update_password_info)
             
+            generated = {"password": None}
+
             def generate_and_set_password():
-                new_pass = generate_password(length=16) # Use a good default length
+                # The policy guarantees the entropy, so zxcvbn and HIBP are skipped for generated output
+                new_pass, _ = DEFAULT_POLICY.generate()
+                generated["password"] = new_pass
                 password_entry.delete(0, 'end')
                 password_entry.insert(0, new_pass)
-                update_password_info()
+                score, suggestion = DEFAULT_POLICY.describe()
+                strength_label.configure(text=f"Strength: {suggestion}", text_color=STRENGTH_COLORS[score])
+                hibp_label.configure(text="", text_color="grey")
+                update_reuse_info()
 
             generate_btn = ctk.CTkButton(
                 frm,
@@ -390,12 +495,17 @@ class App(ctk.CTk):
                 p = password_entry.get().strip()
                 if u and p:
                     # Optional: Add a check to prevent saving pwned/weak passwords
-                    score, _ = check_password_strength(p)
+                    if p == generated["password"]:
+                        score, _ = DEFAULT_POLICY.describe()
+                    else:
+                        score, _ = check_password_strength(p)
                     if score < 2:
                         messagebox.showwarning("Warning", "The password strength is weak. Please consider generating a stronger one.")
                         # Could add a return here, but letting the user override for now.
-                    
-                    self.data[category].append((u, p))
+                    if self.vault.reuse.users(p):
+                        messagebox.showwarning("Warning", "This password is already used by another entry in the vault.")
+
+                    self.vault.add(category, u, p)
                     self.refresh_screen(category)
                     create_window.destroy()
 
@@ -418,7 +528,7 @@ class App(ctk.CTk):
                 n = name_entry.get().strip()
                 v = value_entry.get().strip()
                 if n and v:
-                    self.data["codes"].append((n, v))
+                    self.vault.add("codes", n, v)
                     self.refresh_screen("codes")
                     create_window.destroy()
 
@@ -426,131 +536,562 @@ class App(ctk.CTk):
                           width=220, command=save_action).place(relx=0.5, y=180, anchor="center")
 
     # ---------------- Refresh Screens ----------------
+    @traced("refresh_screen")
     def refresh_screen(self, category):
         if category not in self.screens:
             return
-        window = self.screens[category]
+        self.render_screen(category, self.screens[category])
+
+    def search_screen(self, category):
+        """A new query starts again from the first page."""
+        if category in self.screens:
+            self.screens[category].page = 0
+        self.refresh_screen(category)
+
+    def go_page(self, category, window, step):
+        window.page = max(window.page + step, 0)
+        self.render_screen(category, window)
+
+    def render_screen(self, category, window):
+        """
+        Rebuilds the rows of the current page through the chunked renderer: the
+        first screenful right away, the rest in frame-sized batches. A newer
+        query cancels a render that is still in progress. Only the page is
+        fetched from the vault (one row more tells whether a next page exists).
+        """
+        self.renderer.cancel(category)
         for w in window.content.winfo_children():
             w.destroy()
+        window.selected.clear()
+        window.row_vars.clear()
+        window.rows.clear()
+        window.select_all.set(False)
 
-        query = window.search_entry.get().lower()
-        items = []
-
+        query = window.search_entry.get()
+        offset = window.page * PAGE_SIZE
         if category == "deleted":
-            for u, p, src in self.deleted["usernames"]:
-                if query in u.lower():
-                    items.append(("user", u, p, src))
-            for n, v in self.deleted["codes"]:
-                if query in n.lower():
-                    items.append(("code", n, v))
-            if not items:
-                self.show_no_pass(window.content)
-                return
-
-            for item in items:
-                row = ctk.CTkFrame(window.content, fg_color="white")
-                row.pack(fill="x", pady=5)
-                if item[0] == "user":
-                    u, p, src = item[1], item[2], item[3]
-                    ctk.CTkLabel(row, text=u, anchor="w", font=("Arial", 14),
-                                 text_color="black").pack(side="left", padx=10, fill="x", expand=True)
-                    ctk.CTkButton(row, text="Restore", fg_color="green", text_color="white",
-                                  command=lambda user=u, pw=p, s=src: self.restore_item(user, pw, s)).pack(side="right", padx=5)
-                else:
-                    n, v = item[1], item[2]
-                    ctk.CTkLabel(row, text=f"{n}: {v}", anchor="w", font=("Arial", 14),
-                                 text_color="black").pack(side="left", padx=10, fill="x", expand=True)
-                    ctk.CTkButton(row, text="Restore", fg_color="green", text_color="white",
-                                  command=lambda name=n, val=v: self.restore_code(name, val)).pack(side="right", padx=5)
+            items = list(self.vault.search_deleted(query, offset, PAGE_SIZE + 1))
+            make_row = lambda parent, item: self.deleted_row(window, parent, item)
+        else:
+            items = list(self.vault.search(category, query, offset, PAGE_SIZE + 1))
+            make_row = lambda parent, item: self.data_row(category, window, parent, item)
+        if not items and window.page:
+            # The page emptied (deletes, purges): show the last page that has rows
+            window.page -= 1
+            return self.render_screen(category, window)
+        window.page_label.configure(text=f"Page {window.page + 1}")
+        window.prev_btn.configure(state="normal" if window.page else "disabled")
+        window.next_btn.configure(state="normal" if len(items) > PAGE_SIZE else "disabled")
+        del items[PAGE_SIZE:]
+
+        self.renderer.render(category, window.content, items, make_row,
+                             on_empty=lambda: self.show_no_pass(window.content))
+
+    def select_box(self, window, row, item):
+        var = ctk.BooleanVar(value=item in window.selected)
+        window.row_vars[item] = var
+        ctk.CTkCheckBox(row, text="", width=24, variable=var,
+                        command=lambda: self.toggle_selected(window, item, var.get())).pack(side="left", padx=(5, 0))
+
+    def deleted_row(self, window, parent, item):
+        row = ctk.CTkFrame(parent, fg_color="white")
+        row.pack(fill="x", pady=5)
+        self.select_box(window, row, item)
+        if item[0] == "user":
+            u, p, src = item[1], item[2], item[3]
+            ctk.CTkLabel(row, text=u, anchor="w", font=("Arial", 14),
+                         text_color="black").pack(side="left", padx=10, fill="x", expand=True)
+            ctk.CTkButton(row, text="Restore", fg_color="green", text_color="white",
+                          command=lambda user=u, pw=p, s=src: self.restore_item(user, pw, s)).pack(side="right", padx=5)
+        else:
+            n, v = item[1], item[2]
+            ctk.CTkLabel(row, text=f"{n}: {v}", anchor="w", font=("Arial", 14),
+                         text_color="black").pack(side="left", padx=10, fill="x", expand=True)
+            ctk.CTkButton(row, text="Restore", fg_color="green", text_color="white",
+                          command=lambda name=n, val=v: self.restore_code(name, val)).pack(side="right", padx=5)
+        return row
+
+    def data_row(self, category, window, parent, item):
+        row = ctk.CTkFrame(parent, fg_color="white")
+        row.pack(fill="x", pady=5)
+        self.select_box(window, row, item)
+        if category in ["wifi", "passkeys"]:
+            u, p = item
+            window.rows[u] = row
+            ctk.CTkButton(row, text=u, anchor="w", font=("Arial", 14),
+                          text_color="black", fg_color="#f8f8f8", hover_color="#e0e0e0",
+                          command=lambda usr=u: print("Clicked", usr)).pack(side="left", padx=10, fill="x", expand=True)
+            ctk.CTkButton(row, text="Delete", fg_color="red", text_color="white",
+                          command=lambda usr=u, pw=p, cat=category: self.delete_item(usr, pw, cat)).pack(side="right", padx=5)
+            pwned = self.audit_results.get((category, u), {}).get("pwned")
+            if pwned and pwned > 0:
+                self.pwned_badge(row, pwned)
+        elif category == "codes":
+            n, v = item
+            ctk.CTkLabel(row, text=f"{n}: {v}", anchor="w", font=("Arial", 14),
+                         text_color="black").pack(side="left", padx=10, fill="x", expand=True)
+            ctk.CTkButton(row, text="Delete", fg_color="red", text_color="white",
+                          command=lambda name=n, val=v: self.delete_code(name, val)).pack(side="right", padx=5)
+        return row
+
+    def pwned_badge(self, row, count):
+        """Shows a row's breach count; a row keeps one badge, later counts update its text."""
+        text = f"⚠️ Pwned {count} times"
+        badge = getattr(row, "pwned_label", None)
+        if badge is not None:
+            badge.configure(text=text)
             return
+        row.pwned_label = ctk.CTkLabel(row, text=text, font=("Arial", 12), text_color="red")
+        row.pwned_label.pack(side="right", padx=5)
 
-        for item in self.data[category]:
-            name = item[0]
-            if query in name.lower():
-                items.append(item)
-
+    # ---------------- Multi-select ----------------
+    def toggle_selected(self, window, item, selected):
+        if selected:
+            window.selected[item] = item
+        else:
+            window.selected.pop(item, None)
+
+    def toggle_select_all(self, category, window):
+        """Selects every item matching the search, including rows not rendered yet."""
+        window.selected.clear()
+        if window.select_all.get():
+            query = window.search_entry.get()
+            items = self.vault.search_deleted(query) if category == "deleted" else self.vault.search(category, query)
+            window.selected.update((item, item) for item in items)
+        for item, var in window.row_vars.items():
+            var.set(item in window.selected)
+
+    def apply_selection(self, category, window):
+        items = list(window.selected)
         if not items:
-            self.show_no_pass(window.content)
             return
+        if category == "deleted":
+            self.restore_many(items)
+        else:
+            self.delete_many(category, items)
+
+    def delete_many(self, category, items):
+        """Deletes many (name, secret) items with one data pass and one refresh per screen."""
+        self.vault.delete_many(category, items)
+        self.refresh_screen(category)
+        self.refresh_screen("deleted")
 
-        for item in items:
-            row = ctk.CTkFrame(window.content, fg_color="white")
-            row.pack(fill="x", pady=5)
-            if category in ["wifi", "passkeys"]:
-                u, p = item
-                ctk.CTkButton(row, text=u, anchor="w", font=("Arial", 14),
-                              text_color="black", fg_color="#f8f8f8", hover_color="#e0e0e0",
-                              command=lambda usr=u: print("Clicked", usr)).pack(side="left", padx=10, fill="x", expand=True)
-                ctk.CTkButton(row, text="Delete", fg_color="red", text_color="white",
-                              command=lambda usr=u, pw=p, cat=category: self.delete_item(usr, pw, cat)).pack(side="right", padx=5)
-            elif category == "codes":
-                n, v = item
-                ctk.CTkLabel(row, text=f"{n}: {v}", anchor="w", font=("Arial", 14),
-                             text_color="black").pack(side="left", padx=10, fill="x", expand=True)
-                ctk.CTkButton(row, text="Delete", fg_color="red", text_color="white",
-                              command=lambda name=n, val=v: self.delete_code(name, val)).pack(side="right", padx=5)
+    def restore_many(self, items):
+        """Restores many Deleted-screen items with one pass over the bin and one refresh per screen."""
+        restores = [(item[3], item[1], item[2]) if item[0] == "user" else ("codes", item[1], item[2])
+                    for item in items]
+        self.vault.restore_many(restores)
+        for category in {category for category, _, _ in restores}:
+            self.refresh_screen(category)
+        self.refresh_screen("deleted")
 
     # ---------------- Delete & Restore ----------------
     def delete_item(self, username, password, category):
-        self.data[category] = [x for x in self.data[category] if x[0] != username]
-        self.deleted["usernames"].append((username, password, category))
+        self.vault.delete(category, username, password)
         self.refresh_screen(category)
         self.refresh_screen("deleted")
 
     def restore_item(self, username, password, category):
-        self.deleted["usernames"] = [x for x in self.deleted["usernames"] if x[0] != username]
-        self.data[category].append((username, password))
+        self.vault.restore(category, username, password)
         self.refresh_screen(category)
         self.refresh_screen("deleted")
 
     def delete_code(self, name, value):
-        self.data["codes"] = [x for x in self.data["codes"] if x[0] != name]
-        self.deleted["codes"].append((name, value))
+        self.vault.delete("codes", name, value)
         self.refresh_screen("codes")
         self.refresh_screen("deleted")
 
     def restore_code(self, name, value):
-        self.deleted["codes"] = [x for x in self.deleted["codes"] if x[0] != name]
-        self.data["codes"].append((name, value))
+        self.vault.restore("codes", name, value)
         self.refresh_screen("codes")
         self.refresh_screen("deleted")
 
+    # ---------------- Deleted Bin Retention ----------------
+    def purge_expired(self):
+        """Drops bin items past the retention policy, then reschedules itself."""
+        if self.vault.purge_deleted():
+            self.refresh_screen("deleted")
+        self.purge_job = self.after(PURGE_INTERVAL * 1000, self.purge_expired)
+
+    def purge_all_deleted(self):
+        if not len(self.deleted):
+            return
+        if not messagebox.askyesno("Purge", f"Permanently remove all {len(self.deleted)} deleted items?"):
+            return
+        old = self.vault.purge_all_deleted()  # O(1) swap; freeing the tombstones happens off the UI thread
+        threading.Thread(target=old.clear, daemon=True).start()
+        self.refresh_screen("deleted")
+
+    # ---------------- Vault Daemon ----------------
+    def apply_remote_changes(self):
+        """Refreshes the screens another client changed through the daemon, then reschedules itself."""
+        changed = set()
+        while True:
+            try:
+                changed.update(self.vault.changes.get_nowait())
+            except queue.Empty:
+                break
+        for category in changed:
+            self.refresh_screen(category)
+        self.changes_job = self.after(CHANGES_POLL_MS, self.apply_remote_changes)
+
+    # ---------------- Background Breach Re-audit ----------------
+    def unlocked(self):
+        """Called once the login succeeds: starts the breach re-audit."""
+        if self.reauditor is not None:
+            return
+        self.reauditor = BreachReauditor(self.vault)
+        for category, name, count in self.reauditor.known_pwned():  # the schedule is kept in the store
+            self.audit_results.setdefault((category, name), {})["pwned"] = count
+        self.reaudit_job = self.after(REAUDIT_TICK_MS, self.reaudit_tick)
+
+    def reaudit_tick(self):
+        """Gives the re-auditor a turn unless the user is typing, and flags newly pwned rows in place."""
+        if self.idle_builder.idle():
+            for category, name, count in self.reauditor.step():
+                self.audit_results.setdefault((category, name), {})["pwned"] = count
+                window = self.screens.get(category)
+                row = window.rows.get(name) if window is not None else None
+                if row is not None and row.winfo_exists():
+                    self.pwned_badge(row, count)
+        self.reaudit_job = self.after(REAUDIT_TICK_MS, self.reaudit_tick)
+
+    # ---------------- Bulk Import ----------------
+    def import_credentials(self, category):
+        path = filedialog.askopenfilename(
+            title="Import credentials",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+        audit = messagebox.askyesno(
+            "Import",
+            "Also check strength and public breaches for the imported passwords?\n"
+            "This runs in the background and may take a while for large files.",
+        )
+        importer = self.vault.importer(
+            category,
+            iter_file_chunks(path),
+            check_strength=check_password_strength if audit else None,
+            check_breach=check_hibp if audit else None,
+        )
+        self.after(0, lambda: self.import_step(importer))
+
+    def import_step(self, importer):
+        """Inserts one batch and refreshes the screen once, then yields back to Tk."""
+        if importer.busy():
+            self.after(50, lambda: self.import_step(importer))
+            return
+        failed = True
+        try:
+            fresh = importer.step()
+            failed = False
+        except (OSError, UnicodeDecodeError, csv.Error) as e:  # unreadable or malformed file
+            messagebox.showerror("Import", f"Import failed: {e}")
+            return
+        finally:
+            if failed:  # whatever went wrong, stop the reader and the worker pool
+                importer.close()
+        if fresh is None:
+            self.after(0, lambda: self.import_finish(importer))
+            return
+        if fresh:
+            self.refresh_screen(importer.category)
+        self.after(1, lambda: self.import_step(importer))
+
+    def import_finish(self, importer):
+        if not importer.audit_finished():
+            self.after(200, lambda: self.import_finish(importer))
+            return
+        importer.close()
+        self.audit_results.update(importer.audit_results)
+        summary = f"Imported {importer.imported} entries, skipped {importer.skipped} duplicates."
+        if importer.audit_results:
+            weak = sum(1 for r in importer.audit_results.values() if r["score"] is not None and r["score"] < 2)
+            pwned = sum(1 for r in importer.audit_results.values() if r["pwned"] and r["pwned"] > 0)
+            summary += f"\n{weak} weak passwords, {pwned} found in public breaches."
+        messagebox.showinfo("Import", summary)
+
+    # ---------------- Strength Audit ----------------
+    def audit_strength(self, category):
+        """Scores every entry of a category on the worker processes with a live progress bar."""
+        items = list(self.data[category])
+        if not items:
+            messagebox.showinfo("Audit", "Nothing to audit yet.")
+            return
+
+        popup = ctk.CTkToplevel(self)
+        popup.geometry("420x140+400+300")
+        popup.title("Audit")
+        popup.configure(fg_color="white")
+        status = ctk.CTkLabel(popup, text=f"Scoring 0 / {len(items)}", text_color="black", font=("Arial", 14))
+        status.pack(pady=(25, 10))
+        progress = ctk.CTkProgressBar(popup, width=340)
+        progress.set(0)
+        progress.pack()
+
+        batches = queue.Queue()
+        scored = {"count": 0, "weak": 0}
+
+        def work():
+            for batch in self.scorer.score(secret for _, secret in items):
+                batches.put(batch)
+
+        def drain():
+            while not batches.empty():
+                for index, score, _ in batches.get():
+                    self.audit_results.setdefault((category, items[index][0]), {})["score"] = score
+                    scored["count"] += 1
+                    scored["weak"] += score < 2
+            if popup.winfo_exists():
+                progress.set(scored["count"] / len(items))
+                status.configure(text=f"Scoring {scored['count']} / {len(items)}")
+
+        def tick():
+            drain()
+            if scored["count"] < len(items) and popup.winfo_exists():
+                self.after(100, tick)
+
+        def done(_, error):
+            drain()
+            if popup.winfo_exists():
+                popup.destroy()
+            if error:
+                messagebox.showerror("Audit", f"Audit failed: {error}")
+            else:
+                messagebox.showinfo("Audit", f"{scored['weak']} of {len(items)} passwords are weak.")
+
+        self.after(100, tick)
+        self.run_in_background(work, done)
+
+    # ---------------- Audit Reports ----------------
+    def show_report(self, title, lines):
+        report = ctk.CTkToplevel(self)
+        report.geometry("600x450+300+200")
+        report.title(title)
+        report.configure(fg_color="white")
+        box = ctk.CTkTextbox(report, font=("Arial", 13), fg_color="white", text_color="black")
+        box.pack(expand=True, fill="both", padx=15, pady=15)
+        box.insert("end", "\n".join(lines))
+        box.configure(state="disabled")
+
+    def show_reuse_report(self):
+        groups = self.vault.reuse.groups()
+        if not groups:
+            messagebox.showinfo("Reused Passwords", "No password is used by more than one entry.")
+            return
+        lines = [f"{len(groups)} passwords are shared between entries:", ""]
+        for number, group in enumerate(groups, 1):
+            lines.append(f"{number}. " + ", ".join(f"{name} ({cat})" for cat, name in group))
+        self.show_report("Reused Passwords", lines)
+
+    def show_similarity_report(self):
+        # The report compares thousands of candidates; build it on a worker thread
+        similar = self.vault.similar
+
+        def done(report, error):
+            if error:
+                messagebox.showerror("Similar Passwords", f"Report failed: {error}")
+                return
+            ready, groups, pairs = report
+            if not ready:
+                messagebox.showinfo("Similar Passwords", "The vault is still being indexed; try again in a moment.")
+                return
+            grouped = {key: number for number, group in enumerate(groups) for key in group}
+            pairs = [pair for pair in pairs if pair[0] not in grouped or grouped.get(pair[1]) != grouped[pair[0]]]
+            if not groups and not pairs:
+                messagebox.showinfo("Similar Passwords", "No near-duplicate passwords found.")
+                return
+            lines = []
+            if groups:
+                lines += [f"{len(groups)} groups of many variations of one password:", ""]
+                for number, group in enumerate(groups[:REPORT_MAX_LINES], 1):
+                    lines.append(f"{number}. {len(group)} entries: " +
+                                 ", ".join(f"{name} ({cat})" for cat, name in group[:10]) +
+                                 (" ..." if len(group) > 10 else ""))
+                lines.append("")
+            if pairs:
+                lines += [f"{len(pairs)} pairs of passwords are variations of each other:", ""]
+                for (cat_a, name_a), (cat_b, name_b), score in pairs[:REPORT_MAX_LINES]:
+                    lines.append(f"{name_a} ({cat_a})  ~  {name_b} ({cat_b})   {score:.0%} similar")
+                if len(pairs) > REPORT_MAX_LINES:
+                    lines.append(f"... and {len(pairs) - REPORT_MAX_LINES} more")
+            self.show_report("Similar Passwords", lines)
+
+        self.run_in_background(lambda: (similar.ready, similar.groups(), similar.pairs()), done)
+
+    # ---------------- Export & Backup ----------------
+    def run_in_background(self, work, on_done):
+        """Runs work() on a worker thread and hands (result, error) to on_done on the Tk thread."""
+        outcome = {}
+
+        def target():
+            try:
+                outcome["result"] = work()
+            except Exception as e:
+                outcome["error"] = e
+
+        worker = threading.Thread(target=target, daemon=True)
+        worker.start()
+
+        def poll():
+            if worker.is_alive():
+                self.after(100, poll)
+            else:
+                on_done(outcome.get("result"), outcome.get("error"))
+
+        self.after(100, poll)
+
+    def export_vault(self):
+        path = filedialog.asksaveasfilename(
+            title="Export vault",
+            defaultextension=".jsonl",
+            filetypes=[("JSON lines", "*.jsonl"), ("CSV", "*.csv"),
+                       ("Compressed JSON lines", "*.jsonl.gz"), ("Compressed CSV", "*.csv.gz")],
+        )
+        if not path:
+            return
+
+        def done(count, error):
+            if error:
+                messagebox.showerror("Export", f"Export failed: {error}")
+            else:
+                messagebox.showinfo("Export", f"Exported {count} records to {path}")
+
+        self.run_in_background(
+            lambda: self.vault.export(path), done
+        )
+
+    def backup_vault(self):
+        directory = filedialog.askdirectory(title="Backup folder")
+        if not directory:
+            return
+
+        def done(result, error):
+            if error:
+                messagebox.showerror("Backup", f"Backup failed: {error}")
+            else:
+                path, count = result
+                messagebox.showinfo("Backup", f"Backed up {count} changed records to {path}")
+
+        self.run_in_background(
+            lambda: self.vault.backup(directory), done
+        )
+
+    # ---------------- Performance Overlay ----------------
+    def toggle_perf_overlay(self, event=None):
+        """Opens or closes the live timing window; tracing runs while it is open."""
+        if self.perf_window is not None and self.perf_window.winfo_exists():
+            self.perf_window.destroy()
+            self.perf_window = None
+            tracing.enable(self.trace_by_default)
+            return
+
+        tracing.enable()
+        window = ctk.CTkToplevel(self)
+        window.geometry("640x360+40+40")
+        window.title("Performance")
+        window.attributes("-topmost", True)
+        window.configure(fg_color="white")
+        box = ctk.CTkTextbox(window, font=("Courier New", 13), fg_color="white", text_color="black")
+        box.pack(expand=True, fill="both", padx=10, pady=(10, 0))
+        buttons = ctk.CTkFrame(window, fg_color="white")
+        buttons.pack(fill="x", padx=10, pady=10)
+        ctk.CTkButton(buttons, text="Export trace", command=self.export_trace).pack(side="left", padx=5)
+        ctk.CTkButton(buttons, text="Clear", command=tracer.clear).pack(side="left", padx=5)
+        window.protocol("WM_DELETE_WINDOW", self.toggle_perf_overlay)
+        window.box = box
+        self.perf_window = window
+        self.update_perf_overlay()
+
+    def update_perf_overlay(self):
+        window = self.perf_window
+        if window is None or not window.winfo_exists():
+            return
+        lines = [f"{'name':28}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"]
+        for name, row in sorted(tracer.summary().items()):
+            lines.append(f"{name:28}{row['count']:>7}{row['p50']:>10.2f}{row['p95']:>10.2f}"
+                         f"{row['p99']:>10.2f}{row['max']:>10.2f}")
+        window.box.configure(state="normal")
+        window.box.delete("1.0", "end")
+        window.box.insert("end", "\n".join(lines))
+        window.box.configure(state="disabled")
+        self.after(PERF_REFRESH_MS, self.update_perf_overlay)
+
+    def export_trace(self):
+        path = filedialog.asksaveasfilename(
+            title="Export trace",
+            defaultextension=".json",
+            filetypes=[("Chrome trace", "*.json")],
+        )
+        if not path:
+            return
+        try:
+            count = tracer.export(path)
+        except OSError as e:
+            messagebox.showerror("Export trace", f"Export failed: {e}")
+            return
+        messagebox.showinfo("Export trace", f"Wrote {count} spans to {path}")
+
     # ---------------- Screen Management ----------------
+    def build_screen(self, name):
+        if name == "main":
+            return self.main_screen()
+        if self.idle_builder.pending(name):
+            # Prebuild already under way: finish the remaining steps right now
+            return self.idle_builder.finish(name)
+        return self.sub_screen(name)
+
+    @traced("open_screen")
     def open_screen(self, name):
         if self.history_index >= 0:
             current_name = self.history[self.history_index]
             if current_name in self.screens:
                 self.screens[current_name].withdraw()
 
-        if name not in self.screens:
-            if name == "main":
-                self.screens[name] = self.main_screen()
-            elif name in ["wifi", "passkeys", "codes", "deleted"]:
-                self.screens[name] = self.sub_screen(name)
-
-        self.screens[name].deiconify()
-        self.screens[name].state("zoomed")
+        window = self.screens.open(name)  # builds on a miss, may evict a cold screen
+        window.deiconify()
+        maximize(window)
 
         if self.history_index == -1 or self.history[self.history_index] != name:
             self.history = self.history[: self.history_index + 1]
             self.history.append(name)
             self.history_index += 1
 
+        if name == "main" and PREBUILD_SCREENS:
+            self.after_idle(self.prebuild_likely_screens)
+
+    def prebuild_likely_screens(self):
+        """Queues the most visited category screens that fit in the cache for idle-time building."""
+        for name in self.screens.likely_next(SUB_SCREENS, limit=self.screens.room()):
+            if not self.idle_builder.pending(name):
+                self.idle_builder.submit(name, self.sub_screen_steps(name, hidden=True),
+                                         on_done=lambda window, n=name: self.screens.adopt(n, window))
+
     def go_back(self):
         if self.history_index > 0:
             self.history_index -= 1
             self.open_screen(self.history[self.history_index])
 
     def close_app(self):
-        for win in self.screens.values():
-            win.destroy()
+        self.after_cancel(self.purge_job)
+        if self.reauditor is not None:
+            self.after_cancel(self.reaudit_job)
+            self.reauditor.close()
+        if self.changes_job is not None:
+            self.after_cancel(self.changes_job)
+        self.scorer.close()
+        self.idle_builder.cancel_all()
+        self.renderer.cancel_all()
+        self.screens.clear()
+        self.vault.close()
         self.destroy()
 
 
 # --------------------- Login Window ---------------------
 def login_window(app: ctk.CTk):
     login = ctk.CTkToplevel(app)
-    login.state("zoomed")
+    maximize(login)
     login.title("Login")
     login.geometry("1000x500+300+200")
     login.resizable(False, False)
@@ -648,6 +1189,7 @@ def login_window(app: ctk.CTk):
         if password == "A1@bcdef":
             login.destroy()
             app.deiconify()
+            app.unlocked()
             app.open_screen("main")
         else:
             highlight_error()
@@ -670,7 +1212,25 @@ def login_window(app: ctk.CTk):
 
 # --------------------- Run ---------------------
 if __name__ == "__main__":
-    play_video()  # Splash video
-    app = App()
-    login_window(app)  # Login
+    vault, daemon_running, attach_error = None, False, None
+    if os.environ.get("CREDLOCK_DAEMON") == "1":  # share one vault daemon between windows and scripts
+        from credcore.client import attach_vault
+
+        with span("startup.attach"):
+            try:
+                vault, started = attach_vault(db=os.environ.get("CREDLOCK_VAULT_DB"))
+                daemon_running = not started
+            except (OSError, RuntimeError) as e:  # spawn timeout, refused socket, daemon error
+                attach_error = e  # fall back to opening the vault in this process
+                print(f"Credlock: could not reach the vault daemon ({e}); using the local vault", file=sys.stderr)
+    if not daemon_running:  # a second launch skips the splash and opens straight to login
+        with span("startup.splash"):
+            play_video()  # Splash video
+    with span("startup.app_init"):
+        app = App(vault)
+    with span("startup.login_window"):
+        login_window(app)  # Login
+    if attach_error is not None:
+        app.after(0, lambda: messagebox.showwarning(
+            "Vault daemon", f"Could not reach the vault daemon:\n{attach_error}\n\nUsing the local vault instead."))
     app.mainloop()
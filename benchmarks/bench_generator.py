@@ -0,0 +1,50 @@
+"""
+Passwords/second of the buffered generator against the original
+per-character `random.choice` implementation.
+
+    python -m benchmarks.bench_generator --count 100000 --length 16
+"""
+import argparse
+import random
+import string
+import time
+
+from credcore.generator import generate_passwords
+
+
+def legacy_generate_password(length=16):
+    """The generator as it shipped before the CSPRNG rewrite, kept for comparison."""
+    chars = string.ascii_letters + string.digits + string.punctuation
+    password = [
+        random.choice(string.ascii_lowercase),
+        random.choice(string.ascii_uppercase),
+        random.choice(string.digits),
+        random.choice(string.punctuation)
+    ]
+    password += [random.choice(chars) for _ in range(length - len(password))]
+    random.shuffle(password)
+    return "".join(password)
+
+
+def rate(fn, count):
+    started = time.perf_counter()
+    fn(count)
+    return count / (time.perf_counter() - started)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--length", type=int, default=16)
+    args = parser.parse_args(argv)
+
+    legacy = rate(lambda n: [legacy_generate_password(args.length) for _ in range(n)], args.count)
+    buffered = rate(lambda n: generate_passwords(n, args.length), args.count)
+    single = rate(lambda n: [generate_passwords(1, args.length) for _ in range(n)], min(args.count, 10000))
+    print(f"legacy random.choice : {legacy:12,.0f} passwords/s")
+    print(f"generate_passwords   : {buffered:12,.0f} passwords/s  ({buffered / legacy:.1f}x)")
+    print(f"one-at-a-time        : {single:12,.0f} passwords/s")
+
+
+if __name__ == "__main__":
+    main()
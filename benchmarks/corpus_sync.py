@@ -0,0 +1,116 @@
+"""
+Runs the offline corpus sync (credcore.corpus) against the stand-in server
+twice: a first full download, then a refresh after a fraction of the ranges
+changed, which should cost only 304s for the rest. Also interrupts a sync
+part way and checks that the next run resumes instead of starting over.
+
+    python -m benchmarks.corpus_sync --prefixes 4096 --changed 0.05 --latency-ms 5
+    python -m benchmarks.corpus_sync --prefixes 2048 --error-rate 0.02 --json
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+from credcore.breach import parse_range
+from credcore.corpus import SYNC_BATCH, SYNC_WORKERS, BreachCorpus, CorpusSync, prefix_at
+
+from .hibp_server import RangeDataset, add_fault_arguments, faults_from_args, start_server
+
+
+class Interrupt(Exception):
+    pass
+
+
+def timed_sync(corpus, url, prefixes, workers, batch, progress=None, restart=False):
+    sync = CorpusSync(corpus, url, workers, batch)
+    started = time.perf_counter()
+    try:
+        stats = sync.run(0, prefixes, restart=restart, progress=progress)
+    finally:
+        sync.close()
+    return dict(stats, seconds=time.perf_counter() - started)
+
+
+def mismatches(corpus, dataset, prefixes, sample=200, seed=0):
+    """Sampled ranges whose stored counts differ from what the server would send now."""
+    rng = random.Random(seed)
+    wrong = 0
+    for i in rng.sample(range(prefixes), min(sample, prefixes)):
+        prefix = prefix_at(i)
+        if corpus.range_counts(prefix) != parse_range(dataset.body(prefix)):
+            wrong += 1
+    return wrong
+
+
+def run(args, directory):
+    dataset = RangeDataset(args.seed)
+    server = start_server(faults_from_args(args), dataset)
+    report = {"prefixes": args.prefixes, "workers": args.workers}
+    try:
+        corpus = BreachCorpus(os.path.join(directory, "corpus.db"))
+
+        def stop_half_way(done, total):
+            if done >= total // 2:
+                raise Interrupt
+
+        try:
+            timed_sync(corpus, server.url, args.prefixes, args.workers, args.batch, stop_half_way)
+        except Interrupt:
+            pass
+        cursor = int(corpus.get_meta("sync_cursor", 0))
+        report["interrupted_at"] = cursor
+        served_before = server.stats["served"]
+        report["initial"] = timed_sync(corpus, server.url, args.prefixes, args.workers, args.batch)
+        report["initial"]["served_after_resume"] = server.stats["served"] - served_before
+
+        changed = random.Random(args.seed).sample(range(args.prefixes), int(args.prefixes * args.changed))
+        dataset.touch(prefix_at(i) for i in changed)
+        report["changed"] = len(changed)
+        report["refresh"] = timed_sync(corpus, server.url, args.prefixes, args.workers, args.batch)
+        report["ranges_stored"] = len(corpus)
+        report["db_mb"] = os.path.getsize(corpus.path) / 1e6
+        report["sampled_mismatches"] = mismatches(corpus, dataset, args.prefixes)
+        corpus.close()
+    finally:
+        server.shutdown()
+    report["server"] = dict(server.stats)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--prefixes", type=int, default=4096, help="sync prefixes 00000 up to this many")
+    parser.add_argument("--changed", type=float, default=0.05, help="fraction of ranges changed before the refresh")
+    parser.add_argument("--workers", type=int, default=SYNC_WORKERS)
+    parser.add_argument("--batch", type=int, default=SYNC_BATCH)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    add_fault_arguments(parser)
+    args = parser.parse_args(argv)
+    # request_range logs every failed request; with injected faults that is a lot of lines
+    logging.getLogger("credcore.breach").setLevel(logging.ERROR)
+
+    with tempfile.TemporaryDirectory() as directory:
+        report = run(args, directory)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    print(f"interrupted at {report['interrupted_at']}/{report['prefixes']}, resume downloaded "
+          f"{report['initial']['served_after_resume']} ranges")
+    for name in ("initial", "refresh"):
+        stats = report[name]
+        print(f"{name:8} {stats['seconds']:6.1f}s  {stats['updated']} updated ({stats['bytes'] / 1e6:.1f} MB)  "
+              f"{stats['unchanged']} unchanged  {stats['failed']} failed  {stats['retries']} retries")
+    print(f"{report['changed']} ranges changed, {report['ranges_stored']} stored in {report['db_mb']:.1f} MB, "
+          f"{report['sampled_mismatches']} sampled mismatches")
+    print(f"server {report['server']}")
+    return 0 if report["sampled_mismatches"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Drives the breach-check client (credcore.breach.fetch_range) at a target
+request rate and reports throughput, latency percentiles and retries.
+
+    python -m benchmarks.hibp_loadtest --rate 200 --duration 10 --latency-ms 20 --rate-limit 150
+    python -m benchmarks.hibp_loadtest --url http://127.0.0.1:8765 --rate 50 --json
+
+Without --url a stand-in server (benchmarks/hibp_server.py) is started in
+process with the given fault options.
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from credcore import breach
+
+from .hibp_server import RangeDataset, add_fault_arguments, faults_from_args, start_server
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, round(p / 100 * (len(sorted_values) - 1)))]
+
+
+def run_load(base_url, rate, duration, workers=32):
+    """
+    Open-loop load: request i is due at start + i / rate whatever the earlier
+    ones are doing, so a slow server shows up as latency and lag rather than
+    as a lower offered rate. Returns the report dict.
+    """
+    import requests
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    total = int(rate * duration)
+    latencies = []
+    outcomes = {0: 0, -1: 0, -2: 0}
+    stats = {"retries": 0}
+    lock = threading.Lock()
+    lag = []
+
+    def one(i, due):
+        started = time.perf_counter()
+        prefix = f"{(i * 2654435761) & 0xFFFFF:05X}"  # spread over the prefix space
+        request_stats = {}
+        status, _ = breach.fetch_range(prefix, session, base_url, stats=request_stats)
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            lag.append(started - due)
+            outcomes[status] += 1
+            stats["retries"] += request_stats.get("retries", 0)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        start = time.perf_counter()
+        for i in range(total):
+            due = start + i / rate
+            wait = due - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            pool.submit(one, i, due)
+        offered_seconds = time.perf_counter() - start
+    wall = time.perf_counter() - start
+    session.close()
+
+    latencies.sort()
+    report = {
+        "target_rate": rate,
+        "offered_rate": total / offered_seconds if offered_seconds else None,
+        "requests": total,
+        "ok": outcomes[0],
+        "api_errors": outcomes[-1],
+        "connection_errors": outcomes[-2],
+        "retries": stats["retries"],
+        "throughput": outcomes[0] / wall,
+        "wall_seconds": wall,
+        "latency_ms": {f"p{p}": percentile(latencies, p) * 1000 for p in PERCENTILES} if latencies else {},
+        "max_start_lag_ms": max(lag) * 1000 if lag else None,
+    }
+    if latencies:
+        report["latency_ms"]["mean"] = statistics.fmean(latencies) * 1000
+        report["latency_ms"]["max"] = latencies[-1] * 1000
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="base URL of a running server (default: start a local stand-in)")
+    parser.add_argument("--rate", type=float, default=100, help="target requests per second")
+    parser.add_argument("--duration", type=float, default=5, help="seconds of load")
+    parser.add_argument("--workers", type=int, default=min(64, (os.cpu_count() or 1) * 8))
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    add_fault_arguments(parser)
+    args = parser.parse_args(argv)
+    # fetch_range logs every failed request; with injected faults that is thousands of lines
+    logging.getLogger(breach.__name__).setLevel(logging.ERROR)
+
+    server = None
+    url = args.url
+    if url is None:
+        server = start_server(faults_from_args(args), RangeDataset(args.seed))
+        url = server.url
+    try:
+        report = run_load(url, args.rate, args.duration, args.workers)
+    finally:
+        if server is not None:
+            server.shutdown()
+    if server is not None:
+        report["server"] = dict(server.stats)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    print(f"target {report['target_rate']:.0f} req/s, offered {report['offered_rate']:.1f} req/s, "
+          f"{report['requests']} requests in {report['wall_seconds']:.1f}s")
+    print(f"ok {report['ok']}  api errors {report['api_errors']}  connection errors "
+          f"{report['connection_errors']}  retries {report['retries']}")
+    print(f"throughput {report['throughput']:.1f} ok/s")
+    latency = report["latency_ms"]
+    if latency:
+        print("latency ms  " + "  ".join(f"{name} {value:.1f}" for name, value in latency.items()))
+    if server is not None:
+        print(f"server {report['server']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+"""
+Local stand-in for the HIBP range API, serving /range/{prefix} from a
+generated dataset, with injectable latency, errors, throttling and padding.
+Responses carry an ETag and Last-Modified and honour conditional requests
+(If-None-Match / If-Modified-Since) with 304 Not Modified.
+
+    python -m benchmarks.hibp_server --port 8765 --latency-ms 30 --rate-limit 50
+    CREDLOCK_HIBP_URL=http://127.0.0.1:8765 python Credlock.py
+"""
+import argparse
+import email.utils
+import hashlib
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from credcore.breach import hash_password
+from credcore.reaudit import TokenBucket
+
+PREFIX_PATTERN = re.compile(r"^/range/([0-9A-Fa-f]{5})$")
+RANGE_SIZE = (400, 1100)  # suffixes per generated range, like the real API
+PADDED_SIZE = 1000  # lines in a padded response, at least
+DATASET_EPOCH = 1704067200  # 2024-01-01, Last-Modified of ranges never touched
+# Passwords the stand-in always reports as pwned, so clients have known hits
+KNOWN_PWNED = {"password": 9545824, "123456": 37359195, "qwerty": 10556095, "Summer2024!": 342}
+
+
+# --------------------- Dataset ---------------------
+class RangeDataset:
+    """
+    Deterministic range bodies: the same (seed, prefix, generation) always
+    gives the same suffixes and counts. Known pwned passwords are merged into
+    their ranges. touch() moves ranges to a new generation, as if new breach
+    data had been published for them.
+    """
+
+    def __init__(self, seed=0, pwned=None):
+        self.seed = seed
+        self.pwned = {}
+        for password, count in (KNOWN_PWNED if pwned is None else pwned).items():
+            prefix, suffix = hash_password(password)
+            self.pwned.setdefault(prefix, {})[suffix] = count
+        self.generations = {}  # prefix -> (generation, modified time); absent means (0, DATASET_EPOCH)
+        self.lock = threading.Lock()
+
+    def touch(self, prefixes, when=None):
+        when = int(time.time() if when is None else when)
+        with self.lock:
+            for prefix in prefixes:
+                generation, _ = self.generations.get(prefix.upper(), (0, DATASET_EPOCH))
+                self.generations[prefix.upper()] = (generation + 1, when)
+
+    def version(self, prefix):
+        """(generation, modified time) of a range."""
+        with self.lock:
+            return self.generations.get(prefix.upper(), (0, DATASET_EPOCH))
+
+    def etag(self, prefix, pad=False):
+        generation, _ = self.version(prefix)
+        tag = hashlib.sha1(f"{self.seed}:{prefix.upper()}:{generation}:{pad}".encode()).hexdigest()[:20]
+        return f'"{tag}"'
+
+    def counts(self, prefix):
+        prefix = prefix.upper()
+        generation, _ = self.version(prefix)
+        seed = f"{self.seed}:{prefix}" if not generation else f"{self.seed}:{prefix}:{generation}"
+        rng = random.Random(seed)
+        counts = {}
+        for i in range(rng.randint(*RANGE_SIZE)):
+            suffix = hashlib.sha1(f"{seed}:{i}".encode()).hexdigest()[5:].upper()
+            counts[suffix] = rng.randint(1, 5000)
+        counts.update(self.pwned.get(prefix, {}))
+        return counts
+
+    def body(self, prefix, pad=False):
+        """The response text; padding adds count-0 lines (ignored by clients) up to PADDED_SIZE."""
+        counts = self.counts(prefix)
+        lines = [f"{suffix}:{count}" for suffix, count in sorted(counts.items())]
+        if pad:
+            rng = random.Random(f"pad:{prefix}")
+            while len(lines) < PADDED_SIZE + rng.randint(0, 100):
+                lines.append(f"{rng.getrandbits(140):035X}:0")
+        return "\r\n".join(lines)
+
+
+# --------------------- Fault Injection ---------------------
+class Faults:
+    """
+    latency_ms / jitter_ms - delay before every response
+    error_rate, error_code - fraction of requests answered with that status
+    rate_limit             - requests per second before 429 + Retry-After (None: unlimited)
+    pad                    - always pad, as if every client sent Add-Padding: true
+    """
+
+    def __init__(self, latency_ms=0, jitter_ms=0, error_rate=0.0, error_code=500, rate_limit=None,
+                 retry_after=1, pad=False, seed=0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.retry_after = retry_after
+        self.pad = pad
+        self.bucket = TokenBucket(rate_limit, capacity=max(1, int(rate_limit))) if rate_limit else None
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()  # random.Random and TokenBucket are shared by handler threads
+
+    def delay(self):
+        with self.lock:
+            jitter = self.rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+        return max(self.latency_ms + jitter, 0) / 1000
+
+    def throttled(self):
+        if self.bucket is None:
+            return False
+        with self.lock:
+            return not self.bucket.take()
+
+    def failed(self):
+        with self.lock:
+            return self.error_rate > 0 and self.rng.random() < self.error_rate
+
+
+# --------------------- HTTP Server ---------------------
+class RangeHandler(BaseHTTPRequestHandler):
+    server_version = "CredlockHIBPStandIn/1.0"
+    protocol_version = "HTTP/1.1"  # keep-alive, so pooled clients reuse connections
+
+    def do_GET(self):
+        count = self.server.count
+        count("requests")
+        faults = self.server.faults
+        time.sleep(faults.delay())
+
+        match = PREFIX_PATTERN.match(self.path.split("?", 1)[0])
+        if not match:
+            return self.reply(404, "Not found")
+        if faults.throttled():
+            count("throttled")
+            return self.reply(429, "Rate limit exceeded", {"Retry-After": str(faults.retry_after)})
+        if faults.failed():
+            count("errors")
+            return self.reply(faults.error_code, "Injected error")
+
+        dataset = self.server.dataset
+        prefix = match.group(1)
+        pad = faults.pad or self.headers.get("Add-Padding", "").lower() == "true"
+        _, modified = dataset.version(prefix)
+        validators = {"ETag": dataset.etag(prefix, pad),
+                      "Last-Modified": email.utils.formatdate(modified, usegmt=True)}
+        if self.not_modified(validators["ETag"], modified):
+            count("not_modified")
+            return self.reply(304, "", validators)
+        count("served")
+        self.reply(200, dataset.body(prefix, pad), validators)
+
+    def not_modified(self, etag, modified):
+        """If-None-Match wins over If-Modified-Since, as in RFC 9110."""
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return etag in (tag.strip() for tag in if_none_match.split(",")) or if_none_match.strip() == "*"
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since is None:
+            return False
+        try:
+            since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return modified <= since
+
+    def reply(self, status, text, headers=None):
+        body = text.encode("ascii")
+        self.send_response(status)
+        if status != 304:  # a 304 has no body
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # thousands of requests per load test; the counters say enough
+
+
+def start_server(faults=None, dataset=None, host="127.0.0.1", port=0):
+    """Starts the stand-in on a daemon thread. Returns the server; its base URL is server.url."""
+    server = ThreadingHTTPServer((host, port), RangeHandler)
+    server.daemon_threads = True
+    server.faults = faults or Faults()
+    server.dataset = dataset or RangeDataset()
+    server.stats = {"requests": 0, "served": 0, "not_modified": 0, "throttled": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def count(key):
+        with lock:
+            server.stats[key] += 1
+
+    server.count = count
+    server.url = f"http://{host}:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True, name="hibp-server").start()
+    return server
+
+
+def add_fault_arguments(parser):
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--error-code", type=int, default=500)
+    parser.add_argument("--rate-limit", type=float, help="requests/s before answering 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429")
+    parser.add_argument("--pad", action="store_true", help="pad every response")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def faults_from_args(args):
+    return Faults(args.latency_ms, args.jitter_ms, args.error_rate, args.error_code, args.rate_limit,
+                  args.retry_after, args.pad, args.seed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_fault_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = start_server(faults_from_args(args), RangeDataset(args.seed), args.host, args.port)
+    print(f"Serving HIBP ranges on {server.url}  (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    print(server.stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+"""
+Repeatable timings of Credlock's hot paths, written as JSON and compared
+against a saved baseline.
+
+    python -m benchmarks.suite --sizes 10,1k -o results.json
+    python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json --fail-on-regression
+
+GUI benchmarks (open_screen, refresh_screen) need an X display; without
+one they start a private Xvfb server, or are reported as skipped.
+"""
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+from credcore import breach
+from credcore.generator import generate_password
+
+from .vaultgen import VAULT_SIZES, synthetic_vault, vault_size
+
+BENCHMARKS = []  # (name, group, per_size, max_entries, setup)
+DEFAULT_SIZES = "10,1k"  # 100k is opt-in, it takes a while to build
+TARGET_RUN_SECONDS = 0.05  # each repeat runs the operation about this long
+GUI_MAX_ENTRIES = 1000  # one widget row per entry; larger screens are skipped
+REGRESSION_THRESHOLD = 0.25  # median slower than baseline by more than 25%
+STUB_RANGE_SIZE = 800  # suffixes per range, close to what HIBP returns
+
+
+class Skip(Exception):
+    """Raised by a benchmark setup that cannot run here; the reason is recorded."""
+
+
+def benchmark(name, group="core", per_size=False, max_entries=None):
+    """
+    Registers a setup function. The setup receives the context dict and
+    returns the zero-argument operation to time (plus optional teardown).
+    """
+    def register(setup):
+        BENCHMARKS.append((name, group, per_size, max_entries, setup))
+        return setup
+    return register
+
+
+# --------------------- Timing ---------------------
+def measure(op, repeat=5):
+    """Per-call seconds of `op` over `repeat` runs, each long enough to time reliably."""
+    started = time.perf_counter()
+    op()  # warm-up, also calibrates the run length
+    single = max(time.perf_counter() - started, 1e-9)
+    number = max(1, int(TARGET_RUN_SECONDS / single))
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            op()
+        runs.append((time.perf_counter() - started) / number)
+    return {
+        "median": statistics.median(runs),
+        "min": min(runs),
+        "mean": statistics.fmean(runs),
+        "stdev": statistics.stdev(runs) if len(runs) > 1 else 0.0,
+        "calls": number * repeat,
+    }
+
+
+# --------------------- Stubs & Display ---------------------
+def stub_range_text(prefix):
+    """A deterministic HIBP-like range body: STUB_RANGE_SIZE "SUFFIX:COUNT" lines."""
+    lines = []
+    for i in range(STUB_RANGE_SIZE):
+        suffix = hashlib.sha1(f"{prefix}{i}".encode()).hexdigest()[5:].upper()
+        lines.append(f"{suffix}:{i % 97 + 1}")
+    return "\r\n".join(lines)
+
+
+@contextlib.contextmanager
+def stub_hibp():
+    """Serves check_hibp from in-memory range bodies; the client still parses every response."""
+    bodies = {}
+
+    def fetch_range(prefix, *args, **kwargs):
+        if prefix not in bodies:
+            bodies[prefix] = stub_range_text(prefix)
+        return 0, breach.parse_range(bodies[prefix])
+
+    original = breach.fetch_range
+    breach.fetch_range = fetch_range
+    try:
+        yield
+    finally:
+        breach.fetch_range = original
+
+
+@contextlib.contextmanager
+def virtual_display():
+    """Uses $DISPLAY when set, otherwise runs a private Xvfb server for the duration."""
+    if os.environ.get("DISPLAY"):
+        yield os.environ["DISPLAY"]
+        return
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        raise Skip("no X display and Xvfb is not installed")
+    display = next(n for n in range(99, 200) if not os.path.exists(f"/tmp/.X11-unix/X{n}"))
+    server = subprocess.Popen([xvfb, f":{display}", "-screen", "0", "1920x1080x24", "-nolisten", "tcp"],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + 10
+        while not os.path.exists(f"/tmp/.X11-unix/X{display}"):
+            if server.poll() is not None or time.monotonic() > deadline:
+                raise Skip("Xvfb failed to start")
+            time.sleep(0.05)
+        os.environ["DISPLAY"] = f":{display}"
+        yield os.environ["DISPLAY"]
+    finally:
+        os.environ.pop("DISPLAY", None)
+        server.terminate()
+        server.wait()
+
+
+def import_gui():
+    try:
+        import Credlock
+    except ImportError as e:  # cv2 / customtkinter / a Tk-enabled Python missing
+        raise Skip(f"GUI module unavailable: {e}") from None
+    return Credlock
+
+
+# --------------------- Core Benchmarks ---------------------
+@benchmark("check_password_strength")
+def bench_strength(ctx):
+    try:
+        from credcore import check_password_strength
+        check_password_strength("warm-up")
+    except ImportError as e:
+        raise Skip(f"zxcvbn unavailable: {e}") from None
+    samples = [secret for _, secret in synthetic_vault("1k").data["passkeys"][:50]]
+    state = {"i": 0}
+
+    def op():
+        state["i"] = (state["i"] + 1) % len(samples)
+        check_password_strength(samples[state["i"]])
+    return op
+
+
+@benchmark("generate_password")
+def bench_generate(ctx):
+    return generate_password
+
+
+@benchmark("create_gradient")
+def bench_gradient(ctx):
+    create_gradient = import_gui().create_gradient
+    return lambda: create_gradient(1920, 120, (0, 90, 200), (0, 150, 255))
+
+
+@benchmark("check_hibp_stub")
+def bench_hibp(ctx):
+    samples = [f"password{i}" for i in range(64)]
+    state = {"i": 0}
+
+    def op():
+        state["i"] = (state["i"] + 1) % len(samples)
+        breach.check_hibp(samples[state["i"]])
+    return op
+
+
+# --------------------- Data Benchmarks ---------------------
+@benchmark("delete_restore", group="data", per_size=True)
+def bench_delete_restore(ctx):
+    """One delete_item + restore_item round trip on the data layer."""
+    vault = ctx["vault"]
+    name, secret = vault.data["passkeys"][len(vault.data["passkeys"]) // 2]
+
+    def op():
+        vault.delete("passkeys", name, secret)
+        vault.restore("passkeys", name, secret)
+    return op
+
+
+@benchmark("search", group="data", per_size=True)
+def bench_search(ctx):
+    vault = ctx["vault"]
+    return lambda: sum(1 for _ in vault.search("passkeys", "bank"))
+
+
+@benchmark("search_deleted", group="data", per_size=True)
+def bench_search_deleted(ctx):
+    vault = ctx["vault"]
+    doomed = vault.data["wifi"][::20]  # 5% of wifi in the bin
+    vault.delete_many("wifi", doomed)
+    op = lambda: sum(1 for _ in vault.search_deleted("bank"))
+    return op, lambda: vault.restore_many([("wifi", name, secret) for name, secret in doomed])
+
+
+# --------------------- GUI Benchmarks ---------------------
+def gui_app(ctx):
+    """One App per vault size, filled with the synthetic vault; rows render to completion."""
+    if "app" not in ctx:
+        Credlock = import_gui()
+        ctx["display"] = ctx["stack"].enter_context(virtual_display())
+        app = Credlock.App()
+        for category, entries in ctx["vault"].data.items():
+            app.vault.add_many(category, list(entries))
+        ctx["stack"].callback(app.close_app)
+        ctx["app"] = app
+    return ctx["app"]
+
+
+def settle(app, key):
+    """Pumps Tk until the chunked renderer has built every row of `key`."""
+    app.update()
+    while app.renderer.rendering(key):
+        app.update()
+
+
+@benchmark("open_screen", group="gui", per_size=True, max_entries=GUI_MAX_ENTRIES)
+def bench_open_screen(ctx):
+    app = gui_app(ctx)
+
+    def op():
+        app.screens.discard("passkeys")  # a cold open: build, then render every row
+        app.open_screen("passkeys")
+        settle(app, "passkeys")
+    return op
+
+
+@benchmark("refresh_screen", group="gui", per_size=True, max_entries=GUI_MAX_ENTRIES)
+def bench_refresh_screen(ctx):
+    app = gui_app(ctx)
+    app.open_screen("passkeys")
+    settle(app, "passkeys")
+
+    def op():
+        app.refresh_screen("passkeys")
+        settle(app, "passkeys")
+    return op
+
+
+# --------------------- Runner ---------------------
+def run_one(setup, ctx, repeat):
+    try:
+        prepared = setup(ctx)
+    except Skip as e:
+        return {"status": "skipped", "reason": str(e)}
+    op, teardown = prepared if isinstance(prepared, tuple) else (prepared, None)
+    try:
+        return {"status": "ok", **measure(op, repeat)}
+    except Exception as e:  # a broken hot path is a result too, not a crash of the suite
+        return {"status": "error", "reason": f"{type(e).__name__}: {e}"}
+    finally:
+        if teardown:
+            teardown()
+
+
+def run_suite(sizes, groups, only=None, repeat=5):
+    """Returns {"meta": ..., "results": {"name" or "name[size]": {...}}}."""
+    results = {}
+    wanted = [b for b in BENCHMARKS if b[1] in groups and (not only or only in b[0])]
+
+    for name, group, per_size, _, setup in wanted:
+        if not per_size:
+            results[name] = {"group": group, **run_one(setup, {}, repeat)}
+            print(f"{name}: {results[name]['status']}", file=sys.stderr)
+
+    for size in sizes:
+        with contextlib.ExitStack() as stack:
+            ctx = {"size": size, "vault": synthetic_vault(size), "stack": stack}
+            for name, group, per_size, max_entries, setup in wanted:
+                if not per_size:
+                    continue
+                key = f"{name}[{size}]"
+                if max_entries is not None and vault_size(size) > max_entries:
+                    results[key] = {"group": group, "status": "skipped",
+                                    "reason": f"more than {max_entries} entries"}
+                else:
+                    results[key] = {"group": group, "size": size, **run_one(setup, ctx, repeat)}
+                print(f"{key}: {results[key]['status']}", file=sys.stderr)
+
+    meta = {
+        "created": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "sizes": list(sizes),
+        "repeat": repeat,
+    }
+    return {"meta": meta, "results": results}
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """Rows of (name, baseline median, median, ratio, verdict) for benchmarks timed in both runs."""
+    rows = []
+    for name, result in results["results"].items():
+        before = baseline["results"].get(name, {})
+        if result.get("status") != "ok" or before.get("status") != "ok":
+            continue
+        ratio = result["median"] / before["median"]
+        if ratio > 1 + threshold:
+            verdict = "regressed"
+        elif ratio < 1 / (1 + threshold):
+            verdict = "improved"
+        else:
+            verdict = "same"
+        rows.append((name, before["median"], result["median"], ratio, verdict))
+    return rows
+
+
+def format_seconds(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help=f"comma-separated vault sizes ({', '.join(VAULT_SIZES)} or a count)")
+    parser.add_argument("--only", help="run benchmarks whose name contains this text")
+    parser.add_argument("--no-gui", action="store_true", help="skip the GUI benchmarks")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("-o", "--output", help="write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", help="compare against this results JSON")
+    parser.add_argument("--save-baseline", help="also write the results to this baseline file")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    groups = {"core", "data"} if args.no_gui else {"core", "data", "gui"}
+    sizes = [size.strip() for size in args.sizes.split(",") if size.strip()]
+    with stub_hibp():
+        results = run_suite(sizes, groups, args.only, args.repeat)
+
+    regressed = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline, args.threshold)
+        results["comparison"] = [
+            {"name": name, "baseline": before, "median": after, "ratio": ratio, "verdict": verdict}
+            for name, before, after, ratio, verdict in rows
+        ]
+        for name, before, after, ratio, verdict in rows:
+            print(f"{name:32} {format_seconds(before):>10} -> {format_seconds(after):>10}  "
+                  f"{ratio:5.2f}x  {verdict}", file=sys.stderr)
+        regressed = [row for row in rows if row[4] == "regressed"]
+
+    text = json.dumps(results, indent=2)
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    if not args.output:
+        print(text)
+    return 1 if regressed and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""
+Deterministic synthetic vaults for benchmarks.
+
+    synthetic_vault("1k")  ->  Vault with ~1000 entries across wifi/passkeys/codes
+"""
+import random
+import string
+
+from credcore import Vault
+
+VAULT_SIZES = {"10": 10, "1k": 1000, "100k": 100000}
+CATEGORY_SHARE = (("wifi", 0.3), ("passkeys", 0.5), ("codes", 0.2))
+WORDS = ("home", "office", "guest", "mail", "bank", "shop", "cloud", "admin", "router", "work",
+         "github", "school", "media", "phone", "games", "travel")
+
+
+def vault_size(size):
+    """Accepts a label from VAULT_SIZES or a plain entry count."""
+    return VAULT_SIZES[size] if size in VAULT_SIZES else int(size)
+
+
+def synthetic_entries(count, category, rng):
+    """`count` unique (name, secret) pairs that look like real vault entries."""
+    entries = []
+    for i in range(count):
+        word = rng.choice(WORDS)
+        if category == "codes":
+            entries.append((f"{word}-code-{i}", "".join(rng.choices(string.digits, k=8))))
+        elif rng.random() < 0.2:
+            # human-made passwords: a word, a year and a symbol, so reuse and similarity show up
+            entries.append((f"{word}{i}@example.com", f"{word.capitalize()}{rng.randint(1990, 2025)}!"))
+        else:
+            secret = "".join(rng.choices(string.ascii_letters + string.digits + string.punctuation, k=16))
+            entries.append((f"{word}{i}@example.com", secret))
+    return entries
+
+
+def synthetic_vault(size, seed=0):
+    """A Vault filled with the same entries for the same (size, seed), every run."""
+    rng = random.Random(seed)
+    total = vault_size(size)
+    vault = Vault()
+    for category, share in CATEGORY_SHARE:
+        vault.add_many(category, synthetic_entries(max(int(total * share), 1), category, rng))
+    return vault
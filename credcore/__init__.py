@@ -0,0 +1,25 @@
+"""
+GUI-free core of Credlock: vault store, breach checks, strength scoring and
+password generation. Importing it pulls in neither Tk, customtkinter nor cv2;
+requests and zxcvbn are only loaded when a check actually runs.
+"""
+from . import tracing
+from .breach import check_hibp
+from .generator import generate_password, generate_passwords
+from .index import VaultIndex
+from .retention import RetentionPolicy
+from .strength import check_password_strength
+from .vault import CATEGORIES, Vault, open_vault
+
+__all__ = [
+    "CATEGORIES",
+    "RetentionPolicy",
+    "Vault",
+    "VaultIndex",
+    "check_hibp",
+    "check_password_strength",
+    "generate_password",
+    "generate_passwords",
+    "open_vault",
+    "tracing",
+]
@@ -0,0 +1,195 @@
+"""Have I Been Pwned (k-anonymity range API) breach checks."""
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from .tracing import traced
+
+# Point CREDLOCK_HIBP_URL at a stand-in (benchmarks/hibp_server.py) to test offline
+HIBP_BASE_URL = os.environ.get("CREDLOCK_HIBP_URL", "https://api.pwnedpasswords.com")
+# A range store kept current by `python -m credcore sync-corpus` answers checks offline
+HIBP_CORPUS = os.environ.get("CREDLOCK_HIBP_CORPUS")
+HIBP_TIMEOUT = 5  # seconds
+HIBP_RETRIES = 2  # extra attempts after a 429 / 503
+HIBP_MAX_BACKOFF = 2.0  # seconds, caps the server's Retry-After
+RETRY_STATUSES = (429, 503)
+RANGE_CACHE_SIZE = 256  # ranges kept by BreachChecker (~800 suffixes each)
+
+# Errors go to logging (stderr by default), never stdout, which carries `credcore audit` output
+log = logging.getLogger(__name__)
+
+
+# --------------------- HIBP Checker Function ---------------------
+def hash_password(password):
+    """Returns the (prefix, suffix) split of the upper-case SHA-1 hex digest."""
+    sha1pass = hashlib.sha1(password.encode('utf-8')).hexdigest().upper()
+    return sha1pass[:5], sha1pass[5:]
+
+
+def parse_range(text):
+    """Parses a range response body into {suffix: count}."""
+    counts = {}
+    for line in text.splitlines():
+        h, _, count = line.partition(':')
+        if count:
+            counts[h] = int(count)
+    return counts
+
+
+_corpus = None
+_corpus_lock = threading.Lock()
+
+
+def offline_range(prefix):
+    """{suffix: count} from the offline corpus, or None without one or when the range is not synced yet."""
+    global _corpus
+    if not HIBP_CORPUS:
+        return None
+    with _corpus_lock:
+        if _corpus is None:
+            from .corpus import BreachCorpus
+
+            _corpus = BreachCorpus(HIBP_CORPUS)
+    return _corpus.range_counts(prefix)
+
+
+def range_url(prefix, base_url=None):
+    return f"{(base_url or HIBP_BASE_URL).rstrip('/')}/range/{prefix}"
+
+
+def retry_delay(response, attempt):
+    """Seconds to wait before retrying: the server's Retry-After if given, else exponential backoff."""
+    try:
+        delay = float(response.headers.get("Retry-After", ""))
+    except ValueError:
+        delay = 0.1 * 2 ** attempt
+    return min(max(delay, 0.0), HIBP_MAX_BACKOFF)
+
+
+def request_range(prefix, session=None, base_url=None, headers=None, retries=HIBP_RETRIES, stats=None):
+    """
+    GETs one HIBP range, retrying throttled (429) and unavailable (503)
+    responses up to `retries` times; each retry is counted in
+    stats["retries"] when a dict is given. Returns the final response, or
+    None on a connection error.
+    """
+    import requests  # imported lazily so `import credcore` stays cheap
+
+    url = range_url(prefix, base_url)
+    for attempt in range(retries + 1):
+        try:
+            response = (session or requests).get(url, headers=headers, timeout=HIBP_TIMEOUT)
+        except requests.exceptions.RequestException as e:
+            log.warning("HIBP connection error: %s", e)
+            return None
+        if response.status_code in RETRY_STATUSES and attempt < retries:
+            if stats is not None:
+                stats["retries"] = stats.get("retries", 0) + 1
+            time.sleep(retry_delay(response, attempt))
+            continue
+        return response
+
+
+def fetch_range(prefix, session=None, base_url=None, retries=HIBP_RETRIES, stats=None):
+    """
+    Downloads one HIBP range. Returns (status, counts) where status is 0 on
+    success, -1 on an API error or -2 on a connection error.
+    """
+    response = request_range(prefix, session, base_url, retries=retries, stats=stats)
+    if response is None:
+        return -2, None # Connection error indicator
+    if response.status_code == 200:
+        return 0, parse_range(response.text)
+    log.warning("HIBP API error: Status code %s", response.status_code)
+    return -1, None # Error indicator
+
+
+@traced("check_hibp")
+def check_hibp(password, retries=HIBP_RETRIES):
+    """
+    Checks if a password has been pwned using the HIBP API.
+    Returns the breach count, -1 on an API error or -2 on a connection error.
+    Interactive callers pass retries=0 so a throttled API never makes them wait.
+    """
+    prefix, suffix = hash_password(password)
+    counts = offline_range(prefix)
+    if counts is None:
+        status, counts = fetch_range(prefix, retries=retries)
+        if status < 0:
+            return status
+    return counts.get(suffix, 0)
+
+
+# --------------------- Batched Breach Checks ---------------------
+class BreachChecker:
+    """
+    Checks many passwords while fetching each HIBP range prefix only once.
+
+    Ranges are downloaded concurrently over a pooled HTTP session and kept
+    in a small LRU cache, so repeated prefixes across batches are free.
+    """
+
+    def __init__(self, workers=8, cache_size=RANGE_CACHE_SIZE, base_url=None):
+        import requests
+
+        self.base_url = base_url
+        self.stats = {"retries": 0}
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hibp")
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.lock = threading.Lock()
+        self.requests = 0
+
+    def _cached(self, prefix):
+        with self.lock:
+            counts = self.cache.get(prefix)
+            if counts is not None:
+                self.cache.move_to_end(prefix)
+            return counts
+
+    def _store(self, prefix, counts):
+        with self.lock:
+            self.cache[prefix] = counts
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+    def check_many(self, passwords):
+        """Returns a breach count (or -1 / -2 error code) for each password, in order."""
+        hashes = [hash_password(p) for p in passwords]
+        ranges = {}
+        missing = []
+        for prefix in {prefix for prefix, _ in hashes}:
+            counts = self._cached(prefix)
+            if counts is None:
+                counts = offline_range(prefix)
+            if counts is None:
+                missing.append(prefix)
+            else:
+                ranges[prefix] = counts
+
+        fetched = self.pool.map(lambda p: fetch_range(p, self.session, self.base_url, stats=self.stats), missing)
+        for prefix, (status, counts) in zip(missing, fetched):
+            self.requests += 1
+            if status < 0:
+                ranges[prefix] = status
+            else:
+                ranges[prefix] = counts
+                self._store(prefix, counts)
+
+        results = []
+        for prefix, suffix in hashes:
+            counts = ranges[prefix]
+            results.append(counts if isinstance(counts, int) else counts.get(suffix, 0))
+        return results
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
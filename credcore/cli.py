@@ -0,0 +1,266 @@
+"""
+Command-line entry point for headless use.
+
+    python -m credcore audit exported.csv -o results.jsonl
+    cat passwords.txt | python -m credcore audit --format lines
+    python -m credcore generate -n 5000 --length 20 --policy alnum > wifi.txt
+    python -m credcore serve --db vault.db &
+    python -m credcore query wifi home
+    python -m credcore stop
+    python -m credcore sync-corpus hibp.db --workers 32
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from . import daemon, protocol
+from .breach import BreachChecker
+from .corpus import PREFIX_COUNT, SYNC_BATCH, SYNC_WORKERS, BreachCorpus, CorpusSync
+from .generator import CHARSET_POLICIES
+from .policy import PasswordPolicy
+from .importer import iter_chunks, iter_entries
+from .scoring import BulkScorer
+from .vault import CATEGORIES
+
+AUDIT_CHUNK_SIZE = 500  # entries per process-pool task
+GENERATE_BATCH_SIZE = 10000
+
+
+# --------------------- Input ---------------------
+def iter_lines_entries(lines):
+    """Plain input: one password per line, named after its line number."""
+    for number, line in enumerate(lines, 1):
+        secret = line.rstrip("\r\n")
+        if secret:
+            yield f"line {number}", secret
+
+
+def open_input(path, encoding="utf-8-sig"):
+    if path == "-":
+        return sys.stdin
+    return open(path, newline="", encoding=encoding)
+
+
+# --------------------- Audit Pipeline ---------------------
+def audit_entries(entries, workers=None, chunk_size=AUDIT_CHUNK_SIZE, strength=True, breach=True,
+                  stats=None):
+    """
+    Yields one result dict per (name, secret) entry, in input order.
+
+    Strength scoring runs on a process pool and breach lookups on a thread
+    pool; at most 2 x workers chunks are in flight, so memory stays bounded
+    no matter how long the input is. Counters are written into `stats`.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = 2 * workers
+    scorer = BulkScorer(workers, chunk_size) if strength else None
+    breach_runner = ThreadPoolExecutor(max_workers=1) if breach else None
+    checker = BreachChecker() if breach else None
+    in_flight = deque()
+    stats = stats if stats is not None else {}
+    stats.update(entries=0, range_requests=0)
+
+    def drain_one():
+        chunk, scores, counts = in_flight.popleft()
+        scores = scores.result() if scores else [None] * len(chunk)
+        counts = counts.result() if counts else [None] * len(chunk)
+        for (name, _), score, pwned in zip(chunk, scores, counts):
+            result = {"name": name}
+            if score is not None:
+                result["score"], result["strength"] = score
+            if pwned is not None:
+                result["pwned"] = pwned
+            yield result
+
+    try:
+        for chunk in iter_chunks(entries, chunk_size):
+            secrets = [secret for _, secret in chunk]
+            scores = scorer.submit(secrets) if scorer else None
+            counts = breach_runner.submit(checker.check_many, secrets) if breach_runner else None
+            in_flight.append((chunk, scores, counts))
+            stats["entries"] += len(chunk)
+            while len(in_flight) >= max_in_flight:
+                yield from drain_one()
+        while in_flight:
+            yield from drain_one()
+    finally:
+        if scorer:
+            scorer.close()
+        if breach_runner:
+            breach_runner.shutdown(cancel_futures=True)
+            stats["range_requests"] = checker.requests
+            checker.close()
+
+
+def run_audit(args):
+    started = time.perf_counter()
+    fmt = args.format or ("csv" if args.input.lower().endswith(".csv") else "lines")
+    out = open(args.output, "w", encoding="utf-8") if args.output != "-" else sys.stdout
+    count = 0
+    stats = {}
+    try:
+        with open_input(args.input) as source:
+            entries = iter_entries(source) if fmt == "csv" else iter_lines_entries(source)
+            results = audit_entries(entries, args.workers, args.chunk_size,
+                                    strength=not args.no_strength, breach=not args.no_breach, stats=stats)
+            for result in results:
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                count += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed else 0.0
+    print(f"Audited {count} entries in {elapsed:.2f}s ({rate:.0f} entries/s), "
+          f"{stats.get('range_requests', 0)} HIBP range requests.", file=sys.stderr)
+    return 0
+
+
+def run_generate(args):
+    length = args.length or (4 if args.passphrase else 16)
+    policy = PasswordPolicy(args.policy, args.min_bits, args.exclude_ambiguous, args.passphrase,
+                            min_length=length)
+    print(f"Each password has {policy.bits:.1f} bits of entropy (length {policy.length}).", file=sys.stderr)
+    out = open(args.output, "w", encoding="utf-8") if args.output != "-" else sys.stdout
+    try:
+        remaining = args.count
+        while remaining > 0:  # bounded batches keep memory flat for huge counts
+            batch = policy.generate_many(min(remaining, GENERATE_BATCH_SIZE))
+            out.write("\n".join(batch) + "\n")
+            remaining -= len(batch)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+def run_sync_corpus(args):
+    corpus = BreachCorpus(args.corpus)
+    sync = CorpusSync(corpus, args.url, args.workers, args.batch)
+    started = time.perf_counter()
+    last_report = [started]
+
+    def progress(done, total):
+        now = time.perf_counter()
+        if now - last_report[0] >= 5:
+            last_report[0] = now
+            print(f"{done}/{total} ranges, {sync.stats['updated']} updated, {sync.stats['unchanged']} unchanged, "
+                  f"{sync.stats['failed']} failed", file=sys.stderr)
+
+    try:
+        stats = sync.run(int(args.start, 16), min(int(args.stop, 16), PREFIX_COUNT), args.restart, progress)
+    except KeyboardInterrupt:
+        print("Interrupted; run the same command again to resume.", file=sys.stderr)
+        return 130
+    finally:
+        sync.close()
+        corpus.close()
+    elapsed = time.perf_counter() - started
+    print(f"Synced in {elapsed:.1f}s: {stats['updated']} updated ({stats['bytes'] / 1e6:.1f} MB), "
+          f"{stats['unchanged']} unchanged, {stats['failed']} failed, {stats['retries']} retries.", file=sys.stderr)
+    return 1 if stats["failed"] else 0
+
+
+def run_serve(args):
+    daemon.serve(args.socket, args.db)
+    return 0
+
+
+def run_stop(args):
+    from .client import VaultClient
+
+    if not daemon.socket_alive(args.socket or daemon.default_socket_path()):
+        print("No vault daemon is running.", file=sys.stderr)
+        return 1
+    client = VaultClient(args.socket)
+    try:
+        client.call(protocol.SHUTDOWN)
+    finally:
+        client.close()
+    return 0
+
+
+def run_query(args):
+    from .client import DaemonError, attach_vault
+
+    try:
+        vault, _ = attach_vault(args.socket, start=False)
+    except DaemonError as e:
+        print(e, file=sys.stderr)
+        return 1
+    try:
+        if args.deleted:  # ("user", name, secret, category) or ("code", name, value), as the Deleted screen lists them
+            rows = vault.search_deleted(args.query, limit=args.limit)
+        else:
+            rows = ({"category": args.category, "name": name, "secret": secret}
+                    for name, secret in vault.search(args.category, args.query, limit=args.limit))
+        for row in rows:
+            print(json.dumps(row))
+    finally:
+        vault.close()
+    return 0
+
+
+# --------------------- Entry Point ---------------------
+def build_parser():
+    parser = argparse.ArgumentParser(prog="credlock", description="Headless Credlock tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    audit = commands.add_parser("audit", help="score and breach-check credentials as JSON lines")
+    audit.add_argument("input", nargs="?", default="-", help="CSV export or password list ('-' for stdin)")
+    audit.add_argument("-o", "--output", default="-", help="JSON lines output file ('-' for stdout)")
+    audit.add_argument("--format", choices=("csv", "lines"),
+                       help="input format (default: csv for *.csv files, otherwise one password per line)")
+    audit.add_argument("--workers", type=int, default=None, help="strength-scoring processes (default: all cores)")
+    audit.add_argument("--chunk-size", type=int, default=AUDIT_CHUNK_SIZE, help="entries per worker task")
+    audit.add_argument("--no-strength", action="store_true", help="skip zxcvbn scoring")
+    audit.add_argument("--no-breach", action="store_true", help="skip HIBP lookups")
+    audit.set_defaults(func=run_audit)
+
+    generate = commands.add_parser("generate", help="generate a batch of random passwords, one per line")
+    generate.add_argument("-n", "--count", type=int, default=1, help="number of passwords")
+    generate.add_argument("--length", type=int, help="minimum characters (default 16) or words (default 4)")
+    generate.add_argument("--policy", choices=sorted(CHARSET_POLICIES), default="full", help="character classes")
+    generate.add_argument("--min-bits", type=float, default=0, help="lengthen passwords to reach this entropy")
+    generate.add_argument("--exclude-ambiguous", action="store_true", help="skip look-alike characters")
+    generate.add_argument("--passphrase", action="store_true", help="generate words instead of characters")
+    generate.add_argument("-o", "--output", default="-", help="output file ('-' for stdout)")
+    generate.set_defaults(func=run_generate)
+
+    sync = commands.add_parser("sync-corpus", help="download or refresh an offline copy of the HIBP ranges")
+    sync.add_argument("corpus", help="SQLite file holding the ranges (created if missing)")
+    sync.add_argument("--url", help="range API base URL (default: CREDLOCK_HIBP_URL or the real API)")
+    sync.add_argument("--workers", type=int, default=SYNC_WORKERS, help="concurrent requests")
+    sync.add_argument("--batch", type=int, default=SYNC_BATCH, help="ranges per committed transaction")
+    sync.add_argument("--start", default="00000", help="first prefix (hex)")
+    sync.add_argument("--stop", default="100000", help="prefix to stop before (hex)")
+    sync.add_argument("--restart", action="store_true", help="ignore an unfinished earlier sync")
+    sync.set_defaults(func=run_sync_corpus)
+
+    serve = commands.add_parser("serve", help="run the vault daemon in the foreground")
+    serve.add_argument("--socket", help="Unix socket path (default: per-user runtime directory)")
+    serve.add_argument("--db", help="SQLite vault file (default: in-memory vault)")
+    serve.set_defaults(func=run_serve)
+
+    stop = commands.add_parser("stop", help="shut down a running vault daemon")
+    stop.add_argument("--socket", help="Unix socket path")
+    stop.set_defaults(func=run_stop)
+
+    query = commands.add_parser("query", help="search a running vault daemon, one JSON object per line")
+    query.add_argument("category", nargs="?", choices=CATEGORIES, default="wifi")
+    query.add_argument("query", nargs="?", default="", help="name substring")
+    query.add_argument("--deleted", action="store_true", help="search the deleted items instead")
+    query.add_argument("--limit", type=int, default=None)
+    query.add_argument("--socket", help="Unix socket path")
+    query.set_defaults(func=run_query)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,283 @@
+"""
+Client side of the vault daemon: a connection the caller's threads share,
+and RemoteVault, which gives the GUI and scripts the usual Vault interface
+over it.
+
+    vault = attach_vault()          # connect, starting the daemon if needed
+    for name, secret in vault.search("wifi", "home"):
+        ...
+"""
+import itertools
+import os
+import queue
+import socket
+import threading
+from concurrent.futures import Future
+
+from . import protocol
+from .daemon import default_socket_path, socket_alive, spawn
+from .importer import CredentialImporter
+from .vault import CATEGORIES
+
+CALL_TIMEOUT = 30  # seconds; exports and backups wait without a limit
+FETCH_PAGE_SIZE = 5000  # rows per reply when walking a whole category; keeps frames far below MAX_FRAME
+
+
+class DaemonError(RuntimeError):
+    """The daemon rejected a request; the message is the daemon's error text."""
+
+
+# --------------------- Connection ---------------------
+class VaultClient:
+    """
+    One connection to the daemon. submit() sends a request and returns a
+    Future without waiting, so the GUI thread and its workers can share the
+    connection; a reader thread resolves the futures as replies arrive and
+    queues PUSH change notifications in self.changes.
+    """
+
+    def __init__(self, path=None):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(path or default_socket_path())
+        self.ids = itertools.count(1)
+        self.pending = {}
+        self.pending_lock = threading.Lock()  # guards pending and closed against the reader thread
+        self.closed = False
+        self.send_lock = threading.Lock()
+        self.changes = queue.Queue()  # tuples of changed categories pushed by the daemon
+        self.reader = threading.Thread(target=self._read_loop, daemon=True, name="vault-client")
+        self.reader.start()
+
+    def submit(self, op, *args):
+        request_id = next(self.ids)
+        message = protocol.frame(op, request_id, args)
+        future = Future()
+        with self.pending_lock:
+            if self.closed:
+                raise DaemonError("Connection to the vault daemon closed")
+            self.pending[request_id] = future
+        try:
+            with self.send_lock:
+                self.sock.sendall(message)
+        except OSError:
+            with self.pending_lock:
+                self.pending.pop(request_id, None)
+            raise
+        return future
+
+    def call(self, op, *args, timeout=CALL_TIMEOUT):
+        return self.submit(op, *args).result(timeout)
+
+    def _read_loop(self):
+        buffer = bytearray()
+        try:
+            while True:
+                data = self.sock.recv(1 << 16)
+                if not data:
+                    break
+                buffer += data
+                for op, request_id, value in protocol.read_frames(buffer):
+                    if op == protocol.PUSH:
+                        self.changes.put(value)
+                        continue
+                    with self.pending_lock:
+                        future = self.pending.pop(request_id, None)
+                    if future is None:
+                        continue
+                    if op == protocol.ERROR:
+                        future.set_exception(DaemonError(value))
+                    else:
+                        future.set_result(value)
+        except (OSError, protocol.ProtocolError):
+            pass
+        with self.pending_lock:
+            self.closed = True  # submit() fails from now on instead of waiting for a reply
+            pending, self.pending = self.pending, {}
+        for future in pending.values():
+            future.set_exception(DaemonError("Connection to the vault daemon closed"))
+
+    def close(self):
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+# --------------------- Remote Vault ---------------------
+class RemoteCategory:
+    def __init__(self, vault, category):
+        self.vault = vault
+        self.category = category
+
+    def __iter__(self):
+        return self.vault.search(self.category)
+
+    def __len__(self):
+        return self.vault.client.call(protocol.COUNT, self.category)
+
+
+class RemoteDeleted:
+    def __init__(self, vault):
+        self.vault = vault
+
+    def __len__(self):
+        return self.vault.client.call(protocol.COUNT_DELETED)
+
+
+class RemoteIndex:
+    def __init__(self, vault):
+        self.vault = vault
+
+    def __contains__(self, key):
+        return self.vault.client.call(protocol.CONTAINS, *key)
+
+    def present(self, keys):
+        return set(self.vault.client.call(protocol.PRESENT, list(keys)))
+
+
+class RemoteReuse:
+    def __init__(self, vault):
+        self.vault = vault
+
+    def users(self, secret, exclude=None):
+        return list(self.vault.client.call(protocol.REUSE_USERS, secret, exclude))
+
+    def groups(self):
+        return [list(group) for group in self.vault.client.call(protocol.REUSE_GROUPS)]
+
+
+class RemoteSimilar:
+    def __init__(self, vault):
+        self.vault = vault
+
+    @property
+    def ready(self):
+        return self.vault.client.call(protocol.SIMILAR_READY)
+
+    def similar(self, secret, exclude=None):
+        return list(self.vault.client.call(protocol.SIMILAR, secret, exclude))
+
+    def pairs(self):
+        return list(self.vault.client.call(protocol.SIMILAR_PAIRS, timeout=None))
+
+    def groups(self):
+        return [list(group) for group in self.vault.client.call(protocol.SIMILAR_GROUPS, timeout=None)]
+
+
+class RemoteCheckLog:
+    def __init__(self, vault):
+        self.vault = vault
+
+    def lookup(self, records):
+        rows = self.vault.client.call(protocol.CHECKS_LOOKUP, list(records))
+        return {(category, name): (checked_at, pwned) for category, name, checked_at, pwned in rows}
+
+    def record(self, results):
+        self.vault.client.call(protocol.CHECKS_RECORD, list(results))
+
+    def pwned(self):
+        return [tuple(row) for row in self.vault.client.call(protocol.CHECKS_PWNED)]
+
+
+class RemoteVault:
+    """
+    The Vault interface answered by the daemon. Changes made by other
+    clients arrive as category tuples in self.changes (see VaultClient).
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.changes = client.changes
+        self.data = {category: RemoteCategory(self, category) for category in CATEGORIES}
+        self.deleted = RemoteDeleted(self)
+        self.index = RemoteIndex(self)
+        self.reuse = RemoteReuse(self)
+        self.similar = RemoteSimilar(self)
+        self.breach_checks = RemoteCheckLog(self)  # the daemon drops entries on delete itself
+
+    # ---------------- Mutations ----------------
+    def add(self, category, name, secret):
+        self.add_many(category, [(name, secret)])
+
+    def add_many(self, category, entries, index_similar=True):
+        self.client.call(protocol.ADD_MANY, category, entries)  # the daemon keeps the similarity index
+
+    def similarity_index(self):
+        return None
+
+    def delete(self, category, name, secret):
+        self.delete_many(category, [(name, secret)])
+
+    def delete_many(self, category, entries):
+        self.client.call(protocol.DELETE_MANY, category, entries)
+
+    def restore(self, category, name, secret):
+        self.restore_many([(category, name, secret)])
+
+    def restore_many(self, items):
+        self.client.call(protocol.RESTORE_MANY, items)
+
+    def purge_deleted(self):
+        return self.client.call(protocol.PURGE)
+
+    def purge_all_deleted(self):
+        self.client.call(protocol.PURGE_ALL)
+        return []  # the daemon releases the old bin itself; callers may still clear() this
+
+    # ---------------- Queries ----------------
+    def __contains__(self, key):
+        return key in self.index
+
+    def _paged(self, op, args, offset, limit):
+        """Yields the rows of a search, fetched FETCH_PAGE_SIZE at a time so no reply grows unbounded."""
+        while limit is None or limit > 0:
+            size = FETCH_PAGE_SIZE if limit is None else min(limit, FETCH_PAGE_SIZE)
+            page = self.client.call(op, *args, offset, size)
+            yield from page
+            if len(page) < size:
+                return
+            offset += size
+            if limit is not None:
+                limit -= size
+
+    def search(self, category, query="", offset=0, limit=None):
+        return self._paged(protocol.SEARCH, (category, query), offset, limit)
+
+    def search_deleted(self, query="", offset=0, limit=None):
+        return self._paged(protocol.SEARCH_DELETED, (query,), offset, limit)
+
+    # ---------------- Import / Export ----------------
+    def importer(self, category, chunks, **kwargs):
+        return CredentialImporter(self, category, chunks, **kwargs)
+
+    # the daemon runs in its own working directory, so paths are resolved here first
+    def export(self, path, fmt=None, compress=None, since=None):
+        return self.client.call(protocol.EXPORT, os.path.abspath(path), fmt, compress, since, timeout=None)
+
+    def backup(self, directory, full=False):
+        return self.client.call(protocol.BACKUP, os.path.abspath(directory), full, timeout=None)
+
+    def close(self):
+        self.client.close()
+
+
+def attach_vault(path=None, db=None, start=True):
+    """
+    Connects to the vault daemon, starting it first (with `db` as its store)
+    when none is running and `start` is set. Returns (RemoteVault, started).
+    """
+    path = path or default_socket_path()
+    started = False
+    if not socket_alive(path):
+        if not start:
+            raise DaemonError(f"No vault daemon on {path}")
+        spawn(path, db)
+        started = True
+    client = VaultClient(path)
+    try:
+        client.call(protocol.PING)  # once answered, the daemon has registered us and no push is missed
+    except BaseException:
+        client.close()
+        raise
+    return RemoteVault(client), started
@@ -0,0 +1,250 @@
+"""
+Offline copy of the HIBP range corpus, kept current by incremental sync.
+
+Every one of the 16^5 ranges is stored compressed in SQLite together with
+the ETag / Last-Modified the server sent for it. A sync walks the prefixes
+with a pooled, concurrent client and asks for each range conditionally, so
+ranges that did not change cost a 304 and no body. Results are written in
+prefix order, a batch per transaction together with the sync cursor, so an
+interrupted sync resumes where the last committed batch ended.
+
+    python -m credcore sync-corpus hibp.db --workers 32
+    CREDLOCK_HIBP_CORPUS=hibp.db python Credlock.py
+"""
+import sqlite3
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .breach import HIBP_RETRIES, hash_password, parse_range, request_range
+
+PREFIX_COUNT = 16 ** 5
+SYNC_WORKERS = 16
+SYNC_BATCH = 256  # ranges per transaction; at most this much work is lost to an interruption
+IN_FLIGHT_PER_WORKER = 4  # queued requests per worker, keeps the pool busy across batch commits
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ranges (
+    prefix TEXT PRIMARY KEY,
+    body BLOB NOT NULL,        -- zlib-compressed response text
+    etag TEXT,
+    last_modified TEXT,
+    checked REAL NOT NULL      -- when the server last sent or confirmed this range
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS failed (prefix TEXT PRIMARY KEY) WITHOUT ROWID;  -- retried first next sync
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value);
+"""
+
+
+def prefix_at(index):
+    return f"{index:05X}"
+
+
+# --------------------- Store ---------------------
+class BreachCorpus:
+    """The local range store. Lookups are safe from any thread."""
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")  # lookups keep working while a sync writes
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM ranges").fetchone()[0]
+
+    def get_meta(self, key, default=None):
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return default if row is None else row[0]
+
+    def range_counts(self, prefix):
+        """{suffix: count} for a stored range, or None when the range has not been synced."""
+        with self.lock:
+            row = self.conn.execute("SELECT body FROM ranges WHERE prefix = ?", (prefix.upper(),)).fetchone()
+        return None if row is None else parse_range(zlib.decompress(row[0]).decode("ascii"))
+
+    def count(self, password):
+        """Breach count of a password, or None when its range is not in the corpus."""
+        prefix, suffix = hash_password(password)
+        counts = self.range_counts(prefix)
+        return None if counts is None else counts.get(suffix, 0)
+
+    def validators(self, prefixes):
+        """{prefix: (etag, last_modified)} for those of `prefixes` (at most a batch) already stored."""
+        marks = ", ".join("?" * len(prefixes))
+        with self.lock:
+            rows = self.conn.execute(f"SELECT prefix, etag, last_modified FROM ranges WHERE prefix IN ({marks})",
+                                     list(prefixes)).fetchall()
+        return {prefix: (etag, last_modified) for prefix, etag, last_modified in rows}
+
+    def failed_prefixes(self):
+        with self.lock:
+            return [prefix for (prefix,) in self.conn.execute("SELECT prefix FROM failed ORDER BY prefix")]
+
+    def write(self, outcomes, meta=None):
+        """
+        Applies [(prefix, outcome)] from CorpusSync.fetch and the given meta
+        values in one transaction, so the store never holds half a batch.
+        """
+        now = time.time()
+        updated, confirmed, failed = [], [], []
+        for prefix, outcome in outcomes:
+            if outcome[0] == "updated":
+                _, body, etag, last_modified = outcome
+                updated.append((prefix, zlib.compress(body), etag, last_modified, now))
+            elif outcome[0] == "unchanged":
+                confirmed.append((now, prefix))
+            else:
+                failed.append((prefix,))
+        with self.lock, self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO ranges VALUES (?, ?, ?, ?, ?)", updated)
+            self.conn.executemany("UPDATE ranges SET checked = ? WHERE prefix = ?", confirmed)
+            self.conn.executemany("DELETE FROM failed WHERE prefix = ?",
+                                  [(row[0],) for row in updated] + [(prefix,) for _, prefix in confirmed])
+            self.conn.executemany("INSERT OR IGNORE INTO failed VALUES (?)", failed)
+            for key, value in (meta or {}).items():
+                if value is None:
+                    self.conn.execute("DELETE FROM meta WHERE key = ?", (key,))
+                else:
+                    self.conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    def close(self):
+        self.conn.close()
+
+
+# --------------------- Sync ---------------------
+class CorpusSync:
+    """
+    Brings a BreachCorpus up to date with the range API (or a stand-in,
+    see benchmarks/hibp_server.py). stats counts updated (200), unchanged
+    (304) and failed ranges, retries and the body bytes downloaded.
+    """
+
+    def __init__(self, corpus, base_url=None, workers=SYNC_WORKERS, batch=SYNC_BATCH, retries=HIBP_RETRIES):
+        import requests
+
+        self.corpus = corpus
+        self.base_url = base_url
+        self.workers = workers
+        self.batch = batch
+        self.retries = retries
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.stats = {"updated": 0, "unchanged": 0, "failed": 0, "retries": 0, "bytes": 0}
+
+    def fetch(self, prefix, validators=None):
+        """
+        One conditional range request. Returns (outcome, retries), the
+        outcome being ("updated", body, etag, last_modified), ("unchanged",)
+        or ("failed", status).
+        """
+        etag, last_modified = validators or (None, None)
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        stats = {}
+        response = request_range(prefix, self.session, self.base_url, headers, self.retries, stats)
+        retries = stats.get("retries", 0)
+        if response is None:
+            return ("failed", -2), retries
+        if response.status_code == 304:
+            return ("unchanged",), retries
+        if response.status_code == 200:
+            return ("updated", response.content, response.headers.get("ETag"),
+                    response.headers.get("Last-Modified")), retries
+        return ("failed", response.status_code), retries
+
+    def fetch_all(self, prefixes):
+        """Yields (prefix, outcome) in prefix order while the pool keeps a bounded number of requests in flight."""
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="corpus-sync") as pool:
+            in_flight = deque()
+            window = deque()  # prefixes whose validators have been loaded but not yet submitted
+            known = {}
+            prefixes = iter(prefixes)
+            try:
+                while True:
+                    while len(in_flight) < self.workers * IN_FLIGHT_PER_WORKER:
+                        if not window:
+                            window.extend(next(prefixes, None) for _ in range(self.batch))
+                            while window and window[-1] is None:
+                                window.pop()
+                            if not window:
+                                break
+                            known = self.corpus.validators(window)
+                        prefix = window.popleft()
+                        in_flight.append((prefix, pool.submit(self.fetch, prefix, known.get(prefix))))
+                    if not in_flight:
+                        return
+                    prefix, future = in_flight.popleft()
+                    outcome, retries = future.result()
+                    self.stats["retries"] += retries
+                    yield prefix, outcome
+            finally:
+                for _, future in in_flight:
+                    future.cancel()
+
+    def _apply(self, outcomes, meta):
+        self.corpus.write(outcomes, meta)
+        for _, outcome in outcomes:
+            self.stats[outcome[0]] += 1
+            if outcome[0] == "updated":
+                self.stats["bytes"] += len(outcome[1])
+
+    def run(self, start=0, stop=PREFIX_COUNT, restart=False, progress=None):
+        """
+        Syncs prefixes [start, stop). An unfinished earlier run is resumed
+        from its cursor (with its own bounds) unless `restart` is set;
+        ranges that failed last time are retried first. progress(done, total)
+        is called after every committed batch. Returns self.stats.
+        """
+        cursor = self.corpus.get_meta("sync_cursor")
+        if cursor is not None and not restart:
+            start, stop = int(cursor), int(self.corpus.get_meta("sync_stop", stop))
+        self.corpus.write([], {"sync_cursor": start, "sync_stop": stop})
+
+        retry = self.corpus.failed_prefixes()
+        if retry:
+            self._walk(retry, None, progress)
+        self._walk((prefix_at(i) for i in range(start, stop)), lambda done: start + done, progress,
+                   total=stop - start)
+        self.corpus.write([], {"sync_cursor": None, "sync_stop": None, "synced_at": time.time()})
+        return self.stats
+
+    def _walk(self, prefixes, cursor_after, progress, total=None):
+        """
+        Fetches and commits `prefixes` in batches. With cursor_after, the
+        sync cursor cursor_after(done) is saved in the same transaction.
+        """
+        if total is None:
+            prefixes = list(prefixes)
+            total = len(prefixes)
+        pending = []
+        done = 0
+        try:
+            for prefix, outcome in self.fetch_all(prefixes):
+                pending.append((prefix, outcome))
+                if len(pending) >= self.batch:
+                    done += len(pending)
+                    self._apply(pending, cursor_after and {"sync_cursor": cursor_after(done)})
+                    pending = []
+                    if progress is not None:
+                        progress(done, total)
+        finally:
+            # results arrive in prefix order, so what did arrive is a consistent prefix of the walk;
+            # keep it even when interrupted
+            if pending:
+                done += len(pending)
+                self._apply(pending, cursor_after and {"sync_cursor": cursor_after(done)})
+
+    def close(self):
+        self.session.close()
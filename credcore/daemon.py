@@ -0,0 +1,221 @@
+"""
+Background vault service: one process holds the unlocked vault and serves
+the GUI and scripts over a Unix domain socket (see protocol.py).
+
+    python -m credcore serve [--db vault.db]
+    python -m credcore stop
+"""
+import asyncio
+import os
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from . import protocol
+from .retention import PURGE_INTERVAL
+from .vault import open_vault
+
+SPAWN_TIMEOUT = 5  # seconds to wait for a freshly started daemon to accept connections
+# File I/O, compression and full similarity reports: run on a worker thread (over a snapshot)
+# so the loop keeps serving
+BLOCKING_OPS = (protocol.EXPORT, protocol.BACKUP, protocol.SIMILAR_PAIRS, protocol.SIMILAR_GROUPS)
+
+
+def default_socket_path():
+    """
+    A per-user socket in $XDG_RUNTIME_DIR, or else in a private directory
+    under the shared temp dir. That directory is only used if it is a real
+    directory owned by this user with mode 0700, so another local user who
+    created it first cannot get between the clients and the vault.
+    """
+    base = os.environ.get("XDG_RUNTIME_DIR")
+    if not base:
+        base = os.path.join(tempfile.gettempdir(), f"credlock-{os.getuid()}")
+        os.makedirs(base, mode=0o700, exist_ok=True)
+        info = os.lstat(base)
+        if (not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid()
+                or stat.S_IMODE(info.st_mode) != 0o700):
+            raise RuntimeError(f"Refusing to use {base} for the vault socket: "
+                               "it must be a directory owned by you with mode 0700")
+    return os.path.join(base, "credlock-vault.sock")
+
+
+def socket_alive(path):
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+# --------------------- Request Handlers ---------------------
+def handle_request(vault, op, args):
+    """Runs one request against the vault. Returns (result, changed categories)."""
+    if op == protocol.PING:
+        return "pong", ()
+    if op == protocol.SHUTDOWN:
+        return "bye", ()
+    if op == protocol.CONTAINS:
+        return tuple(args) in vault, ()
+    if op == protocol.PRESENT:
+        return tuple(vault.index.present(args[0])), ()
+    if op == protocol.COUNT:
+        return len(vault.data[args[0]]), ()
+    if op == protocol.SEARCH:
+        category, query, offset, limit = args
+        return tuple(vault.search(category, query, offset, limit)), ()
+    if op == protocol.SEARCH_DELETED:
+        query, offset, limit = args
+        return tuple(vault.search_deleted(query, offset, limit)), ()
+    if op == protocol.COUNT_DELETED:
+        return len(vault.deleted), ()
+    if op == protocol.ADD_MANY:
+        category, entries = args
+        vault.add_many(category, list(entries))
+        return len(entries), (category,)
+    if op == protocol.DELETE_MANY:
+        category, entries = args
+        vault.delete_many(category, entries)
+        return None, (category, "deleted")
+    if op == protocol.RESTORE_MANY:
+        vault.restore_many(args[0])
+        return None, tuple({category for category, _, _ in args[0]}) + ("deleted",)
+    if op == protocol.PURGE:
+        purged = vault.purge_deleted()
+        return purged, ("deleted",) if purged else ()
+    if op == protocol.PURGE_ALL:
+        old = vault.purge_all_deleted()
+        threading.Thread(target=old.clear, daemon=True).start()  # the loop keeps serving meanwhile
+        return None, ("deleted",)
+    if op == protocol.REUSE_USERS:
+        return tuple(vault.reuse.users(*args)), ()
+    if op == protocol.REUSE_GROUPS:
+        return tuple(tuple(group) for group in vault.reuse.groups()), ()
+    if op == protocol.SIMILAR:
+        return tuple(vault.similar.similar(*args)), ()
+    if op == protocol.SIMILAR_PAIRS:
+        return tuple(vault.similar.pairs()), ()
+    if op == protocol.SIMILAR_READY:
+        return vault.similar.ready, ()
+    if op == protocol.SIMILAR_GROUPS:
+        return tuple(tuple(group) for group in vault.similar.groups()), ()
+    if op == protocol.CHECKS_LOOKUP:
+        found = vault.breach_checks.lookup(args[0])
+        return tuple((*key, checked_at, pwned) for key, (checked_at, pwned) in found.items()), ()
+    if op == protocol.CHECKS_RECORD:
+        vault.breach_checks.record(args[0])
+        return None, ()
+    if op == protocol.CHECKS_PWNED:
+        return tuple(tuple(row) for row in vault.breach_checks.pwned()), ()
+    if op == protocol.EXPORT:
+        path, fmt, compress, since = args
+        return vault.export(path, fmt=fmt, compress=compress, since=since), ()
+    if op == protocol.BACKUP:
+        directory, full = args
+        return vault.backup(directory, full=full), ()
+    raise ValueError(f"Unknown request {op}")
+
+
+# --------------------- Daemon ---------------------
+class VaultDaemon:
+    """
+    Serves one vault to any number of clients. Requests on a connection are
+    handled in order, each reply tagged with its request id. Vault access
+    happens on the event loop thread, except exports, backups and similarity
+    reports (BLOCKING_OPS), which read a snapshot on a worker thread. After a
+    mutation every other client gets a PUSH frame naming the changed
+    categories (screens), so it can refresh.
+    """
+
+    def __init__(self, vault, path=None):
+        self.vault = vault
+        self.path = path or default_socket_path()
+        self.writers = set()
+        self.stopping = None
+
+    async def handle(self, reader, writer):
+        self.writers.add(writer)
+        buffer = bytearray()
+        try:
+            while True:
+                data = await reader.read(1 << 16)
+                if not data:
+                    break
+                buffer += data
+                for op, request_id, args in protocol.read_frames(buffer):
+                    try:
+                        if op in BLOCKING_OPS:
+                            result, changed = await asyncio.get_running_loop().run_in_executor(
+                                None, handle_request, self.vault, op, args)
+                        else:
+                            result, changed = handle_request(self.vault, op, args)
+                    except Exception as e:  # report to the caller, keep serving
+                        writer.write(protocol.frame(protocol.ERROR, request_id, f"{type(e).__name__}: {e}"))
+                        continue
+                    writer.write(protocol.frame(protocol.OK, request_id, result))
+                    if changed:
+                        self.broadcast(changed, exclude=writer)
+                    if op == protocol.SHUTDOWN:
+                        self.stopping.set()
+                await writer.drain()
+        except (ConnectionError, protocol.ProtocolError):
+            pass
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+
+    def broadcast(self, categories, exclude=None):
+        message = protocol.frame(protocol.PUSH, 0, tuple(categories))
+        for writer in list(self.writers):
+            if writer is not exclude and not writer.is_closing():
+                writer.write(message)
+
+    def purge_expired(self):
+        if self.vault.purge_deleted():
+            self.broadcast(("deleted",))
+        asyncio.get_running_loop().call_later(PURGE_INTERVAL, self.purge_expired)
+
+    async def serve(self):
+        if os.path.exists(self.path):
+            if socket_alive(self.path):
+                raise RuntimeError(f"A vault daemon is already listening on {self.path}")
+            os.unlink(self.path)  # left behind by a daemon that died
+        self.stopping = asyncio.Event()
+        server = await asyncio.start_unix_server(self.handle, path=self.path)
+        os.chmod(self.path, 0o600)
+        asyncio.get_running_loop().call_later(PURGE_INTERVAL, self.purge_expired)
+        try:
+            async with server:
+                await self.stopping.wait()
+        finally:
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            self.vault.close()
+
+
+def serve(path=None, db=None):
+    """Runs the daemon in the foreground until a SHUTDOWN request."""
+    asyncio.run(VaultDaemon(open_vault(db), path).serve())
+
+
+def spawn(path=None, db=None):
+    """Starts a detached daemon and waits until it accepts connections. Returns the socket path."""
+    path = path or default_socket_path()
+    command = [sys.executable, "-m", "credcore", "serve", "--socket", path]
+    if db:
+        command += ["--db", db]
+    subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                     start_new_session=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    deadline = time.monotonic() + SPAWN_TIMEOUT
+    while not socket_alive(path):
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"The vault daemon did not start on {path}")
+        time.sleep(0.02)
+    return path
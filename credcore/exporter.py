@@ -0,0 +1,149 @@
+"""Streaming export and incremental backup of the vault (data and deleted bin)."""
+import csv
+import gzip
+import io
+import json
+import os
+import time
+
+EXPORT_FIELDS = ("section", "category", "name", "secret", "changed")
+BACKUP_MARKER = ".credlock-backup-marker"
+
+
+# --------------------- Record Stream ---------------------
+def iter_records(data, deleted, changed=None, since=None):
+    """
+    Yields one dict per vault record without copying the vault.
+    With `since`, only records whose change stamp is newer are yielded.
+    """
+    changed = changed or {}
+
+    def stamped(section, category, name, secret, stamp):
+        if since is None or stamp > since:
+            return {"section": section, "category": category, "name": name, "secret": secret, "changed": stamp}
+        return None
+
+    for category, items in data.items():
+        for name, secret in items:
+            record = stamped("data", category, name, secret, changed.get((category, name), 0))
+            if record:
+                yield record
+    for tombstone in deleted:  # tombstones carry their own stamp
+        name, secret = tombstone.record
+        record = stamped("deleted", tombstone.category, name, secret, tombstone.deleted_at)
+        if record:
+            yield record
+
+
+def iter_jsonl(records):
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def iter_csv(records):
+    """Yields CSV lines; a single small buffer is reused for every row."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    writer.writerow(EXPORT_FIELDS)
+    yield flush()
+    for record in records:
+        writer.writerow([record[field] for field in EXPORT_FIELDS])
+        yield flush()
+
+
+# --------------------- File Output ---------------------
+def write_lines(path, lines, compress=False):
+    """
+    Writes a line stream to `path` (gzip-compressed if asked) and returns the line count.
+    Output goes to a temporary file first so a failed export never leaves a partial file.
+    """
+    tmp_path = path + ".part"
+    opener = gzip.open if compress else open
+    count = 0
+    try:
+        with opener(tmp_path, "wt", encoding="utf-8", newline="") as f:
+            for line in lines:
+                f.write(line)
+                count += 1
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return count
+
+
+def export_vault(path, data, deleted, changed=None, fmt=None, compress=None, since=None):
+    """
+    Exports the vault to CSV or JSON lines. The format and compression default
+    to what the file name says (.csv / .jsonl, optional .gz suffix).
+    Returns the number of records written.
+    """
+    return export_records(path, iter_records(data, deleted, changed, since), fmt, compress)
+
+
+def export_records(path, records, fmt=None, compress=None):
+    """export_vault for any record stream (e.g. one read straight from SQLite)."""
+    base = path[:-3] if path.endswith(".gz") else path
+    if compress is None:
+        compress = path.endswith(".gz")
+    if fmt is None:
+        fmt = "csv" if base.endswith(".csv") else "jsonl"
+
+    if fmt == "csv":
+        return write_lines(path, iter_csv(records), compress) - 1  # header line
+    return write_lines(path, iter_jsonl(records), compress)
+
+
+# --------------------- Incremental Backup ---------------------
+def read_marker(directory):
+    try:
+        with open(os.path.join(directory, BACKUP_MARKER), encoding="utf-8") as f:
+            return json.load(f).get("last")
+    except (OSError, ValueError):
+        return None
+
+
+def write_marker(directory, stamp):
+    path = os.path.join(directory, BACKUP_MARKER)
+    with open(path + ".part", "w", encoding="utf-8") as f:
+        json.dump({"last": stamp}, f)
+    os.replace(path + ".part", path)
+
+
+def backup_vault(directory, data, deleted, changed=None, full=False):
+    """
+    Writes a gzip JSON-lines backup into `directory`. Unless `full` is set, only
+    records changed since the previous backup marker are written.
+    Returns (backup_path, record_count).
+    """
+    return backup_records(directory, lambda since: iter_records(data, deleted, changed, since), full)
+
+
+def backup_records(directory, records_since, full=False):
+    """
+    backup_vault for any store; records_since(since) yields the records changed
+    after `since`. It must take its snapshot when called, not earlier: the
+    marker saved is the time just before, so a change the snapshot misses is
+    stamped later and goes into the next backup.
+    """
+    since = None if full else read_marker(directory)
+    started = time.time()  # changes made while the backup runs go into the next one
+    kind = "full" if since is None else "incremental"
+    name = time.strftime("credlock-backup-%Y%m%d-%H%M%S", time.localtime(started))
+    name += f".{int(started % 1 * 1000):03d}"
+    path = os.path.join(directory, f"{name}-{kind}.jsonl.gz")
+    number = 1
+    while os.path.exists(path):  # never replace an earlier backup of the chain
+        path = os.path.join(directory, f"{name}.{number}-{kind}.jsonl.gz")
+        number += 1
+    count = export_records(path, records_since(since), fmt="jsonl", compress=True)
+    write_marker(directory, started)
+    return path, count
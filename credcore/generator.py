@@ -0,0 +1,86 @@
+"""Random password generation from a buffered CSPRNG."""
+import functools
+import os
+import re
+import string
+
+# Character classes; a generated password contains at least one of each class.
+CHARSET_POLICIES = {
+    "full": (string.ascii_lowercase, string.ascii_uppercase, string.digits, string.punctuation),
+    "alnum": (string.ascii_lowercase, string.ascii_uppercase, string.digits),
+    "hex": (string.digits + "abcdef",),
+}
+MAX_RANDOM_BLOCK_SIZE = 1 << 22  # bytes pulled from os.urandom per refill, at most
+
+
+# --------------------- Helpers ---------------------
+def charset_classes(charset_policy):
+    """Accepts a policy name from CHARSET_POLICIES or a sequence of class strings."""
+    if isinstance(charset_policy, str):
+        try:
+            return CHARSET_POLICIES[charset_policy]
+        except KeyError:
+            raise ValueError(f"Unknown charset policy: {charset_policy!r}") from None
+    classes = tuple(cls for cls in charset_policy if cls)  # tuple: hashable for the caches
+    if not classes:
+        raise ValueError("A charset policy needs at least one character class.")
+    return classes
+
+
+@functools.lru_cache(maxsize=32)
+def byte_table(alphabet):
+    """
+    Builds a bytes.translate() table mapping random bytes onto `alphabet`.
+    Bytes >= the largest multiple of len(alphabet) are deleted, which is
+    rejection sampling: every kept byte maps to a character uniformly.
+    """
+    if not alphabet or len(alphabet) > 256 or not alphabet.isascii():
+        raise ValueError("The alphabet must hold 1-256 ASCII characters.")
+    size = len(alphabet)
+    limit = 256 - 256 % size
+    table = bytes(ord(alphabet[b % size]) for b in range(256))
+    return table, bytes(range(limit, 256))
+
+
+@functools.lru_cache(maxsize=32)
+def class_matcher(classes):
+    """Compiled check that a candidate holds one character of every class."""
+    lookaheads = "".join(f"(?=[^{re.escape(cls)}]*[{re.escape(cls)}])" for cls in classes)
+    return re.compile(lookaheads).match
+
+
+# --------------------- Password Generator Function ---------------------
+def generate_passwords(n, length=16, charset_policy="full"):
+    """
+    Generates `n` passwords of `length` characters with one call to os.urandom
+    per block rather than one random call per character.
+
+    Random bytes are mapped to characters with bytes.translate (unbiased
+    rejection sampling in C) and the resulting stream is cut into candidates.
+    Candidates missing a character class are dropped whole, so every accepted
+    password is uniform among those that satisfy the "one of each" rule.
+    """
+    classes = charset_classes(charset_policy)
+    if length < len(classes):
+        raise ValueError(f"Length must be at least {len(classes)} for this charset policy.")
+    alphabet = "".join(dict.fromkeys("".join(classes)))
+    table, rejected = byte_table(alphabet)
+    matches = class_matcher(classes)
+
+    passwords = []
+    stream = ""
+    while len(passwords) < n:
+        wanted = 2 * (n - len(passwords)) * length + 64  # headroom for rejected bytes and candidates
+        block = os.urandom(min(wanted, MAX_RANDOM_BLOCK_SIZE))
+        stream += block.translate(table, rejected).decode("ascii")
+        usable = len(stream) - len(stream) % length
+        candidates = [stream[i:i + length] for i in range(0, usable, length)]
+        stream = stream[usable:]
+        passwords.extend(filter(matches, candidates))
+    del passwords[n:]
+    return passwords
+
+
+def generate_password(length=16):
+    """Generates a secure, random password."""
+    return generate_passwords(1, length)[0]
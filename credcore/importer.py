@@ -0,0 +1,198 @@
+"""Streaming import of browser / password-manager CSV exports into the vault."""
+import csv
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from .reuse import REUSE_CATEGORIES
+
+IMPORT_CHUNK_SIZE = 2000  # rows read, deduplicated and inserted per batch
+MAX_PENDING_AUDITS = 4  # audit / signature batches allowed in flight before reading pauses
+
+# Header aliases used by Chrome, Firefox, Edge, Bitwarden, KeePass and plain exports.
+NAME_FIELDS = ("name", "title", "label", "ssid", "account")
+USER_FIELDS = ("username", "login_username", "login", "user", "email")
+SECRET_FIELDS = ("password", "login_password", "pass", "secret", "value", "code", "psk")
+URL_FIELDS = ("url", "login_uri", "website", "origin_url", "hostname")
+KNOWN_FIELDS = set(NAME_FIELDS + USER_FIELDS + SECRET_FIELDS + URL_FIELDS)
+
+
+# --------------------- Row Parsing ---------------------
+def _pick(row, fields):
+    for field in fields:
+        value = row.get(field)
+        if value:
+            return value.strip()
+    return ""
+
+
+def _site(url):
+    if not url:
+        return ""
+    host = urlparse(url if "://" in url else f"//{url}").hostname
+    return host or url
+
+
+def row_to_entry(row):
+    """Turns one CSV row (a dict keyed by lowercased header) into a (name, secret) tuple, or None."""
+    secret = _pick(row, SECRET_FIELDS)
+    user = _pick(row, USER_FIELDS)
+    site = _pick(row, NAME_FIELDS) or _site(_pick(row, URL_FIELDS))
+    if user and site:
+        name = f"{user} @ {site}"
+    else:
+        name = user or site
+    if not name or not secret:
+        return None
+    return name, secret
+
+
+def iter_entries(lines):
+    """
+    Yields (name, secret) tuples from an iterable of CSV lines, one row at a time.
+    Files without a recognised header are read as two columns: name, secret.
+    """
+    reader = csv.reader(lines)
+    first = next(reader, None)
+    if first is None:
+        return
+    header = [h.strip().lower() for h in first]
+    if not KNOWN_FIELDS.intersection(header):
+        header = ["name", "secret"]
+        reader = itertools.chain([first], reader)
+    for values in reader:
+        entry = row_to_entry(dict(zip(header, values)))
+        if entry is not None:
+            yield entry
+
+
+def iter_chunks(entries, chunk_size=IMPORT_CHUNK_SIZE):
+    """Groups an entry stream into lists of at most chunk_size items."""
+    entries = iter(entries)
+    while True:
+        chunk = list(itertools.islice(entries, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_file_chunks(path, chunk_size=IMPORT_CHUNK_SIZE):
+    """Streams a CSV export from disk in chunks; only one chunk is held in memory."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        yield from iter_chunks(iter_entries(f), chunk_size)
+
+
+# --------------------- Optional Audit ---------------------
+def audit_batch(entries, check_strength=None, check_breach=None):
+    """
+    Runs the optional strength / breach checks for a batch of (name, secret) tuples.
+    Returns a list of (name, score, pwned_count); skipped checks report None.
+    """
+    results = []
+    for name, secret in entries:
+        score = check_strength(secret)[0] if check_strength else None
+        pwned = check_breach(secret) if check_breach else None
+        results.append((name, score, pwned))
+    return results
+
+
+def sign_batch(similar, entries):
+    """Computes SimilarityIndex signatures for a batch of (name, secret) tuples, off the UI thread."""
+    return [(name, similar.signature(secret)) for name, secret in entries]
+
+
+# --------------------- Importer ---------------------
+class CredentialImporter:
+    """
+    Inserts a chunked entry stream into a Vault one batch at a time.
+
+    The caller drives it by calling step() (e.g. from Tk's after()), so the UI
+    can refresh once per batch. Rows whose (category, name) is already in the
+    vault index - or earlier in the same file - are skipped. Strength and breach
+    checks, when given, run in a background thread pool and their results are
+    collected in self.audit_results. The near-duplicate signatures of inserted
+    rows are computed in the same pool and added to the vault's similarity
+    index when collected, so step() stays cheap.
+    """
+
+    def __init__(self, vault, category, chunks, check_strength=None, check_breach=None, workers=2):
+        self.vault = vault
+        self.category = category
+        self.chunks = iter(chunks)
+        self.check_strength = check_strength
+        self.check_breach = check_breach
+        self.imported = 0
+        self.skipped = 0
+        self.audit_results = {}
+        self.pending = []  # audit futures
+        self.signing = []  # signature futures; applied on the caller's thread, never dropped
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="import-audit")
+        self.done = False
+
+    def busy(self):
+        """True while the worker pool is too far behind to accept another batch."""
+        self._collect()
+        return len(self.pending) + len(self.signing) >= MAX_PENDING_AUDITS
+
+    def step(self):
+        """Imports the next chunk. Returns the list of inserted entries, or None when finished."""
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self.done = True
+            return None
+
+        fresh = []
+        seen = self.vault.index.present({(self.category, name) for name, _ in chunk})  # one lookup per chunk
+        for name, secret in chunk:
+            key = (self.category, name)
+            if key in seen:
+                self.skipped += 1
+                continue
+            seen.add(key)
+            fresh.append((name, secret))
+
+        similar = self.vault.similarity_index() if fresh and self.category in REUSE_CATEGORIES else None
+        self.vault.add_many(self.category, fresh, index_similar=similar is None)
+        self.imported += len(fresh)
+        if similar is not None:
+            self.signing.append((similar, self.pool.submit(sign_batch, similar, fresh)))
+        if (self.check_strength or self.check_breach) and fresh:
+            self.pending.append(self.pool.submit(audit_batch, fresh, self.check_strength, self.check_breach))
+        return fresh
+
+    def _add_signatures(self, similar, signed):
+        present = self.vault.index.present({(self.category, name) for name, _ in signed})
+        for name, entry in signed:
+            if (self.category, name) in present:  # skip rows deleted meanwhile
+                similar.add_signed(self.category, name, entry)
+
+    def _collect(self):
+        still_signing = []
+        for similar, future in self.signing:
+            if future.done():
+                self._add_signatures(similar, future.result())
+            else:
+                still_signing.append((similar, future))
+        self.signing = still_signing
+        still_pending = []
+        for future in self.pending:
+            if future.done():
+                for name, score, pwned in future.result():
+                    self.audit_results[(self.category, name)] = {"score": score, "pwned": pwned}
+            else:
+                still_pending.append(future)
+        self.pending = still_pending
+
+    def audit_finished(self):
+        self._collect()
+        return not self.pending and not self.signing
+
+    def close(self):
+        """Stops reading the source, adds the outstanding similarity signatures and shuts the pool down."""
+        close = getattr(self.chunks, "close", None)
+        if close:
+            close()
+        for similar, future in self.signing:  # rows already inserted still get their signatures
+            self._add_signatures(similar, future.result())
+        self.signing = []
+        self.pool.shutdown(wait=False, cancel_futures=True)
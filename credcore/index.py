@@ -0,0 +1,42 @@
+"""Lookup index over the in-memory vault."""
+import time
+
+
+# --------------------- Vault Index ---------------------
+class VaultIndex:
+    """
+    Tracks which (category, name) pairs are present in the vault data.
+    Membership checks are O(1) instead of a scan over the category list.
+
+    It also stamps every change with the wall-clock time in self.changed,
+    keyed by (category, name), so incremental backups can skip records
+    untouched since the last run. Deleted records are stamped by their
+    tombstone (see retention.py), so purging the bin never touches this index.
+    """
+
+    def __init__(self, data=None):
+        self.keys = set()
+        self.changed = {}
+        if data is not None:
+            self.rebuild(data)
+
+    def rebuild(self, data):
+        self.keys = {(category, item[0]) for category, items in data.items() for item in items}
+
+    def add(self, category, name):
+        self.keys.add((category, name))
+        self.changed[(category, name)] = time.time()
+
+    def discard(self, category, name):
+        self.keys.discard((category, name))
+        self.changed.pop((category, name), None)
+
+    def __contains__(self, key):
+        return key in self.keys
+
+    def present(self, keys):
+        """The subset of `keys` already in the vault (one call per batch; see SqliteIndex, RemoteIndex)."""
+        return {key for key in keys if key in self.keys}
+
+    def __len__(self):
+        return len(self.keys)
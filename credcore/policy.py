@@ -0,0 +1,122 @@
+"""Policy-driven password generation with a computed (not measured) strength guarantee."""
+import functools
+import math
+import secrets
+
+from .generator import charset_classes, generate_passwords
+from .strength import SUGGESTIONS
+
+AMBIGUOUS_CHARACTERS = "Il1|O0o`'\";:,."
+PASSPHRASE_WORDS = 8192  # 13 bits per word
+# zxcvbn's score thresholds (1e3, 1e6, 1e8, 1e10 guesses) expressed in bits
+SCORE_THRESHOLDS = (math.log2(1e3), math.log2(1e6), math.log2(1e8), math.log2(1e10))
+
+
+# --------------------- Entropy Helpers ---------------------
+@functools.lru_cache(maxsize=1)
+def default_wordlist():
+    """The most frequent plain English words (4-8 letters) from zxcvbn's own frequency lists."""
+    from zxcvbn.frequency_lists import FREQUENCY_LISTS
+
+    words = []
+    for word in FREQUENCY_LISTS["english_wikipedia"]:
+        if 4 <= len(word) <= 8 and word.isascii() and word.isalpha():
+            words.append(word)
+            if len(words) == PASSPHRASE_WORDS:
+                break
+    return tuple(words)
+
+
+def charset_entropy(class_sizes, length):
+    """
+    Exact entropy in bits of a uniform password of `length` characters that
+    holds at least one character from each (disjoint) class. Inclusion-exclusion
+    counts the strings missing no class.
+    """
+    total = sum(class_sizes)
+    count = 0
+    for mask in range(1 << len(class_sizes)):
+        missing = sum(size for bit, size in enumerate(class_sizes) if mask >> bit & 1)
+        sign = -1 if bin(mask).count("1") % 2 else 1
+        count += sign * (total - missing) ** length
+    return math.log2(count) if count > 0 else 0.0
+
+
+def score_from_entropy(bits):
+    """Maps entropy to the 0-4 scale used by check_password_strength."""
+    return sum(bits >= threshold for threshold in SCORE_THRESHOLDS)
+
+
+# --------------------- Password Policy ---------------------
+class PasswordPolicy:
+    """
+    Describes what to generate and how strong it must be.
+
+    classes           - charset policy name or sequence of class strings (charset mode)
+    min_entropy_bits  - the password length / word count is derived from this
+    exclude_ambiguous - drop look-alike characters such as l, 1, O and 0
+    passphrase        - generate words from `wordlist` instead of characters
+    min_length        - lower bound on characters (charset mode) or words (passphrase)
+
+    Because every password is drawn uniformly, its entropy is known up front
+    and the strength needs no zxcvbn check afterwards.
+    """
+
+    def __init__(self, classes="full", min_entropy_bits=80, exclude_ambiguous=False, passphrase=False,
+                 wordlist=None, separator="-", min_length=8):
+        self.min_entropy_bits = min_entropy_bits
+        self.passphrase = passphrase
+        self.separator = separator
+        self.min_length = min_length
+        self._wordlist = tuple(dict.fromkeys(wordlist)) if wordlist else None
+
+        seen = set(AMBIGUOUS_CHARACTERS) if exclude_ambiguous else set()
+        disjoint = []
+        for cls in charset_classes(classes):
+            kept = "".join(ch for ch in dict.fromkeys(cls) if ch not in seen)
+            seen.update(kept)
+            if kept:
+                disjoint.append(kept)
+        if not passphrase and not disjoint:
+            raise ValueError("The policy leaves no characters to choose from.")
+        self.classes = tuple(disjoint)
+
+    @property
+    def wordlist(self):
+        return self._wordlist or default_wordlist()
+
+    def entropy(self, length):
+        if self.passphrase:
+            return length * math.log2(len(self.wordlist))
+        return charset_entropy([len(cls) for cls in self.classes], length)
+
+    @functools.cached_property
+    def length(self):
+        """Smallest length (characters or words) that meets min_entropy_bits."""
+        length = max(self.min_length, 1 if self.passphrase else len(self.classes))
+        while self.entropy(length) < self.min_entropy_bits:
+            length += 1
+        return length
+
+    @property
+    def bits(self):
+        return self.entropy(self.length)
+
+    def generate_many(self, n):
+        if self.passphrase:
+            words = self.wordlist
+            return [self.separator.join(words[secrets.randbelow(len(words))] for _ in range(self.length))
+                    for _ in range(n)]
+        return generate_passwords(n, self.length, self.classes)
+
+    def generate(self):
+        """Returns (password, entropy_bits)."""
+        return self.generate_many(1)[0], self.bits
+
+    def describe(self):
+        """Suggestion text matching check_password_strength, plus the guaranteed entropy."""
+        score = score_from_entropy(self.bits)
+        return score, f"{SUGGESTIONS[score]} - {self.bits:.0f} bits"
+
+
+DEFAULT_POLICY = PasswordPolicy(min_entropy_bits=96, min_length=16)
@@ -0,0 +1,143 @@
+"""
+Compact binary protocol between the vault daemon and its clients.
+
+Every message is a frame: a 9-byte header (payload length u32, opcode u8,
+request id u32, network byte order) followed by the payload, one encoded
+value. Values are tagged: str, int, float, None, bool, bytes and tuples of
+values (lists encode as tuples). Request ids let several threads of a
+client share one connection and match the replies as they come back.
+"""
+import struct
+
+HEADER = struct.Struct("!IBI")
+U32 = struct.Struct("!I")
+I64 = struct.Struct("!q")
+F64 = struct.Struct("!d")
+MAX_FRAME = 64 << 20  # bytes; anything larger is a broken or hostile peer
+
+# Requests
+PING = 1
+CONTAINS = 2
+COUNT = 3
+SEARCH = 4
+SEARCH_DELETED = 5
+COUNT_DELETED = 6
+PRESENT = 7
+ADD_MANY = 10
+DELETE_MANY = 11
+RESTORE_MANY = 12
+PURGE = 13
+PURGE_ALL = 14
+REUSE_USERS = 20
+REUSE_GROUPS = 21
+SIMILAR = 22
+SIMILAR_PAIRS = 23
+SIMILAR_GROUPS = 24
+SIMILAR_READY = 25
+CHECKS_LOOKUP = 26
+CHECKS_RECORD = 27
+CHECKS_PWNED = 28
+EXPORT = 30
+BACKUP = 31
+SHUTDOWN = 40
+
+# Replies
+OK = 0x80
+ERROR = 0x81
+PUSH = 0x82  # unsolicited: another client changed these categories; request id 0
+
+
+class ProtocolError(Exception):
+    """A malformed frame or a value the protocol cannot encode."""
+
+
+# --------------------- Values ---------------------
+def _encode(value, out):
+    if value is None:
+        out.append(b"n")
+    elif value is True or value is False:
+        out.append(b"T" if value else b"F")
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        out.append(b"s" + U32.pack(len(data)) + data)
+    elif isinstance(value, int):
+        out.append(b"i" + I64.pack(value))
+    elif isinstance(value, float):
+        out.append(b"f" + F64.pack(value))
+    elif isinstance(value, bytes):
+        out.append(b"b" + U32.pack(len(value)) + value)
+    elif isinstance(value, (tuple, list)):
+        out.append(b"l" + U32.pack(len(value)))
+        for item in value:
+            _encode(item, out)
+    else:
+        raise ProtocolError(f"Cannot encode {type(value).__name__}")
+
+
+def encode(value):
+    out = []
+    _encode(value, out)
+    return b"".join(out)
+
+
+def _decode(view, pos):
+    tag = view[pos:pos + 1].tobytes()
+    pos += 1
+    if tag == b"s" or tag == b"b":
+        (size,) = U32.unpack_from(view, pos)
+        pos += 4
+        data = view[pos:pos + size].tobytes()
+        return (data.decode("utf-8") if tag == b"s" else data), pos + size
+    if tag == b"i":
+        return I64.unpack_from(view, pos)[0], pos + 8
+    if tag == b"l":
+        (count,) = U32.unpack_from(view, pos)
+        pos += 4
+        items = []
+        for _ in range(count):
+            item, pos = _decode(view, pos)
+            items.append(item)
+        return tuple(items), pos
+    if tag == b"f":
+        return F64.unpack_from(view, pos)[0], pos + 8
+    if tag == b"n":
+        return None, pos
+    if tag == b"T" or tag == b"F":
+        return tag == b"T", pos
+    raise ProtocolError(f"Unknown value tag {tag!r}")
+
+
+def decode(data):
+    try:
+        value, pos = _decode(memoryview(data), 0)
+    except (struct.error, UnicodeDecodeError) as e:
+        raise ProtocolError(f"Malformed payload: {e}") from None
+    if pos != len(data):
+        raise ProtocolError("Trailing bytes after payload")
+    return value
+
+
+# --------------------- Frames ---------------------
+def frame(op, request_id, value=None):
+    payload = encode(value)
+    return HEADER.pack(len(payload), op, request_id) + payload
+
+
+def read_frames(buffer):
+    """
+    Splits complete frames off the front of a bytearray. Returns
+    [(op, request_id, value)] and leaves any partial frame in the buffer.
+    """
+    frames = []
+    pos = 0
+    while len(buffer) - pos >= HEADER.size:
+        length, op, request_id = HEADER.unpack_from(buffer, pos)
+        if length > MAX_FRAME:
+            raise ProtocolError(f"Frame of {length} bytes is too large")
+        end = pos + HEADER.size + length
+        if end > len(buffer):
+            break
+        frames.append((op, request_id, decode(bytes(buffer[pos + HEADER.size:end]))))
+        pos = end
+    del buffer[:pos]
+    return frames
@@ -0,0 +1,201 @@
+"""Incremental background re-checks of stored passwords against HIBP."""
+import hashlib
+import itertools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .breach import check_hibp
+from .reuse import REUSE_CATEGORIES
+
+REAUDIT_INTERVAL = 7 * 24 * 60 * 60  # seconds before a checked record is due again
+RETRY_INTERVAL = 15 * 60  # seconds before a failed check is retried
+REAUDIT_RATE = 1.0  # HIBP requests per second, sustained
+REAUDIT_BURST = 5  # requests allowed back to back after a quiet period
+SCAN_LIMIT = 2000  # records looked at per step while searching for due ones
+SCAN_BATCH = 200  # records whose last check is looked up at once
+
+
+# --------------------- Token Bucket ---------------------
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second accumulate up to `capacity`
+    and every request spends one, so bursts are short and the long-run rate
+    never exceeds `rate`.
+    """
+
+    def __init__(self, rate=REAUDIT_RATE, capacity=REAUDIT_BURST, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = float(capacity)
+        self.updated = clock()
+
+    def refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self):
+        self.refill()
+        return int(self.tokens)
+
+    def take(self, n=1):
+        """Spends `n` tokens if there are that many. Returns whether it did."""
+        self.refill()
+        if self.tokens < n:
+            return False
+        self.tokens -= n
+        return True
+
+
+# --------------------- Check Log ---------------------
+class CheckLog:
+    """
+    The last breach check of every (category, name): when, the breach count
+    (negative when the check failed) and a keyed digest of the secret it was
+    for, so a changed password is due at once. This one lives in memory with
+    the Vault; SqliteCheckLog keeps the same table in the database, so the
+    schedule survives a restart. Stores drop the entries of deleted records.
+    """
+
+    def __init__(self):
+        self.key = os.urandom(32)
+        self.entries = {}  # (category, name) -> (digest, checked_at, pwned)
+
+    def digest(self, secret):
+        return hashlib.blake2b(secret.encode("utf-8"), key=self.key, digest_size=16).digest()
+
+    def lookup(self, records):
+        """{(category, name): (checked_at, pwned)} for the (category, name, secret) records checked with that secret."""
+        found = {}
+        for category, name, secret in records:
+            entry = self.entries.get((category, name))
+            if entry is not None and entry[0] == self.digest(secret):
+                found[(category, name)] = entry[1:]
+        return found
+
+    def record(self, results):
+        """Saves [(category, name, secret, checked_at, pwned)] check results."""
+        for category, name, secret, checked_at, pwned in results:
+            self.entries[(category, name)] = (self.digest(secret), checked_at, pwned)
+
+    def discard(self, category, names):
+        for name in names:
+            self.entries.pop((category, name), None)
+
+    def pwned(self):
+        """[(category, name, count)] of every record last found in a breach."""
+        return [(*key, entry[2]) for key, entry in self.entries.items() if entry[2] > 0]
+
+    def __len__(self):
+        return len(self.entries)
+
+
+# --------------------- Breach Re-auditor ---------------------
+class BreachReauditor:
+    """
+    Re-checks vault passwords against HIBP a few at a time.
+
+    The vault's breach_checks log (see CheckLog) remembers when each record
+    was checked, for which secret and with what result. A record is due when
+    it was never checked, its secret changed, or its result is older than
+    `max_age` (RETRY_INTERVAL after a failed check). A cursor walks the vault
+    round-robin, so each step looks at no more than SCAN_LIMIT records and
+    never rescans from the top.
+
+    The caller drives it with step() (e.g. from Tk's after(), skipping steps
+    while the user types). Checks run on one background thread and are paced
+    by a TokenBucket; step() returns the keys that newly turned up pwned.
+    """
+
+    def __init__(self, vault, check_breach=check_hibp, max_age=REAUDIT_INTERVAL,
+                 bucket=None, clock=time.time):
+        self.vault = vault
+        self.check_breach = check_breach
+        self.max_age = max_age
+        self.bucket = bucket or TokenBucket()
+        self.clock = clock
+        self.checks = vault.breach_checks
+        self.cursor = iter(())
+        self.held = []  # records read from the cursor but not yet looked at
+        self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reaudit")
+        self.pending = None  # future of the batch in flight
+
+    def _records(self):
+        for category in REUSE_CATEGORIES:
+            for name, secret in self.vault.data[category]:
+                yield category, name, secret
+
+    def due(self, record, checked, now):
+        """Whether a record is due, given the lookup() result of its batch."""
+        entry = checked.get(record[:2])
+        if entry is None:
+            return True
+        checked_at, pwned = entry
+        max_age = RETRY_INTERVAL if pwned < 0 else self.max_age
+        return now - checked_at >= max_age
+
+    def _read(self, count):
+        batch, self.held = self.held[:count], self.held[count:]
+        batch.extend(itertools.islice(self.cursor, count - len(batch)))
+        return batch
+
+    def next_due(self, limit, now=None):
+        """Up to `limit` due records, continuing the walk where the last call stopped."""
+        now = self.clock() if now is None else now
+        found = []
+        restarted = False
+        scanned = 0
+        while len(found) < limit and scanned < SCAN_LIMIT:
+            batch = self._read(min(SCAN_BATCH, SCAN_LIMIT - scanned))
+            if not batch:
+                if restarted:  # a whole lap without enough due records
+                    break
+                self.cursor = self._records()
+                restarted = True
+                continue
+            checked = self.checks.lookup(batch)
+            for i, record in enumerate(batch):
+                scanned += 1
+                if self.due(record, checked, now) and record not in found:  # a short lap can meet a record twice
+                    found.append(record)
+                    if len(found) == limit:
+                        self.held = batch[i + 1:] + self.held  # looked at again by the next call
+                        break
+        return found
+
+    def _check(self, records):
+        return [(record, self.check_breach(record[2]), self.clock()) for record in records]
+
+    def _collect(self):
+        if self.pending is None or not self.pending.done():
+            return []
+        future, self.pending = self.pending, None
+        results = future.result()
+        present = self.vault.index.present({record[:2] for record, _, _ in results})
+        results = [result for result in results if result[0][:2] in present]  # skip records deleted meanwhile
+        previous = self.checks.lookup([record for record, _, _ in results])
+        self.checks.record([(*record, checked_at, count) for record, count, checked_at in results])
+        newly_pwned = []
+        for (category, name, _), count, _ in results:
+            was = previous.get((category, name))
+            if count > 0 and (was is None or was[1] <= 0):
+                newly_pwned.append((category, name, count))
+        return newly_pwned
+
+    def known_pwned(self):
+        """[(category, name, count)] found in a breach by earlier checks, including previous runs."""
+        return self.checks.pwned()
+
+    def step(self):
+        """Collects finished checks and starts the next batch. Returns [(category, name, count)] newly pwned."""
+        newly_pwned = self._collect()
+        if self.pending is None:
+            records = self.next_due(self.bucket.available())
+            if records and self.bucket.take(len(records)):
+                self.pending = self.pool.submit(self._check, records)
+        return newly_pwned
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
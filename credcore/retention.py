@@ -0,0 +1,110 @@
+"""Deleted bin with a retention policy: tombstones, expiry and cheap purging."""
+import time
+from collections import deque
+
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60  # seconds a deleted item is kept
+DEFAULT_MAX_COUNT = 1000  # deleted items kept, oldest purged first
+PURGE_INTERVAL = 60  # seconds between background expiry runs
+
+
+# --------------------- Tombstone ---------------------
+class Tombstone:
+    """
+    One deleted item. It keeps a reference to the original (name, secret)
+    record tuple instead of copying it, plus the category it came from and
+    when it was deleted (which is also its change stamp for backups).
+    """
+
+    __slots__ = ("category", "record", "deleted_at")
+
+    def __init__(self, category, record, deleted_at):
+        self.category = category
+        self.record = record
+        self.deleted_at = deleted_at
+
+    @property
+    def name(self):
+        return self.record[0]
+
+    @property
+    def secret(self):
+        return self.record[1]
+
+    @property
+    def key(self):
+        return (self.category, self.record[0], self.record[1])
+
+
+# --------------------- Retention Policy ---------------------
+class RetentionPolicy:
+    """
+    max_age   - seconds after which a deleted item is purged (None: forever)
+    max_count - most deleted items kept (None: unbounded)
+    """
+
+    def __init__(self, max_age=DEFAULT_MAX_AGE, max_count=DEFAULT_MAX_COUNT):
+        self.max_age = max_age
+        self.max_count = max_count
+
+    def over_count(self, count):
+        return self.max_count is not None and count > self.max_count
+
+    def expired(self, tombstone, now):
+        return self.max_age is not None and now - tombstone.deleted_at > self.max_age
+
+
+# --------------------- Deleted Bin ---------------------
+class DeletedBin:
+    """
+    Tombstones in deletion order, oldest first. Because both limits hit the
+    oldest items first, enforcing them only pops from the left end and costs
+    O(purged), never a scan of the whole bin.
+    """
+
+    def __init__(self, policy=None):
+        self.policy = policy or RetentionPolicy()
+        self.items = deque()
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        # a snapshot: exports walk the bin on a worker thread while the UI keeps deleting and restoring
+        return iter(tuple(self.items))
+
+    def newest(self):
+        """Iterates from the most recently deleted item backwards (over a snapshot, like __iter__)."""
+        return reversed(tuple(self.items))
+
+    def add_many(self, category, records, now=None):
+        """Adds tombstones for `records` and returns how many old ones the count limit purged."""
+        now = time.time() if now is None else now
+        self.items.extend(Tombstone(category, record, now) for record in records)
+        return self.purge(now, age=False)
+
+    def remove(self, keys):
+        """Takes out the tombstones whose (category, name, secret) is in `keys`, in one pass."""
+        kept = deque()
+        removed = []
+        for tombstone in self.items:
+            (removed if tombstone.key in keys else kept).append(tombstone)
+        self.items = kept
+        return removed
+
+    def purge(self, now=None, age=True):
+        """Drops items over the count limit and, with `age`, items past max_age. Returns the count."""
+        now = time.time() if now is None else now
+        items = self.items
+        purged = 0
+        while items and (self.policy.over_count(len(items)) or (age and self.policy.expired(items[0], now))):
+            items.popleft()
+            purged += 1
+        return purged
+
+    def clear(self):
+        """
+        Empties the bin in O(1) by swapping in a new deque. The old one is
+        returned so the caller can release it off the UI thread.
+        """
+        old, self.items = self.items, deque()
+        return old
@@ -0,0 +1,61 @@
+"""Reused-password detection over the vault through a digest index."""
+import hashlib
+import os
+
+REUSE_CATEGORIES = ("wifi", "passkeys")  # codes hold values, not passwords
+
+
+# --------------------- Reuse Index ---------------------
+class ReuseIndex:
+    """
+    Maps a keyed digest of each password to the (category, name) entries using it.
+
+    Adding, removing and looking up one entry is O(1); a full rebuild and the
+    reuse report are O(n). Digests are keyed with a per-process random key, so
+    the index never holds plain passwords or unsalted hashes.
+    """
+
+    def __init__(self, data=None):
+        self.key = os.urandom(32)
+        self.entries = {}  # digest -> {(category, name): count}
+        self.digests = {}  # (category, name) -> [digest, ...]
+        if data is not None:
+            self.rebuild(data)
+
+    def digest(self, secret):
+        return hashlib.blake2b(secret.encode("utf-8"), key=self.key, digest_size=16).digest()
+
+    def rebuild(self, data):
+        self.entries = {}
+        self.digests = {}
+        for category in REUSE_CATEGORIES:
+            for name, secret in data.get(category, ()):
+                self.add(category, name, secret)
+
+    def add(self, category, name, secret):
+        if category not in REUSE_CATEGORIES:
+            return
+        digest = self.digest(secret)
+        users = self.entries.setdefault(digest, {})
+        users[(category, name)] = users.get((category, name), 0) + 1
+        self.digests.setdefault((category, name), []).append(digest)
+
+    def discard(self, category, name):
+        """Forgets every entry called `name` in the category (mirrors Vault.delete)."""
+        for digest in self.digests.pop((category, name), ()):
+            users = self.entries.get(digest)
+            if users is None:
+                continue
+            users.pop((category, name), None)
+            if not users:
+                del self.entries[digest]
+
+    def users(self, secret, exclude=None):
+        """Returns the (category, name) entries that already use `secret`, minus `exclude`."""
+        users = self.entries.get(self.digest(secret), {})
+        return [key for key in users if key != exclude]
+
+    def groups(self):
+        """Returns every group of two or more entries sharing one password."""
+        return [sorted(users) for users in self.entries.values()
+                if len(users) > 1 or sum(users.values()) > 1]
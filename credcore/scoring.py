@@ -0,0 +1,79 @@
+"""Multi-core bulk strength scoring for vault-wide audits."""
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .strength import check_password_strength
+
+SCORE_CHUNK_SIZE = 256  # passwords per worker task
+
+
+# --------------------- Worker Side ---------------------
+def _init_worker():
+    """Loads the zxcvbn frequency dictionaries once per worker process."""
+    check_password_strength("warm-up")
+
+
+def score_chunk(chunk):
+    """Worker task: [(index, password)] -> [(index, score, suggestion)]."""
+    return [(index, *check_password_strength(secret)) for index, secret in chunk]
+
+
+def score_secrets(secrets):
+    """Worker task: [password] -> [(score, suggestion)] in the same order."""
+    return [check_password_strength(secret) for secret in secrets]
+
+
+# --------------------- Bulk Scorer ---------------------
+class BulkScorer:
+    """
+    Scores passwords with zxcvbn on a pool of worker processes.
+
+    zxcvbn is CPU-bound pure Python, so spreading chunks across processes
+    scales with the number of cores and keeps the GIL free for the UI.
+    The pool is created on first use and reused until close().
+    """
+
+    def __init__(self, workers=None, chunk_size=SCORE_CHUNK_SIZE):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.pool = None
+
+    def _pool(self):
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        return self.pool
+
+    def submit(self, secrets):
+        """Scores one list of passwords; returns a future of [(score, suggestion)]."""
+        return self._pool().submit(score_secrets, list(secrets))
+
+    def score(self, passwords):
+        """
+        Yields lists of (index, score, suggestion) as chunks finish, in completion order.
+        Indexes refer to positions in `passwords`; at most 2 x workers chunks are queued.
+        """
+        pool = self._pool()
+        max_in_flight = 2 * self.workers
+        pending = set()
+        chunk = []
+        for index, secret in enumerate(passwords):
+            chunk.append((index, secret))
+            if len(chunk) == self.chunk_size:
+                pending.add(pool.submit(score_chunk, chunk))
+                chunk = []
+                while len(pending) >= max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+        if chunk:
+            pending.add(pool.submit(score_chunk, chunk))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
@@ -0,0 +1,181 @@
+"""Near-duplicate password detection with MinHash signatures and LSH buckets."""
+import functools
+import hashlib
+import os
+import struct
+
+from .reuse import REUSE_CATEGORIES
+
+NGRAM = 3
+BANDS = 20
+ROWS = 3  # BANDS x ROWS <= 64 MinHash values per password; candidates from J ~ 0.4 up
+SIMILARITY_THRESHOLD = 0.5  # Jaccard similarity of character n-grams
+UNPACK_VECTOR = struct.Struct("<64H").unpack
+GRAM_CACHE_SIZE = 1 << 16
+MAX_BUCKET = 50  # a band bucket shared by more passwords is reported as one group, not pair by pair
+
+
+# --------------------- Similarity Index ---------------------
+class SimilarityIndex:
+    """
+    Finds passwords that are variations of each other (e.g. Summer2024! / Summer2025!).
+
+    Each password is reduced to hashed character n-grams and a MinHash
+    signature. Signatures are split into LSH bands; only passwords sharing a
+    band bucket become candidate pairs, which are then confirmed with the
+    exact Jaccard similarity of their n-gram sets. A single lookup touches
+    only its buckets. A full report compares each password with at most
+    BANDS x MAX_BUCKET candidates, so it grows linearly with the vault;
+    passwords in larger buckets are listed as groups instead (see groups()).
+    Identical passwords are left to ReuseIndex.
+    """
+
+    def __init__(self, data=None, threshold=SIMILARITY_THRESHOLD):
+        self.key = os.urandom(32)
+        self.threshold = threshold
+        self.ready = True  # False while a store is still building it (see SqliteVault)
+        self.entries = {}  # (category, name) -> [(exact digest, n-gram hashes, band keys)]
+        self.buckets = {}  # band key -> {(category, name)}
+        # n-grams repeat a lot across a vault; cache their hash vectors
+        self._vector = functools.lru_cache(maxsize=GRAM_CACHE_SIZE)(self._vector)
+        if data is not None:
+            self.rebuild(data)
+
+    # ---------------- Hashing ----------------
+    def _hash(self, text):
+        digest = hashlib.blake2b(text.encode("utf-8"), key=self.key, digest_size=8).digest()
+        return int.from_bytes(digest, "big")
+
+    def _vector(self, gram):
+        """64 independent 16-bit hash values of one n-gram (two 64-byte BLAKE2b digests)."""
+        data = gram.encode("utf-8")
+        digest = (hashlib.blake2b(data, key=self.key, person=b"minhash-a").digest()
+                  + hashlib.blake2b(data, key=self.key, person=b"minhash-b").digest())
+        return UNPACK_VECTOR(digest)
+
+    def signature(self, secret):
+        """
+        Returns (exact digest, n-gram ids, LSH band keys) for one password.
+        Safe to call from worker threads; see add_signed.
+        """
+        text = f"\x02{secret.lower()}\x03"  # start / end markers
+        grams = [text[i:i + NGRAM] for i in range(max(len(text) - NGRAM, 0) + 1)]
+        vectors = [self._vector(gram) for gram in grams]
+        # Column-wise minimum = one MinHash value per hash function, computed in C
+        signature = list(map(min, zip(*vectors)))
+        band_keys = [(band, *signature[band * ROWS:(band + 1) * ROWS]) for band in range(BANDS)]
+        gram_ids = frozenset(vector[0] << 48 | vector[1] << 32 | vector[2] << 16 | vector[3]
+                             for vector in vectors)
+        return self._hash("\x00" + secret), gram_ids, band_keys
+
+    # ---------------- Maintenance ----------------
+    def rebuild(self, data):
+        self.entries = {}
+        self.buckets = {}
+        for category in REUSE_CATEGORIES:
+            for name, secret in data.get(category, ()):
+                self.add(category, name, secret)
+
+    def add(self, category, name, secret):
+        if category in REUSE_CATEGORIES:
+            self.add_signed(category, name, self.signature(secret))
+
+    def add_signed(self, category, name, entry):
+        """Inserts a signature computed ahead of time, e.g. by the importer's worker pool."""
+        if category not in REUSE_CATEGORIES:
+            return
+        key = (category, name)
+        self.entries.setdefault(key, []).append(entry)
+        for band_key in entry[2]:
+            self.buckets.setdefault(band_key, set()).add(key)
+
+    def discard(self, category, name):
+        key = (category, name)
+        for _, _, band_keys in self.entries.pop(key, ()):
+            for band_key in band_keys:
+                bucket = self.buckets.get(band_key)
+                if bucket is not None:
+                    bucket.discard(key)
+                    if not bucket:
+                        del self.buckets[band_key]
+
+    # ---------------- Queries ----------------
+    @staticmethod
+    def jaccard(a, b):
+        return len(a & b) / len(a | b)
+
+    def _best_match(self, entry, candidate, entries=None):
+        """Highest similarity between `entry` and any stored entry of `candidate`, skipping exact reuse."""
+        exact, grams, _ = entry
+        best = 0.0
+        for other_exact, other_grams, _ in (self.entries if entries is None else entries).get(candidate, ()):
+            if other_exact != exact:
+                best = max(best, self.jaccard(grams, other_grams))
+        return best
+
+    def similar(self, secret, exclude=None):
+        """Returns [((category, name), similarity)] for stored passwords close to `secret`."""
+        entry = self.signature(secret)
+        candidates = set()
+        for band_key in entry[2]:
+            candidates.update(self.buckets.get(band_key, ()))
+        candidates.discard(exclude)
+        matches = []
+        for candidate in candidates:
+            score = self._best_match(entry, candidate)
+            if score >= self.threshold:
+                matches.append((candidate, score))
+        return sorted(matches, key=lambda match: -match[1])
+
+    def _snapshot(self):
+        """
+        Copies of the buckets and entries. Each copy is one C-level step, so a
+        report can run on a worker thread while the index keeps changing.
+        """
+        return [tuple(bucket) for bucket in list(self.buckets.values())], dict(self.entries)
+
+    def pairs(self):
+        """
+        Returns [(key_a, key_b, similarity)] for every confirmed near-duplicate
+        pair. Candidates are collected per password first, so each pair is
+        verified once however many buckets it shares; buckets over MAX_BUCKET
+        are skipped and left to groups().
+        """
+        buckets, entries = self._snapshot()
+        candidates = {}
+        for bucket in buckets:
+            if 2 <= len(bucket) <= MAX_BUCKET:
+                for a in bucket:
+                    candidates.setdefault(a, set()).update(b for b in bucket if b > a)
+        found = []
+        for a, others in candidates.items():
+            for b in others:
+                score = max((self._best_match(entry, b, entries) for entry in entries.get(a, ())), default=0.0)
+                if score >= self.threshold:
+                    found.append((a, b, score))
+        return sorted(found, key=lambda pair: -pair[2])
+
+    def groups(self):
+        """
+        Returns the passwords of buckets over MAX_BUCKET, overlapping buckets
+        merged, largest group first. So many variations of one password are
+        better listed together than pair by pair.
+        """
+        buckets, _ = self._snapshot()
+        parent = {}
+
+        def root(key):
+            while parent[key] != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+
+        for bucket in buckets:
+            if len(bucket) > MAX_BUCKET:
+                first = root(parent.setdefault(bucket[0], bucket[0]))
+                for key in bucket[1:]:
+                    parent[root(parent.setdefault(key, key))] = first
+        groups = {}
+        for key in parent:
+            groups.setdefault(root(key), []).append(key)
+        return sorted((sorted(group) for group in groups.values()), key=len, reverse=True)
@@ -0,0 +1,569 @@
+"""
+SQLite-backed vault store for vaults too large to keep in memory.
+
+SqliteVault has the same interface as Vault, so the GUI and tools switch
+between them without changes (see open_vault). Entries live in one table
+indexed by (category, name); an FTS5 trigram table answers the substring
+searches of the sub-screens, and every query is paged with LIMIT/OFFSET,
+so memory use stays flat however large the vault grows.
+
+The store is not encrypted: secrets are kept in plain text, protected only
+by the file permissions (the database and its -wal / -shm files are created
+readable by this user alone). Reuse lookups go through a keyed digest
+column, so no index holds a second copy of the secrets.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from . import exporter
+from .importer import CredentialImporter
+from .retention import RetentionPolicy, Tombstone
+from .reuse import REUSE_CATEGORIES
+from .similarity import SimilarityIndex
+from .vault import CATEGORIES
+
+LOOKUP_BATCH = 500  # names per IN (...) query, well under SQLite's parameter limit
+FTS_MIN_QUERY = 3  # trigram index: shorter queries fall back to LIKE
+SIMILARITY_MAX_ENTRIES = 50000  # above this the in-memory MinHash index is not built
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    category TEXT NOT NULL,
+    name TEXT NOT NULL,
+    secret TEXT NOT NULL,
+    changed REAL NOT NULL,
+    digest BLOB                -- keyed BLAKE2b of the secret (see SqliteVault.digest), for reuse lookups
+);
+CREATE INDEX IF NOT EXISTS entries_category ON entries (category);  -- rowid order within a category
+CREATE INDEX IF NOT EXISTS entries_category_name ON entries (category, name);
+CREATE INDEX IF NOT EXISTS entries_digest ON entries (digest);
+CREATE INDEX IF NOT EXISTS entries_changed ON entries (changed);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5 (
+    name, content='entries', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS entries_fts_insert AFTER INSERT ON entries BEGIN
+    INSERT INTO entries_fts (rowid, name) VALUES (new.id, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_fts_delete AFTER DELETE ON entries BEGIN
+    INSERT INTO entries_fts (entries_fts, rowid, name) VALUES ('delete', old.id, old.name);
+END;
+
+CREATE TABLE IF NOT EXISTS deleted (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,  -- never reuses ids at or below the purge floor
+    category TEXT NOT NULL,
+    name TEXT NOT NULL,
+    secret TEXT NOT NULL,
+    deleted_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS deleted_key ON deleted (category, name);
+
+CREATE TABLE IF NOT EXISTS breach_checks (  -- see reaudit.CheckLog
+    category TEXT NOT NULL,
+    name TEXT NOT NULL,
+    digest BLOB NOT NULL,      -- of the secret that was checked
+    checked_at REAL NOT NULL,
+    pwned INTEGER NOT NULL,    -- breach count, negative when the check failed
+    PRIMARY KEY (category, name)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value);
+"""
+
+
+def connect(path):
+    old_umask = os.umask(0o077)  # a database or -wal / -shm file created here is private to this user
+    try:
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA journal_mode=WAL")  # readers (exports, backups) never block the UI's writes
+    finally:
+        os.umask(old_umask)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA secure_delete=ON")  # deleted secrets are overwritten, not left in free pages
+    return conn
+
+
+def drop_secret_indexes(conn):
+    """
+    Older stores indexed the secrets themselves, a second plain-text copy in
+    every index B-tree. Drops those indexes and adds the digest column that
+    replaces them (filled in by SqliteVault). Runs before SCHEMA.
+    """
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(entries)")]
+    with conn:
+        if columns and "digest" not in columns:
+            conn.execute("ALTER TABLE entries ADD COLUMN digest BLOB")
+        conn.execute("DROP INDEX IF EXISTS entries_secret")
+        row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'index' AND name = 'deleted_key'").fetchone()
+        if row is not None and "secret" in row[0]:
+            conn.execute("DROP INDEX deleted_key")
+
+
+def upgrade_deleted_table(conn):
+    """
+    Rebuilds a bin table created without AUTOINCREMENT. Its ids restart at 1
+    once emptied, below the purge floor, which hid every later deletion.
+    """
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'deleted'").fetchone()
+    if row is None or "AUTOINCREMENT" in row[0].upper():
+        return
+    floor = conn.execute("SELECT value FROM meta WHERE key = 'deleted_floor'").fetchone()
+    with conn:
+        conn.execute("DROP INDEX IF EXISTS deleted_key")
+        conn.execute("ALTER TABLE deleted RENAME TO deleted_old")
+        conn.execute("""CREATE TABLE deleted (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT, category TEXT NOT NULL, name TEXT NOT NULL,
+                            secret TEXT NOT NULL, deleted_at REAL NOT NULL)""")
+        conn.execute("INSERT INTO deleted SELECT * FROM deleted_old ORDER BY id")
+        conn.execute("DROP TABLE deleted_old")
+        conn.execute("CREATE INDEX deleted_key ON deleted (category, name)")
+        if floor is not None:  # new ids must land above the floor even if the bin is empty now
+            conn.execute("DELETE FROM sqlite_sequence WHERE name = 'deleted'")
+            conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('deleted', MAX(?, "
+                         "(SELECT COALESCE(MAX(id), 0) FROM deleted)))", (floor[0],))
+
+
+def apply_similar(index, changes):
+    for change in changes:
+        if change[0] == "add":
+            index.add(*change[1:])
+        else:
+            index.discard(*change[1:])
+
+
+def like_pattern(query):
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def page_args(offset, limit):
+    return (-1 if limit is None else limit), offset
+
+
+# --------------------- Collection Views ---------------------
+class CategoryView:
+    """vault.data[category]: iterates (name, secret) rows through a cursor, len() is a COUNT."""
+
+    def __init__(self, vault, category):
+        self.vault = vault
+        self.category = category
+
+    def __iter__(self):
+        return self.vault.search(self.category)
+
+    def __len__(self):
+        return self.vault.conn.execute(
+            "SELECT COUNT(*) FROM entries WHERE category = ?", (self.category,)).fetchone()[0]
+
+
+class SqliteData:
+    """Read-only mapping from category to CategoryView, standing in for Vault.data."""
+
+    def __init__(self, vault):
+        self.views = {category: CategoryView(vault, category) for category in CATEGORIES}
+
+    def __getitem__(self, category):
+        return self.views[category]
+
+    def __contains__(self, category):
+        return category in self.views
+
+    def __iter__(self):
+        return iter(self.views)
+
+    def get(self, category, default=None):
+        return self.views.get(category, default)
+
+    def keys(self):
+        return self.views.keys()
+
+    def items(self):
+        return self.views.items()
+
+
+class SqliteDeleted:
+    """The deleted bin as Tombstones, standing in for DeletedBin."""
+
+    def __init__(self, vault):
+        self.vault = vault
+
+    def _tombstones(self, order):
+        rows = self.vault.conn.execute(
+            f"SELECT category, name, secret, deleted_at FROM deleted WHERE id > ? ORDER BY id {order}",
+            (self.vault.floor,))
+        for category, name, secret, deleted_at in rows:
+            yield Tombstone(category, (name, secret), deleted_at)
+
+    def __iter__(self):
+        return self._tombstones("ASC")
+
+    def newest(self):
+        return self._tombstones("DESC")
+
+    def __len__(self):
+        return self.vault.conn.execute("SELECT COUNT(*) FROM deleted WHERE id > ?", (self.vault.floor,)).fetchone()[0]
+
+
+class SqliteIndex:
+    """Membership checks against the (category, name) index, standing in for VaultIndex."""
+
+    def __init__(self, vault):
+        self.vault = vault
+
+    def __contains__(self, key):
+        return self.vault.conn.execute(
+            "SELECT 1 FROM entries WHERE category = ? AND name = ? LIMIT 1", key).fetchone() is not None
+
+    def present(self, keys):
+        """The subset of `keys` already in the vault, LOOKUP_BATCH names per query."""
+        by_category = {}
+        for category, name in set(keys):
+            by_category.setdefault(category, []).append(name)
+        found = set()
+        for category, names in by_category.items():
+            for i in range(0, len(names), LOOKUP_BATCH):
+                batch = names[i:i + LOOKUP_BATCH]
+                rows = self.vault.conn.execute(
+                    f"SELECT DISTINCT name FROM entries WHERE category = ? AND name IN ({', '.join('?' * len(batch))})",
+                    (category, *batch))
+                found.update((category, name) for (name,) in rows)
+        return found
+
+    def __len__(self):
+        return self.vault.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+class SqliteReuse:
+    """Reused-password lookups answered by the digest index, standing in for ReuseIndex."""
+
+    IN_REUSE = f"category IN ({', '.join('?' * len(REUSE_CATEGORIES))})"
+
+    def __init__(self, vault):
+        self.vault = vault
+
+    def users(self, secret, exclude=None):
+        rows = self.vault.conn.execute(
+            f"SELECT DISTINCT category, name FROM entries WHERE digest = ? AND {self.IN_REUSE}",
+            (self.vault.digest(secret), *REUSE_CATEGORIES))
+        return [key for key in rows if key != exclude]
+
+    def groups(self):
+        rows = self.vault.conn.execute(
+            f"""SELECT digest, category, name FROM entries WHERE {self.IN_REUSE} AND digest IN (
+                    SELECT digest FROM entries WHERE {self.IN_REUSE} GROUP BY digest HAVING COUNT(*) > 1)
+                ORDER BY digest""",
+            (*REUSE_CATEGORIES, *REUSE_CATEGORIES))
+        groups = {}
+        for digest, category, name in rows:
+            groups.setdefault(digest, set()).add((category, name))
+        return [sorted(users) for users in groups.values()]
+
+
+class SqliteCheckLog:
+    """The breach re-audit schedule kept in the breach_checks table, standing in for CheckLog."""
+
+    def __init__(self, vault):
+        self.vault = vault
+
+    def lookup(self, records):
+        by_category = {}
+        for category, name, secret in records:
+            by_category.setdefault(category, {}).setdefault(name, set()).add(self.vault.digest(secret))
+        found = {}
+        for category, names in by_category.items():
+            names = list(names.items())
+            for i in range(0, len(names), LOOKUP_BATCH):
+                batch = dict(names[i:i + LOOKUP_BATCH])
+                rows = self.vault.conn.execute(
+                    f"""SELECT name, digest, checked_at, pwned FROM breach_checks
+                        WHERE category = ? AND name IN ({', '.join('?' * len(batch))})""",
+                    (category, *batch))
+                for name, digest, checked_at, pwned in rows:
+                    if digest in batch[name]:
+                        found[(category, name)] = (checked_at, pwned)
+        return found
+
+    def record(self, results):
+        with self.vault.conn:
+            self.vault.conn.executemany(
+                "INSERT OR REPLACE INTO breach_checks VALUES (?, ?, ?, ?, ?)",
+                [(category, name, self.vault.digest(secret), checked_at, pwned)
+                 for category, name, secret, checked_at, pwned in results])
+
+    def discard(self, category, names):
+        with self.vault.conn:
+            self.vault.conn.executemany("DELETE FROM breach_checks WHERE category = ? AND name = ?",
+                                        [(category, name) for name in names])
+
+    def pwned(self):
+        return self.vault.conn.execute("SELECT category, name, pwned FROM breach_checks WHERE pwned > 0").fetchall()
+
+    def __len__(self):
+        return self.vault.conn.execute("SELECT COUNT(*) FROM breach_checks").fetchone()[0]
+
+
+class DeferredPurge:
+    """What purge_all_deleted hands back: clear() deletes the hidden rows on its own connection."""
+
+    def __init__(self, path, floor):
+        self.path = path
+        self.floor = floor
+
+    def clear(self):
+        conn = connect(self.path)
+        try:
+            with conn:
+                conn.execute("DELETE FROM deleted WHERE id <= ?", (self.floor,))
+        finally:
+            conn.close()
+
+
+# --------------------- SQLite Vault Store ---------------------
+class SqliteVault:
+    """
+    Vault kept in an SQLite database in WAL mode.
+
+    data, deleted, index, reuse and breach_checks are views answered by SQL, so nothing is
+    loaded up front. Near-duplicate detection still needs the in-memory
+    SimilarityIndex; a thread builds it from the database at open, and until
+    it is done `similar` is an empty index with ready=False (no hints). It
+    stays empty for vaults over SIMILARITY_MAX_ENTRIES.
+    Emptying the bin raises a floor id (rows at or below it are hidden at
+    once) and the rows themselves are deleted later, off the UI thread.
+    """
+
+    def __init__(self, path, retention=None):
+        if path in ("", ":memory:"):
+            # exports, backups and bin purges read on connections of their own, which would each
+            # see a different, empty database
+            raise ValueError("SqliteVault needs a database file; use Vault for an in-memory store")
+        self.path = path
+        self.conn = connect(path)
+        drop_secret_indexes(self.conn)
+        self.conn.executescript(SCHEMA)
+        upgrade_deleted_table(self.conn)
+        self.digest_key = self._digest_key()
+        self.conn.create_function("secret_digest", 1, self.digest, deterministic=True)
+        with self.conn:  # rows written before the digest column existed
+            self.conn.execute("UPDATE entries SET digest = secret_digest(secret) WHERE digest IS NULL")
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'deleted_floor'").fetchone()
+        self.floor = row[0] if row else 0
+        self.policy = retention or RetentionPolicy()
+        self.data = SqliteData(self)
+        self.deleted = SqliteDeleted(self)
+        self.index = SqliteIndex(self)
+        self.reuse = SqliteReuse(self)
+        self.breach_checks = SqliteCheckLog(self)
+        self.similar = SimilarityIndex()  # no hints until the build below replaces it
+        self.similar.ready = False
+        self.similarity_enabled = True
+        self.write_lock = threading.Lock()  # held from a change's stamp to its commit and similarity update
+        self.similar_backlog = []  # changes made while the index is built; None once it is
+        self.closed = False
+        threading.Thread(target=self._build_similar, daemon=True, name="similarity-build").start()
+
+    def _digest_key(self):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'digest_key'").fetchone()
+        if row is not None:
+            return row[0]
+        key = os.urandom(32)
+        with self.conn:
+            self.conn.execute("INSERT INTO meta (key, value) VALUES ('digest_key', ?)", (key,))
+        return key
+
+    def digest(self, secret):
+        """Keyed digest of a secret; the entries_digest index finds reuse without indexing the secrets."""
+        return hashlib.blake2b(secret.encode("utf-8"), key=self.digest_key, digest_size=16).digest()
+
+    # ---------------- Similarity Index ----------------
+    def _build_similar(self):
+        """Builds the SimilarityIndex on its own connection, then replays what changed meanwhile."""
+        index = SimilarityIndex()
+        conn = connect(self.path)
+        try:
+            with self.write_lock:  # the read snapshot starts here, so later commits go to the backlog
+                conn.execute("BEGIN")
+                size = conn.execute(f"SELECT COUNT(*) FROM entries WHERE {SqliteReuse.IN_REUSE}",
+                                    REUSE_CATEGORIES).fetchone()[0]
+                self.similar_backlog = []
+            if size <= SIMILARITY_MAX_ENTRIES:
+                rows = conn.execute(f"SELECT category, name, secret FROM entries WHERE {SqliteReuse.IN_REUSE} "
+                                    "ORDER BY id", REUSE_CATEGORIES)
+                for category, name, secret in rows:
+                    if self.closed:
+                        return
+                    index.add(category, name, secret)
+        finally:
+            conn.close()
+        with self.write_lock:
+            self.similarity_enabled = size <= SIMILARITY_MAX_ENTRIES
+            if self.similarity_enabled:
+                apply_similar(index, self.similar_backlog)
+            self.similar = index
+            self.similar_backlog = None
+
+    def _index_similar(self, changes):
+        """
+        Applies ("add", category, name, secret) / ("discard", category, name)
+        changes to the similarity index, or queues them while it is being
+        built. Called under write_lock, together with the commit they mirror.
+        """
+        if self.similar_backlog is not None:
+            self.similar_backlog.extend(changes)
+        elif self.similarity_enabled:
+            apply_similar(self.similar, changes)
+
+    def similarity_index(self):
+        """The similarity index if it is built and maintained, else None."""
+        return self.similar if self.similarity_enabled and self.similar_backlog is None else None
+
+    # ---------------- Mutations ----------------
+    def add(self, category, name, secret):
+        self.add_many(category, [(name, secret)])
+
+    def add_many(self, category, entries, index_similar=True):
+        with self.write_lock:
+            now = time.time()
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT INTO entries (category, name, secret, changed, digest) VALUES (?, ?, ?, ?, ?)",
+                    [(category, name, secret, now, self.digest(secret)) for name, secret in entries])
+            if index_similar:
+                self._index_similar([("add", category, name, secret) for name, secret in entries])
+
+    def delete(self, category, name, secret):
+        self.delete_many(category, [(name, secret)])
+
+    def delete_many(self, category, entries):
+        """Moves every entry whose name appears in `entries` into the bin, in one transaction."""
+        keys = [(category, name) for name in {name for name, _ in entries}]
+        if not keys:
+            return
+        with self.write_lock:
+            now = time.time()
+            with self.conn:
+                self.conn.executemany(
+                    """INSERT INTO deleted (category, name, secret, deleted_at)
+                       SELECT category, name, secret, ? FROM entries WHERE category = ? AND name = ? ORDER BY id""",
+                    [(now, *key) for key in keys])
+                self.conn.executemany("DELETE FROM entries WHERE category = ? AND name = ?", keys)
+                self.conn.executemany("DELETE FROM breach_checks WHERE category = ? AND name = ?", keys)
+                self._purge(now, age=False)
+            self._index_similar([("discard", *key) for key in keys])
+
+    def restore(self, category, name, secret):
+        self.restore_many([(category, name, secret)])
+
+    def restore_many(self, items):
+        """Restores (category, name, secret) items from the bin, in one transaction."""
+        keys = [(self.floor, *key) for key in set(items)]
+        with self.write_lock:
+            now = time.time()
+            with self.conn:
+                self.conn.executemany(
+                    """INSERT INTO entries (category, name, secret, changed, digest)
+                       SELECT category, name, secret, ?, secret_digest(secret) FROM deleted
+                       WHERE id > ? AND category = ? AND name = ? AND secret = ? ORDER BY id""",
+                    [(now, *key) for key in keys])
+                self.conn.executemany(
+                    "DELETE FROM deleted WHERE id > ? AND category = ? AND name = ? AND secret = ?", keys)
+            self._index_similar([("add", *key[1:]) for key in keys])
+
+    def _purge(self, now, age=True):
+        purged = 0
+        if age and self.policy.max_age is not None:
+            purged += self.conn.execute("DELETE FROM deleted WHERE id > ? AND deleted_at < ?",
+                                        (self.floor, now - self.policy.max_age)).rowcount
+        if self.policy.max_count is not None:
+            excess = len(self.deleted) - self.policy.max_count
+            if excess > 0:
+                purged += self.conn.execute(
+                    "DELETE FROM deleted WHERE id IN (SELECT id FROM deleted WHERE id > ? ORDER BY id LIMIT ?)",
+                    (self.floor, excess)).rowcount
+        return purged
+
+    def purge_deleted(self):
+        with self.conn:
+            return self._purge(time.time())
+
+    def purge_all_deleted(self):
+        """Hides the whole bin by raising the floor id; the returned object's clear() deletes the rows."""
+        with self.conn:
+            self.floor = self.conn.execute("SELECT COALESCE(MAX(id), ?) FROM deleted", (self.floor,)).fetchone()[0]
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('deleted_floor', ?)", (self.floor,))
+        return DeferredPurge(self.path, self.floor)
+
+    # ---------------- Queries ----------------
+    def __contains__(self, key):
+        return key in self.index
+
+    def search(self, category, query="", offset=0, limit=None):
+        """Yields (name, secret) rows of a category whose name contains `query`, one page at a time."""
+        if not query:
+            rows = self.conn.execute(
+                "SELECT name, secret FROM entries WHERE category = ? ORDER BY id LIMIT ? OFFSET ?",
+                (category, *page_args(offset, limit)))
+        elif len(query) >= FTS_MIN_QUERY:
+            phrase = '"' + query.replace('"', '""') + '"'
+            rows = self.conn.execute(
+                """SELECT e.name, e.secret FROM entries_fts JOIN entries e ON e.id = entries_fts.rowid
+                   WHERE entries_fts MATCH ? AND e.category = ? ORDER BY entries_fts.rowid LIMIT ? OFFSET ?""",
+                (phrase, category, *page_args(offset, limit)))
+        else:
+            rows = self.conn.execute(
+                """SELECT name, secret FROM entries WHERE category = ? AND name LIKE ? ESCAPE '\\'
+                   ORDER BY id LIMIT ? OFFSET ?""",
+                (category, like_pattern(query), *page_args(offset, limit)))
+        return iter(rows)
+
+    def search_deleted(self, query="", offset=0, limit=None):
+        """Yields ("user", username, password, category) and ("code", name, value) bin items, newest first."""
+        rows = self.conn.execute(
+            """SELECT category, name, secret FROM deleted WHERE id > ? AND name LIKE ? ESCAPE '\\'
+               ORDER BY id DESC LIMIT ? OFFSET ?""",
+            (self.floor, like_pattern(query), *page_args(offset, limit)))
+        for category, name, secret in rows:
+            if category == "codes":
+                yield ("code", name, secret)
+            else:
+                yield ("user", name, secret, category)
+
+    # ---------------- Import / Export ----------------
+    def _records(self, since=None):
+        """Record dicts for export, read on a separate connection (a WAL snapshot) so it can run in a thread."""
+        since = -1 if since is None else since
+        conn = connect(self.path)
+        try:
+            # Both queries read the snapshot the first one starts. Writers stamp and commit under
+            # write_lock, so every change stamped before this point is in it (see backup_records).
+            with self.write_lock:
+                conn.execute("BEGIN")
+                rows = conn.execute(
+                    "SELECT category, name, secret, changed FROM entries WHERE changed > ? ORDER BY id", (since,))
+            for category, name, secret, changed in rows:
+                yield {"section": "data", "category": category, "name": name, "secret": secret, "changed": changed}
+            rows = conn.execute(
+                "SELECT category, name, secret, deleted_at FROM deleted WHERE id > ? AND deleted_at > ? ORDER BY id",
+                (self.floor, since))
+            for category, name, secret, deleted_at in rows:
+                yield {"section": "deleted", "category": category, "name": name, "secret": secret,
+                       "changed": deleted_at}
+        finally:
+            conn.close()
+
+    def importer(self, category, chunks, **kwargs):
+        return CredentialImporter(self, category, chunks, **kwargs)
+
+    def export(self, path, fmt=None, compress=None, since=None):
+        return exporter.export_records(path, self._records(since), fmt, compress)
+
+    def backup(self, directory, full=False):
+        return exporter.backup_records(directory, self._records, full)
+
+    def close(self):
+        self.closed = True  # stops a similarity build still under way
+        self.conn.close()
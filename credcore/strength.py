@@ -0,0 +1,26 @@
+"""Password strength scoring with zxcvbn."""
+from .tracing import traced
+
+SUGGESTIONS = [
+    "Very Weak (Only 1 or 2 distinct characters or short length)",
+    "Weak (Short, simple, or common patterns)",
+    "Fair (Better mix, but could be longer or more complex)",
+    "Good (Long, varied characters, not easily guessed)",
+    "Strong (Excellent combination of length and complexity)",
+]
+STRENGTH_COLORS = ["red", "orange", "pink", "green", "dark green"]
+
+
+# --------------------- Password Strength Checker Function ---------------------
+@traced("check_password_strength")
+def check_password_strength(password):
+    """
+    Evaluates password strength using zxcvbn.
+    Returns a score (0-4) and a suggestion string.
+    """
+    if not password:
+        return 0, "Password is empty."
+    from zxcvbn import zxcvbn  # the frequency lists are large; load them on first use
+
+    score = zxcvbn(password)['score']
+    return score, SUGGESTIONS[min(score, 4)]
@@ -0,0 +1,102 @@
+"""
+Lightweight hot-path tracing: durations in per-name ring buffers with
+percentile summaries and an export to Chrome's trace event format.
+
+Tracing is off unless CREDLOCK_TRACE=1 is set or enable() is called. While
+off, a traced function costs one attribute check on top of its own call.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+RING_SIZE = 512  # most recent durations kept per traced name
+PERCENTILES = (50, 95, 99)
+
+
+# --------------------- Tracer ---------------------
+class Tracer:
+    def __init__(self, enabled=False, ring_size=RING_SIZE):
+        self.enabled = enabled
+        self.ring_size = ring_size
+        self.rings = {}  # name -> deque of (start, duration, thread id), seconds
+        self.origin = time.perf_counter()
+
+    def record(self, name, start, duration):
+        ring = self.rings.get(name)
+        if ring is None:
+            ring = self.rings.setdefault(name, deque(maxlen=self.ring_size))
+        ring.append((start, duration, threading.get_ident()))  # deque.append is thread-safe
+
+    def clear(self):
+        self.rings = {}
+
+    def summary(self):
+        """{name: {"count", "p50", "p95", "p99", "max"}} in milliseconds, over each ring."""
+        stats = {}
+        for name, ring in list(self.rings.items()):
+            durations = sorted(duration for _, duration, _ in list(ring))
+            if not durations:
+                continue
+            row = {"count": len(durations), "max": durations[-1] * 1000}
+            for p in PERCENTILES:
+                index = min(len(durations) - 1, round(p / 100 * (len(durations) - 1)))
+                row[f"p{p}"] = durations[index] * 1000
+            stats[name] = row
+        return stats
+
+    def export(self, path):
+        """Writes the buffered spans as a Chrome trace file (chrome://tracing, Perfetto). Returns the span count."""
+        pid = os.getpid()
+        events = []
+        for name, ring in list(self.rings.items()):
+            for start, duration, tid in list(ring):
+                events.append({"name": name, "ph": "X", "pid": pid, "tid": tid,
+                               "ts": (start - self.origin) * 1e6, "dur": duration * 1e6})
+        events.sort(key=lambda event: event["ts"])
+        with open(path + ".part", "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        os.replace(path + ".part", path)
+        return len(events)
+
+
+tracer = Tracer(enabled=os.environ.get("CREDLOCK_TRACE") == "1")
+
+
+def enable(on=True):
+    tracer.enabled = on
+
+
+def traced(name):
+    """Decorator recording each call's duration under `name` while tracing is enabled."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                tracer.record(name, start, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+class span:
+    """Context manager form of traced(), for phases that are not a single function."""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter() if tracer.enabled else None
+        return self
+
+    def __exit__(self, *exc):
+        if self.start is not None:
+            tracer.record(self.name, self.start, time.perf_counter() - self.start)
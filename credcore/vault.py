@@ -0,0 +1,158 @@
+"""In-memory vault store shared by the GUI and the headless tools."""
+import itertools
+
+from . import exporter
+from .importer import CredentialImporter
+from .index import VaultIndex
+from .reaudit import CheckLog
+from .retention import DeletedBin
+from .reuse import ReuseIndex
+from .similarity import SimilarityIndex
+
+CATEGORIES = ("wifi", "passkeys", "codes")
+
+
+# --------------------- Vault Store ---------------------
+class Vault:
+    """
+    Holds the credentials (`data`) and the deleted bin (`deleted`).
+
+    data    -> {"wifi": [(username, password)], "passkeys": [...], "codes": [(name, value)]}
+    deleted -> DeletedBin of tombstones, bounded by a RetentionPolicy
+    breach_checks -> CheckLog of the background breach re-audit
+    """
+
+    def __init__(self, retention=None):
+        self.data = {category: [] for category in CATEGORIES}
+        self.deleted = DeletedBin(retention)
+        self.index = VaultIndex(self.data)
+        self.reuse = ReuseIndex(self.data)
+        self.similar = SimilarityIndex(self.data)
+        self.breach_checks = CheckLog()
+
+    # ---------------- Mutations ----------------
+    def add(self, category, name, secret):
+        self.data[category].append((name, secret))
+        self.index.add(category, name)
+        self.reuse.add(category, name, secret)
+        self.similar.add(category, name, secret)
+
+    def add_many(self, category, entries, index_similar=True):
+        """
+        Appends a batch of (name, secret) entries in one pass. With
+        index_similar=False the caller adds the similarity signatures itself
+        (see CredentialImporter), as they are the costly part.
+        """
+        self.data[category].extend(entries)
+        for name, secret in entries:
+            self.index.add(category, name)
+            self.reuse.add(category, name, secret)
+            if index_similar:
+                self.similar.add(category, name, secret)
+
+    def similarity_index(self):
+        """The SimilarityIndex that add_many maintains (None when there is none to maintain)."""
+        return self.similar
+
+    def delete(self, category, name, secret):
+        """Moves every entry called `name` out of the category into the deleted bin."""
+        self.delete_many(category, [(name, secret)])
+
+    def delete_many(self, category, entries):
+        """
+        Moves every entry whose name appears in `entries` ((name, secret) pairs)
+        into the deleted bin, with a single pass over the category.
+        """
+        names = {name for name, _ in entries}
+        if not names:
+            return
+        kept, removed = [], []
+        for record in self.data[category]:
+            (removed if record[0] in names else kept).append(record)
+        self.data[category] = kept
+        self.deleted.add_many(category, removed)
+        for name in names:
+            self.index.discard(category, name)
+            self.reuse.discard(category, name)
+            self.similar.discard(category, name)
+        self.breach_checks.discard(category, names)
+
+    def restore(self, category, name, secret):
+        self.restore_many([(category, name, secret)])
+
+    def restore_many(self, items):
+        """Restores (category, name, secret) items with a single pass over the bin."""
+        restored = self.deleted.remove(set(items))
+        by_category = {}
+        for tombstone in restored:
+            by_category.setdefault(tombstone.category, []).append(tombstone.record)
+        for category, entries in by_category.items():
+            self.add_many(category, entries)
+
+    def purge_deleted(self):
+        """Applies the retention policy to the bin; returns how many items were purged."""
+        return self.deleted.purge()
+
+    def purge_all_deleted(self):
+        """Empties the bin at once and returns the old tombstones for the caller to release."""
+        return self.deleted.clear()
+
+    # ---------------- Queries ----------------
+    def __contains__(self, key):
+        return key in self.index
+
+    def search(self, category, query="", offset=0, limit=None):
+        """
+        Yields the entries of a category whose name contains `query` (case-insensitive),
+        optionally only the page starting at match number `offset`.
+        """
+        query = query.lower()
+        matches = (item for item in self.data[category] if query in item[0].lower())
+        return itertools.islice(matches, offset, None if limit is None else offset + limit)
+
+    def search_deleted(self, query="", offset=0, limit=None):
+        """Bin items matching `query`, newest first (see _search_deleted), optionally one page."""
+        return itertools.islice(self._search_deleted(query), offset, None if limit is None else offset + limit)
+
+    def _search_deleted(self, query):
+        """Yields ("user", username, password, category) and ("code", name, value) bin items, newest first."""
+        query = query.lower()
+        for tombstone in self.deleted.newest():
+            name, secret = tombstone.record
+            if query in name.lower():
+                if tombstone.category == "codes":
+                    yield ("code", name, secret)
+                else:
+                    yield ("user", name, secret, tombstone.category)
+
+    # ---------------- Import / Export ----------------
+    def importer(self, category, chunks, **kwargs):
+        return CredentialImporter(self, category, chunks, **kwargs)
+
+    def _snapshot(self):
+        """
+        Shallow copies of what export and backup read. Each copy is one C-level
+        step, so the export can run on a worker thread while the vault changes.
+        """
+        data = {category: tuple(items) for category, items in self.data.items()}
+        return data, tuple(self.deleted), dict(self.index.changed)
+
+    def export(self, path, **kwargs):
+        return exporter.export_vault(path, *self._snapshot(), **kwargs)
+
+    def backup(self, directory, full=False):
+        # the snapshot is taken inside backup_records, after its start time (see there)
+        return exporter.backup_records(
+            directory, lambda since: exporter.iter_records(*self._snapshot(), since=since), full)
+
+    def close(self):
+        """Nothing to release for the in-memory store; see SqliteVault.close."""
+
+
+def open_vault(path=None, retention=None):
+    """The in-memory Vault, or the SQLite-backed store when a database path is given."""
+    if path:
+        from .sqlite_store import SqliteVault  # only loaded when the backend is chosen
+
+        return SqliteVault(path, retention)
+    return Vault(retention)
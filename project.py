@@ -4,65 +4,13 @@ import customtkinter as ctk
 from tkinter import messagebox
 from PIL import Image, ImageDraw
 from customtkinter import CTkImage
-import requests
-import hashlib
-from zxcvbn import zxcvbn
-import random
-import string
+from credcore import Vault, check_hibp, check_password_strength, generate_password
 
 # --------------------- Helper ---------------------
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 def resource_path(*paths):
     return os.path.join(BASE_DIR, *paths)
 
-# --------------------- HIBP Checker ---------------------
-def check_hibp(password):
-    sha1pass = hashlib.sha1(password.encode('utf-8')).hexdigest().upper()
-    prefix = sha1pass[:5]
-    suffix = sha1pass[5:]
-    url = f'https://api.pwnedpasswords.com/range/{prefix}'
-    try:
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            hashes = (line.split(':') for line in response.text.splitlines())
-            for h, count in hashes:
-                if h == suffix:
-                    return int(count)
-            return 0
-        else:
-            return -1
-    except requests.exceptions.RequestException:
-        return -2
-
-# --------------------- Password Strength ---------------------
-def check_password_strength(password):
-    if not password:
-        return 0, "Password is empty."
-    results = zxcvbn(password)
-    score = results['score']
-    suggestions = [
-        "Very Weak (Only 1 or 2 distinct characters or short length)",
-        "Weak (Short, simple, or common patterns)",
-        "Fair (Better mix, but could be longer or more complex)",
-        "Good (Long, varied characters, not easily guessed)",
-        "Strong (Excellent combination of length and complexity)"
-    ]
-    suggestion = suggestions[min(score, 4)]
-    return score, suggestion
-
-# --------------------- Password Generator ---------------------
-def generate_password(length=16):
-    chars = string.ascii_letters + string.digits + string.punctuation
-    password = [
-        random.choice(string.ascii_lowercase),
-        random.choice(string.ascii_uppercase),
-        random.choice(string.digits),
-        random.choice(string.punctuation)
-    ]
-    password += [random.choice(chars) for _ in range(length - len(password))]
-    random.shuffle(password)
-    return "".join(password)
-
 # --------------------- Splash Video ---------------------
 def play_video(video_path=None):
     if video_path is None:
@@ -108,8 +56,9 @@ class App(ctk.CTk):
         self.screens = {}
         self.history = []
         self.history_index = -1
-        self.data = {"wifi": [], "passkeys": [], "codes": []}
-        self.deleted = {"usernames": [], "codes": []}
+        self.vault = Vault()
+        self.data = self.vault.data
+        self.deleted = self.vault.deleted
 
     # ---------------- Screen Management ----------------
     def close_app(self):
@@ -1,14 +1,10 @@
 import os
 import cv2
-import hashlib
-import random
-import string
-import requests
 import customtkinter as ctk
 from tkinter import messagebox
 from PIL import Image, ImageDraw
 from customtkinter import CTkImage
-from zxcvbn import zxcvbn
+from credcore import Vault, check_hibp, check_password_strength, generate_password
 
 # ---------------- Paths ----------------
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -20,41 +16,6 @@ VIDEO_PATH = os.path.join(VIDEOS_DIR, "creadlocklogo.mp4")
 def resource_path(*paths):
     return os.path.join(BASE_DIR, *paths)
 
-def check_hibp(password):
-    sha1pass = hashlib.sha1(password.encode('utf-8')).hexdigest().upper()
-    prefix, suffix = sha1pass[:5], sha1pass[5:]
-    url = f"https://api.pwnedpasswords.com/range/{prefix}"
-    try:
-        resp = requests.get(url, timeout=5)
-        if resp.status_code != 200:
-            return -1
-        for line in resp.text.splitlines():
-            h, count = line.split(":")
-            if h == suffix:
-                return int(count)
-        return 0
-    except:
-        return -2
-
-def check_password_strength(password):
-    if not password:
-        return 0, "Password is empty"
-    score = zxcvbn(password)['score']
-    suggestions = ["Very Weak","Weak","Fair","Good","Strong"]
-    return score, suggestions[min(score, 4)]
-
-def generate_password(length=16):
-    chars = string.ascii_letters + string.digits + string.punctuation
-    password = [
-        random.choice(string.ascii_lowercase),
-        random.choice(string.ascii_uppercase),
-        random.choice(string.digits),
-        random.choice(string.punctuation)
-    ]
-    password += [random.choice(chars) for _ in range(length - len(password))]
-    random.shuffle(password)
-    return "".join(password)
-
 def create_gradient(width, height, start_color, end_color):
     gradient = Image.new("RGB", (width, height))
     draw = ImageDraw.Draw(gradient)
@@ -94,8 +55,9 @@ class App(ctk.CTk):
         super().__init__()
         self.withdraw()
         self.screens = {}
-        self.data = {"wifi": [], "passkeys": [], "codes": []}
-        self.deleted = {"usernames": [], "codes": []}
+        self.vault = Vault()
+        self.data = self.vault.data
+        self.deleted = self.vault.deleted
         self.protocol("WM_DELETE_WINDOW", self.close_app)
         self.after(100, self.start_app)
 
@@ -0,0 +1,255 @@
+"""Screen (Toplevel window) management for the Credlock GUI."""
+import time
+from collections import Counter, OrderedDict
+
+from credcore.tracing import tracer
+
+SCREEN_CACHE_SIZE = 3  # built screens kept alive, not counting pinned ones
+PINNED_SCREENS = ("main",)
+IDLE_SLICE_MS = 8  # work done per idle callback before yielding back to Tk
+INPUT_GRACE_MS = 250  # idle work waits this long after the last key or click
+FIRST_SCREENFUL = 30  # rows built synchronously so the screen is never blank
+FRAME_BUDGET_MS = 12  # row building per batch, leaving room for Tk to draw a frame
+
+
+# --------------------- Screen Cache ---------------------
+class ScreenCache:
+    """
+    Keeps at most `capacity` built screens, evicting the least recently used.
+
+    Screens are cheap to rebuild because they only render what is in the
+    vault, so an evicted screen is destroyed (widgets, gradient image and all)
+    and built again by `build(name)` the next time it is opened. Pinned screens
+    and the one on display are never evicted. Behaves like the plain dict
+    App.screens used to be for lookups: `name in cache`, `cache[name]`, values().
+    """
+
+    def __init__(self, build, capacity=SCREEN_CACHE_SIZE, pinned=PINNED_SCREENS):
+        self.build = build
+        self.capacity = capacity
+        self.pinned = set(pinned)
+        self.windows = OrderedDict()
+        self.visits = Counter()
+        self.current = None
+
+    # ---------------- dict-like access ----------------
+    def __contains__(self, name):
+        return name in self.windows
+
+    def __getitem__(self, name):
+        return self.windows[name]
+
+    def __len__(self):
+        return len(self.windows)
+
+    def get(self, name, default=None):
+        return self.windows.get(name, default)
+
+    def values(self):
+        return list(self.windows.values())
+
+    # ---------------- LRU ----------------
+    def open(self, name):
+        """Returns the screen for `name`, building it if needed, and marks it current."""
+        self.visits[name] += 1
+        window = self.windows.get(name)
+        if window is None or not window.winfo_exists():
+            window = self.build(name)
+            self.windows[name] = window
+        self.windows.move_to_end(name)
+        self.current = name
+        self.evict()
+        return window
+
+    def room(self):
+        """How many more unpinned screens fit before eviction starts."""
+        return max(self.capacity - self._evictable_count(), 0)
+
+    def adopt(self, name, window):
+        """Adds a screen built ahead of time (e.g. by IdleBuilder), withdrawn and coldest in the LRU."""
+        if name in self.windows:
+            window.destroy()
+            return
+        window.withdraw()
+        self.windows[name] = window
+        self.windows.move_to_end(name, last=False)  # first to go if space is needed
+        self.evict()
+
+    def likely_next(self, candidates, limit=1):
+        """The most visited of `candidates` that are not built yet."""
+        ranked = sorted(candidates, key=lambda name: -self.visits[name])
+        return [name for name in ranked if name not in self.windows][:limit]
+
+    def _evictable_count(self):
+        return sum(1 for name in self.windows if name not in self.pinned)
+
+    def evict(self):
+        while self._evictable_count() > self.capacity:
+            victim = next((name for name in self.windows
+                           if name not in self.pinned and name != self.current), None)
+            if victim is None:
+                return
+            self.discard(victim)
+
+    def discard(self, name):
+        window = self.windows.pop(name, None)
+        if window is not None and window.winfo_exists():
+            window.destroy()
+
+    def clear(self):
+        for name in list(self.windows):
+            self.discard(name)
+
+
+# --------------------- Idle Builder ---------------------
+def run_steps(steps):
+    """Drains a build generator synchronously and returns its result."""
+    while True:
+        try:
+            next(steps)
+        except StopIteration as done:
+            return done.value
+
+
+class IdleBuilder:
+    """
+    Runs generator-based build tasks in small time slices while Tk is idle.
+
+    Each task is a generator that yields between cheap steps and returns the
+    finished window. Slices are scheduled with after_idle, so they only run
+    once pending events are handled, last at most IDLE_SLICE_MS, and pause
+    entirely for INPUT_GRACE_MS after any key press or click.
+    """
+
+    def __init__(self, root, slice_ms=IDLE_SLICE_MS, grace_ms=INPUT_GRACE_MS):
+        self.root = root
+        self.slice = slice_ms / 1000
+        self.grace_ms = grace_ms
+        self.tasks = OrderedDict()  # name -> (steps, on_done)
+        self.last_input = 0.0
+        self.scheduled = None
+        root.bind_all("<KeyPress>", self.note_input, add="+")
+        root.bind_all("<ButtonPress>", self.note_input, add="+")
+
+    def note_input(self, event=None):
+        self.last_input = time.perf_counter()
+
+    def idle(self):
+        """True once INPUT_GRACE_MS have passed since the last key press or click."""
+        return (time.perf_counter() - self.last_input) * 1000 >= self.grace_ms
+
+    def pending(self, name):
+        return name in self.tasks
+
+    def submit(self, name, steps, on_done=None):
+        self.tasks[name] = (steps, on_done)
+        self._schedule()
+
+    def finish(self, name):
+        """Runs the rest of a task now (the user wants it) and returns its result."""
+        steps, _ = self.tasks.pop(name)
+        return run_steps(steps)
+
+    def cancel_all(self):
+        for steps, _ in self.tasks.values():
+            steps.close()
+        self.tasks.clear()
+        if self.scheduled is not None:
+            self.root.after_cancel(self.scheduled)
+            self.scheduled = None
+
+    def _schedule(self, delay_ms=0):
+        if self.scheduled is None and self.tasks:
+            self.scheduled = self.root.after(delay_ms, lambda: self.root.after_idle(self._run))
+
+    def _run(self):
+        self.scheduled = None
+        idle_for = (time.perf_counter() - self.last_input) * 1000
+        if idle_for < self.grace_ms:
+            self._schedule(int(self.grace_ms - idle_for) + 1)
+            return
+
+        deadline = time.perf_counter() + self.slice
+        while self.tasks and time.perf_counter() < deadline:
+            name, (steps, on_done) = next(iter(self.tasks.items()))
+            try:
+                next(steps)
+            except StopIteration as done:
+                del self.tasks[name]
+                if on_done is not None:
+                    on_done(done.value)
+        self._schedule()
+
+
+# --------------------- Chunked Renderer ---------------------
+class ChunkedRenderer:
+    """
+    Builds a list of rows cooperatively instead of in one long Tk callback.
+
+    The first FIRST_SCREENFUL rows are built at once; the remaining rows are
+    built in batches of at most FRAME_BUDGET_MS scheduled with after(), so the
+    window keeps repainting and reacting to input. Starting a new render for
+    the same key cancels the old one. While tracing is on, the time to the
+    first screenful and to the last row are recorded as render.first_screen
+    and render.full (F12 overlay, trace export).
+    """
+
+    def __init__(self, root, budget_ms=FRAME_BUDGET_MS, first_rows=FIRST_SCREENFUL):
+        self.root = root
+        self.budget = budget_ms / 1000
+        self.first_rows = first_rows
+        self.jobs = {}  # key -> pending after() id
+
+    def render(self, key, container, items, make_row, on_empty=None):
+        """Renders make_row(container, item) for every item of the (lazy) iterable `items`."""
+        self.cancel(key)
+        items = iter(items)
+        rows = 0
+        started = time.perf_counter()
+
+        def build(limit=None, deadline=None):
+            nonlocal rows
+            for item in items:
+                make_row(container, item)
+                rows += 1
+                if limit is not None and rows >= limit:
+                    return True
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return True
+            return False  # exhausted
+
+        def finish():
+            self.jobs.pop(key, None)
+            if tracer.enabled:
+                tracer.record("render.full", started, time.perf_counter() - started)
+            if rows == 0 and on_empty is not None:
+                on_empty()
+
+        def step():
+            if not container.winfo_exists():
+                self.jobs.pop(key, None)
+                return
+            if build(deadline=time.perf_counter() + self.budget):
+                self.jobs[key] = self.root.after(1, step)
+            else:
+                finish()
+
+        more = build(limit=self.first_rows)
+        if tracer.enabled:
+            tracer.record("render.first_screen", started, time.perf_counter() - started)
+        if more:
+            self.jobs[key] = self.root.after(1, step)
+        else:
+            finish()
+
+    def rendering(self, key):
+        return key in self.jobs
+
+    def cancel(self, key):
+        job = self.jobs.pop(key, None)
+        if job is not None:
+            self.root.after_cancel(job)
+
+    def cancel_all(self):
+        for key in list(self.jobs):
+            self.cancel(key)
@@ -0,0 +1,58 @@
+import pytest
+
+from benchmarks.hibp_server import RangeDataset, start_server
+from credcore.corpus import BreachCorpus, CorpusSync, prefix_at
+
+RANGES = 60
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture
+def server():
+    server = start_server(dataset=RangeDataset(seed=1))
+    yield server
+    server.shutdown()
+
+
+def sync(corpus, server, **kwargs):
+    syncer = CorpusSync(corpus, server.url, workers=4, batch=10)
+    try:
+        return syncer.run(0, RANGES, **kwargs)
+    finally:
+        syncer.close()
+
+
+def test_interrupted_sync_resumes_at_its_cursor(tmp_path, server):
+    corpus = BreachCorpus(str(tmp_path / "hibp.db"))
+
+    def stop_after_two_batches(done, total):
+        if done >= 20:
+            raise Interrupted
+
+    with pytest.raises(Interrupted):
+        sync(corpus, server, progress=stop_after_two_batches)
+    assert int(corpus.get_meta("sync_cursor")) == 20
+    assert len(corpus) >= 20
+
+    stats = sync(corpus, server)
+    assert stats["updated"] + stats["unchanged"] == RANGES - 20  # only the rest was fetched
+    assert len(corpus) == RANGES
+    assert corpus.get_meta("sync_cursor") is None
+    assert corpus.range_counts(prefix_at(0)) == server.dataset.counts(prefix_at(0))
+    corpus.close()
+
+
+def test_resync_revalidates_with_304(tmp_path, server):
+    corpus = BreachCorpus(str(tmp_path / "hibp.db"))
+    assert sync(corpus, server)["updated"] == RANGES
+    served = server.stats["served"]
+
+    server.dataset.touch([prefix_at(3), prefix_at(41)])
+    stats = sync(corpus, server)
+    assert (stats["updated"], stats["unchanged"], stats["failed"]) == (2, RANGES - 2, 0)
+    assert server.stats["served"] == served + 2  # the rest cost a 304 and no body
+    assert corpus.range_counts(prefix_at(41)) == server.dataset.counts(prefix_at(41))
+    corpus.close()
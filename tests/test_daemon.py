@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+from credcore import daemon
+
+
+def test_socket_dir_must_be_private(tmp_path, monkeypatch):
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.setattr(daemon.tempfile, "gettempdir", lambda: str(tmp_path))
+    path = daemon.default_socket_path()
+    assert os.path.dirname(path) == str(tmp_path / f"credlock-{os.getuid()}")
+
+    os.chmod(os.path.dirname(path), 0o755)  # e.g. created beforehand by someone else
+    with pytest.raises(RuntimeError):
+        daemon.default_socket_path()
+
+
+def test_socket_dir_prefers_runtime_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    assert daemon.default_socket_path() == str(tmp_path / "credlock-vault.sock")
+
+
+def test_remote_iteration_is_paged(tmp_path, monkeypatch):
+    from credcore import client
+
+    monkeypatch.setattr(client, "FETCH_PAGE_SIZE", 7)
+    path = str(tmp_path / "vault.sock")
+    vault, started = client.attach_vault(path)
+    assert started
+    try:
+        entries = [(f"net{i}", f"pw{i}") for i in range(30)]
+        vault.add_many("wifi", entries)
+        assert list(vault.data["wifi"]) == entries
+        assert list(vault.search("wifi", "net", offset=5, limit=10)) == entries[5:15]
+        assert len(vault.data["wifi"]) == 30
+        assert vault.index.present([("wifi", "net1"), ("wifi", "cafe")]) == {("wifi", "net1")}
+    finally:
+        vault.client.call(client.protocol.SHUTDOWN)
+        vault.close()
+
+
+def test_requests_after_close_fail_at_once(tmp_path):
+    from credcore import client
+
+    path = str(tmp_path / "vault.sock")
+    vault, _ = client.attach_vault(path)
+    pending = vault.client.submit(client.protocol.SHUTDOWN)
+    assert pending.result(5) == "bye"
+    vault.client.reader.join(5)  # the daemon hung up
+    with pytest.raises(client.DaemonError):
+        vault.client.submit(client.protocol.PING)
+    vault.close()
+
+
+def test_relative_export_paths_are_the_callers(tmp_path, monkeypatch):
+    from credcore import client
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "backups").mkdir()
+    vault, _ = client.attach_vault(str(tmp_path / "vault.sock"))
+    try:
+        vault.add_many("wifi", [("home", "pw")])
+        vault.export("out.csv")
+        vault.backup("backups")
+    finally:
+        vault.client.call(client.protocol.SHUTDOWN)
+        vault.close()
+    assert (tmp_path / "out.csv").exists()
+    assert any((tmp_path / "backups").iterdir())
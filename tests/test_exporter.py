@@ -0,0 +1,54 @@
+import gzip
+import json
+import time
+
+from credcore import exporter
+from credcore.vault import Vault
+
+
+def read_backup(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [(record["section"], record["name"]) for record in map(json.loads, f)]
+
+
+def test_incremental_backup_holds_only_changes(tmp_path):
+    vault = Vault()
+    vault.add_many("wifi", [("home", "pw1"), ("office", "pw2")])
+    full, count = vault.backup(str(tmp_path))
+    assert full.endswith("-full.jsonl.gz") and count == 2
+
+    vault.add("codes", "door", "1234")
+    vault.delete("wifi", "home", "pw1")
+    incremental, _ = vault.backup(str(tmp_path))
+    assert incremental.endswith("-incremental.jsonl.gz")
+    assert sorted(read_backup(incremental)) == [("data", "door"), ("deleted", "home")]
+    assert read_backup(vault.backup(str(tmp_path))[0]) == []
+
+
+def test_change_as_the_backup_starts_is_not_lost(tmp_path, monkeypatch):
+    vault = Vault()
+    vault.add("wifi", "home", "pw1")
+    vault.backup(str(tmp_path))
+    clock = time.time
+    pending = [lambda: vault.add("wifi", "office", "pw2")]
+
+    def start_time():  # the change lands right before the backup reads the clock
+        if pending:
+            pending.pop()()
+        return clock()
+
+    monkeypatch.setattr(exporter.time, "time", start_time)
+    first, _ = vault.backup(str(tmp_path))
+    monkeypatch.undo()
+    second, _ = vault.backup(str(tmp_path))
+    assert ("data", "office") in read_backup(first) + read_backup(second)
+
+
+def test_backups_in_the_same_instant_do_not_overwrite(tmp_path, monkeypatch):
+    monkeypatch.setattr(exporter.time, "time", lambda: 1700000000.25)
+    vault = Vault()
+    vault.add("wifi", "home", "pw1")
+    first, _ = vault.backup(str(tmp_path), full=True)
+    second, _ = vault.backup(str(tmp_path), full=True)
+    assert first != second
+    assert read_backup(first) == read_backup(second) == [("data", "home")]
@@ -0,0 +1,46 @@
+import string
+from collections import Counter
+
+import pytest
+
+from credcore import generator
+from credcore.generator import CHARSET_POLICIES, byte_table, generate_passwords
+
+
+@pytest.mark.parametrize("policy", sorted(CHARSET_POLICIES))
+def test_every_password_holds_each_class(policy):
+    classes = CHARSET_POLICIES[policy]
+    passwords = generate_passwords(500, length=len(classes), charset_policy=policy)
+    assert len(passwords) == 500
+    for password in passwords:
+        assert len(password) == len(classes)
+        assert all(any(ch in cls for ch in password) for cls in classes)
+
+
+def test_custom_classes_and_bad_arguments():
+    passwords = generate_passwords(50, length=6, charset_policy=("ab", "XY", "7"))
+    assert all(set(password) <= set("abXY7") and "7" in password for password in passwords)
+    with pytest.raises(ValueError):
+        generate_passwords(1, length=3)  # four classes in "full"
+    with pytest.raises(ValueError):
+        generate_passwords(1, charset_policy="nope")
+    with pytest.raises(ValueError):
+        generate_passwords(1, charset_policy=("", ""))
+
+
+def test_rejection_sampling_is_unbiased():
+    alphabet = string.ascii_letters + string.digits  # 62 characters: 256 is not a multiple
+    table, rejected = byte_table(alphabet)
+    assert rejected == bytes(range(248, 256))
+    kept = bytes(range(248)).translate(table, rejected).decode("ascii")
+    assert Counter(kept) == {ch: 4 for ch in alphabet}  # every character from exactly 4 byte values
+    assert bytes(range(248, 256)).translate(table, rejected) == b""
+
+
+def test_candidates_missing_a_class_are_dropped_whole(monkeypatch):
+    # the first block is all lowercase, so no candidate from it survives
+    blocks = iter([b"a" * 64, bytes([0, 26, 52, 62] * 16)])
+    monkeypatch.setattr(generator.os, "urandom", lambda size: next(blocks))
+    passwords = generate_passwords(2, length=4)
+    alphabet = "".join(CHARSET_POLICIES["full"])
+    assert passwords == [alphabet[0] + alphabet[26] + alphabet[52] + alphabet[62]] * 2
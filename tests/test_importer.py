@@ -0,0 +1,15 @@
+from credcore.vault import Vault
+
+
+def test_import_signatures_reach_the_similarity_index():
+    vault = Vault()
+    vault.add("wifi", "home", "Summer2024!")
+    chunks = [[("office", "Summer2025!"), ("cafe", "x7#kQ2!vLp")], [("gone", "Summer2026!")]]
+    importer = vault.importer("wifi", chunks)
+    while importer.step() is not None:
+        pass
+    vault.delete("wifi", "gone", "Summer2026!")  # deleted before its signature was collected
+    importer.close()
+
+    assert {key for key, _ in vault.similar.similar("Summer2023!")} == {("wifi", "home"), ("wifi", "office")}
+    assert ("wifi", "gone") not in vault.similar.entries
@@ -0,0 +1,44 @@
+import math
+from itertools import product
+
+import pytest
+
+from credcore.policy import AMBIGUOUS_CHARACTERS, PasswordPolicy, charset_entropy, score_from_entropy
+
+
+def brute_force_count(classes, length):
+    alphabet = "".join(classes)
+    return sum(all(any(ch in cls for ch in word) for cls in classes) for word in product(alphabet, repeat=length))
+
+
+@pytest.mark.parametrize("classes, length", [(("ab", "XYZ"), 4), (("ab", "X", "12"), 5), (("abc",), 3)])
+def test_charset_entropy_counts_the_valid_strings(classes, length):
+    bits = charset_entropy([len(cls) for cls in classes], length)
+    assert 2 ** bits == pytest.approx(brute_force_count(classes, length))
+
+
+def test_length_is_the_shortest_that_meets_the_target():
+    policy = PasswordPolicy(classes="hex", min_entropy_bits=64, min_length=1)
+    assert policy.length == 16  # 4 bits per hex character
+    assert policy.bits == pytest.approx(64)
+    policy = PasswordPolicy(classes="full", min_entropy_bits=80, min_length=1)
+    assert policy.entropy(policy.length - 1) < 80 <= policy.bits
+    assert all(len(password) == policy.length for password in policy.generate_many(20))
+
+
+def test_excluding_ambiguous_characters():
+    policy = PasswordPolicy(exclude_ambiguous=True)
+    assert not set("".join(policy.classes)) & set(AMBIGUOUS_CHARACTERS)
+    assert all(not set(password) & set(AMBIGUOUS_CHARACTERS) for password in policy.generate_many(50))
+    with pytest.raises(ValueError):
+        PasswordPolicy(classes=("Il1", "O0"), exclude_ambiguous=True)
+
+
+def test_passphrase_entropy_and_score():
+    words = [f"word{i}" for i in range(1024)]  # 10 bits each
+    policy = PasswordPolicy(passphrase=True, wordlist=words, min_entropy_bits=45, min_length=1)
+    assert policy.length == 5 and policy.bits == pytest.approx(50)
+    password, bits = policy.generate()
+    assert len(password.split("-")) == 5 and bits == policy.bits
+    assert [score_from_entropy(b) for b in (5, math.log2(1e3), 25, 30, 40)] == [0, 1, 2, 3, 4]
+    assert policy.describe()[0] == 4
@@ -0,0 +1,41 @@
+import pytest
+
+from credcore import protocol
+
+
+VALUES = [None, True, False, 0, -(1 << 63), 3.5, "", "héllo", b"\x00\xff", (), ("wifi", ("net", "pw"), 7, None)]
+
+
+@pytest.mark.parametrize("value", VALUES)
+def test_value_round_trip(value):
+    assert protocol.decode(protocol.encode(value)) == value
+
+
+def test_frames_split_across_reads():
+    data = protocol.frame(protocol.SEARCH, 7, ("wifi", "", 0, 10)) + protocol.frame(protocol.OK, 8, [1, 2])
+    buffer = bytearray(data[:5])
+    assert protocol.read_frames(buffer) == [] and len(buffer) == 5  # half a header stays put
+    buffer += data[5:-3]
+    assert protocol.read_frames(buffer) == [(protocol.SEARCH, 7, ("wifi", "", 0, 10))]
+    buffer += data[-3:]
+    assert protocol.read_frames(buffer) == [(protocol.OK, 8, (1, 2))]
+    assert not buffer
+
+
+def test_oversized_frame_is_rejected_from_its_header():
+    buffer = bytearray(protocol.HEADER.pack(protocol.MAX_FRAME + 1, protocol.OK, 1))
+    with pytest.raises(protocol.ProtocolError):
+        protocol.read_frames(buffer)
+    at_limit = bytearray(protocol.HEADER.pack(protocol.MAX_FRAME, protocol.OK, 1))
+    assert protocol.read_frames(at_limit) == []  # waits for the payload
+
+
+@pytest.mark.parametrize("data", [b"x", b"s\x00\x00\x00\x05ab", b"i\x00", b"nn", b"s\x00\x00\x00\x01\xff"])
+def test_malformed_payloads(data):
+    with pytest.raises(protocol.ProtocolError):
+        protocol.decode(data)
+
+
+def test_unencodable_value():
+    with pytest.raises(protocol.ProtocolError):
+        protocol.encode({"a": 1})
@@ -0,0 +1,77 @@
+from credcore.reaudit import REAUDIT_INTERVAL, RETRY_INTERVAL, BreachReauditor, TokenBucket
+from credcore.sqlite_store import SqliteVault
+from credcore.vault import Vault
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def run_checks(reauditor):
+    """Runs steps until the batch in flight has been collected; returns the newly pwned keys."""
+    pwned = reauditor.step()
+    while reauditor.pending is not None:
+        reauditor.pending.result()
+        pwned += reauditor.step()
+    return pwned
+
+
+def test_token_bucket_limits_bursts_and_rate():
+    clock = Clock(0.0)
+    bucket = TokenBucket(rate=2.0, capacity=3, clock=clock)
+    assert [bucket.take() for _ in range(4)] == [True, True, True, False]
+    clock.now = 1.0
+    assert bucket.available() == 2
+    clock.now = 100.0
+    assert bucket.available() == 3
+
+
+def test_records_are_due_again_only_after_the_interval():
+    clock = Clock()
+    checked = []
+    vault = Vault()
+    vault.add_many("wifi", [("home", "pw1"), ("office", "pw2")])
+    vault.add("codes", "door", "1234")  # codes are values, never checked
+
+    def check(secret):
+        checked.append(secret)
+        return 3 if secret == "pw1" else (-2 if secret == "bad" else 0)
+
+    reauditor = BreachReauditor(vault, check, bucket=TokenBucket(rate=0, capacity=100), clock=clock)
+    assert run_checks(reauditor) == [("wifi", "home", 3)]
+    assert sorted(checked) == ["pw1", "pw2"]
+    assert reauditor.next_due(10) == []
+
+    vault.delete("wifi", "office", "pw2")
+    vault.add("wifi", "office", "bad")  # a new secret is due at once, a failed check after RETRY_INTERVAL
+    run_checks(reauditor)
+    assert checked[-1] == "bad"
+    clock.now += RETRY_INTERVAL
+    assert reauditor.next_due(10) == [("wifi", "office", "bad")]
+    clock.now += REAUDIT_INTERVAL
+    assert len(reauditor.next_due(10)) == 2
+    reauditor.close()
+
+
+def test_schedule_survives_a_restart_and_forgets_deleted_records(tmp_path):
+    path = str(tmp_path / "vault.db")
+    clock = Clock()
+    vault = SqliteVault(path)
+    vault.add_many("wifi", [("home", "pw1"), ("office", "pw2")])
+    reauditor = BreachReauditor(vault, lambda secret: 5 if secret == "pw1" else 0, clock=clock)
+    run_checks(reauditor)
+    reauditor.close()
+    vault.delete("wifi", "office", "pw2")
+    assert len(vault.breach_checks) == 1
+    vault.close()
+
+    vault = SqliteVault(path)
+    reauditor = BreachReauditor(vault, lambda secret: 0, clock=clock)
+    assert reauditor.next_due(10) == []
+    assert reauditor.known_pwned() == [("wifi", "home", 5)]
+    reauditor.close()
+    vault.close()
@@ -0,0 +1,39 @@
+import threading
+
+from credcore.retention import DeletedBin, RetentionPolicy
+from credcore.vault import Vault
+
+
+def test_export_while_bin_changes(tmp_path):
+    vault = Vault(RetentionPolicy(max_age=None, max_count=None))
+    vault.add_many("wifi", [(f"net{i}", f"pw{i}") for i in range(2000)])
+    vault.delete_many("wifi", [(f"net{i}", f"pw{i}") for i in range(1000)])
+    stop = threading.Event()
+
+    def churn():
+        i = 2000
+        while not stop.is_set():
+            vault.add("wifi", f"net{i}", "pw")
+            vault.delete("wifi", f"net{i}", "pw")
+            vault.restore("wifi", "net0", "pw0")
+            vault.delete("wifi", "net0", "pw0")
+            i += 1
+
+    thread = threading.Thread(target=churn)
+    thread.start()
+    try:
+        for n in range(20):
+            assert vault.export(str(tmp_path / f"export{n}.jsonl")) >= 2000
+    finally:
+        stop.set()
+        thread.join()
+
+
+def test_iteration_is_a_snapshot():
+    deleted = DeletedBin(RetentionPolicy(max_age=None, max_count=None))
+    deleted.add_many("codes", [("a", "1"), ("b", "2")])
+    seen = []
+    for tombstone in deleted:
+        deleted.add_many("codes", [("c", "3")])
+        seen.append(tombstone.name)
+    assert seen == ["a", "b"]
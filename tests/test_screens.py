@@ -0,0 +1,75 @@
+from screens import ScreenCache
+
+
+class FakeWindow:
+    """Stands in for a Toplevel: only what ScreenCache touches."""
+
+    def __init__(self, name):
+        self.name = name
+        self.alive = True
+        self.withdrawn = False
+
+    def winfo_exists(self):
+        return self.alive
+
+    def destroy(self):
+        self.alive = False
+
+    def withdraw(self):
+        self.withdrawn = True
+
+
+def make_cache(capacity=2):
+    built = []
+
+    def build(name):
+        built.append(name)
+        return FakeWindow(name)
+
+    return ScreenCache(build, capacity=capacity, pinned=("main",)), built
+
+
+def test_least_recently_used_screen_is_evicted_and_destroyed():
+    cache, built = make_cache()
+    main = cache.open("main")
+    wifi = cache.open("wifi")
+    codes = cache.open("codes")
+    cache.open("wifi")  # codes is now the least recently used
+    deleted = cache.open("deleted")
+    assert set(cache.windows) == {"main", "wifi", "deleted"}
+    assert not codes.alive and wifi.alive and deleted.alive
+    assert main.alive  # pinned screens do not count and are never evicted
+
+    cache.open("codes")  # rebuilt after eviction, pushing out wifi
+    assert built == ["main", "wifi", "codes", "deleted", "codes"]
+    assert not wifi.alive and "wifi" not in cache
+
+
+def test_current_screen_is_kept_even_over_capacity():
+    cache, _ = make_cache(capacity=0)
+    wifi = cache.open("wifi")
+    assert "wifi" in cache and wifi.alive
+    cache.open("codes")
+    assert not wifi.alive and list(cache.windows) == ["codes"]
+
+
+def test_adopted_screens_go_first():
+    cache, _ = make_cache()
+    cache.open("wifi")
+    prebuilt = FakeWindow("codes")
+    cache.adopt("codes", prebuilt)
+    assert prebuilt.withdrawn and list(cache.windows) == ["codes", "wifi"]
+    assert cache.room() == 0
+    cache.open("deleted")
+    assert not prebuilt.alive and set(cache.windows) == {"wifi", "deleted"}
+
+    duplicate = FakeWindow("wifi")
+    cache.adopt("wifi", duplicate)  # already built: the spare is destroyed
+    assert not duplicate.alive and cache["wifi"] is not duplicate
+
+
+def test_a_destroyed_screen_is_rebuilt():
+    cache, built = make_cache()
+    cache.open("wifi").destroy()  # e.g. closed by the window manager
+    cache.open("wifi")
+    assert built == ["wifi", "wifi"]
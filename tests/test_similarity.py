@@ -0,0 +1,18 @@
+from credcore import similarity
+from credcore.similarity import SimilarityIndex
+
+
+def test_pairs_are_verified_once_and_crowded_buckets_become_groups(monkeypatch):
+    monkeypatch.setattr(similarity, "MAX_BUCKET", 5)
+    index = SimilarityIndex()
+    for i in range(20):
+        index.add("wifi", f"stem{i}", f"Summer{i}!")
+    index.add("wifi", "a", "correct-horse-battery")
+    index.add("passkeys", "b", "correct-horse-battery2")
+
+    pairs = index.pairs()
+    assert len(pairs) == len({(a, b) for a, b, _ in pairs})
+    assert (("passkeys", "b"), ("wifi", "a")) in {(a, b) for a, b, _ in pairs}
+    groups = index.groups()
+    assert len(groups[0]) > 5
+    assert all(key[1].startswith("stem") for key in groups[0])
@@ -0,0 +1,102 @@
+import os
+import sqlite3
+import stat
+import time
+
+import pytest
+
+from credcore.sqlite_store import SqliteVault
+
+
+def test_delete_after_purge_all_can_be_restored(tmp_path):
+    vault = SqliteVault(str(tmp_path / "vault.db"))
+    vault.add_many("wifi", [("home", "pw1"), ("office", "pw2")])
+    vault.delete("wifi", "home", "pw1")
+    vault.purge_all_deleted().clear()
+
+    vault.delete("wifi", "office", "pw2")
+    assert list(vault.search_deleted()) == [("user", "office", "pw2", "wifi")]
+    vault.restore("wifi", "office", "pw2")
+    assert list(vault.search("wifi")) == [("office", "pw2")]
+    assert len(vault.deleted) == 0
+    vault.close()
+
+
+def test_old_bin_table_is_upgraded(tmp_path):
+    path = str(tmp_path / "vault.db")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE deleted (id INTEGER PRIMARY KEY, category TEXT NOT NULL, name TEXT NOT NULL,
+                              secret TEXT NOT NULL, deleted_at REAL NOT NULL);
+        CREATE TABLE meta (key TEXT PRIMARY KEY, value);
+        INSERT INTO meta VALUES ('deleted_floor', 5);
+    """)
+    conn.close()
+
+    vault = SqliteVault(path)
+    vault.add("codes", "door", "1234")
+    vault.delete("codes", "door", "1234")
+    assert list(vault.search_deleted()) == [("code", "door", "1234")]
+    vault.close()
+
+
+def test_import_skips_existing_names_in_one_lookup(tmp_path):
+    vault = SqliteVault(str(tmp_path / "vault.db"))
+    vault.add_many("wifi", [("home", "pw1"), ("office", "pw2")])
+    assert vault.index.present({("wifi", "home"), ("wifi", "cafe"), ("codes", "home")}) == {("wifi", "home")}
+
+    importer = vault.importer("wifi", [[("home", "x"), ("cafe", "pw3"), ("cafe", "pw4"), ("office", "y")]])
+    assert importer.step() == [("cafe", "pw3")]
+    assert importer.skipped == 3
+    vault.close()
+
+
+def test_memory_database_is_rejected():
+    with pytest.raises(ValueError):
+        SqliteVault(":memory:")
+
+
+def test_similarity_index_is_built_in_the_background(tmp_path):
+    path = str(tmp_path / "vault.db")
+    vault = SqliteVault(path)
+    vault.add_many("wifi", [("home", "Summer2024!"), ("office", "Winter2024?")])
+    vault.close()
+
+    vault = SqliteVault(path)
+    vault.add("wifi", "cafe", "Summer2025!")  # before or during the build: either way it is indexed
+    vault.delete("wifi", "office", "Winter2024?")
+    deadline = time.monotonic() + 10
+    while not vault.similar.ready and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert set(vault.similar.entries) == {("wifi", "home"), ("wifi", "cafe")}
+    assert vault.similarity_index() is vault.similar
+    vault.close()
+
+
+def test_store_files_are_private_and_secrets_are_not_indexed(tmp_path):
+    path = str(tmp_path / "vault.db")
+    vault = SqliteVault(path)
+    vault.add_many("wifi", [("home", "pw1"), ("office", "pw1")])
+    for suffix in ("", "-wal", "-shm"):
+        assert stat.S_IMODE(os.stat(path + suffix).st_mode) == 0o600
+    assert vault.reuse.groups() == [[("wifi", "home"), ("wifi", "office")]]
+    vault.close()
+
+
+def test_secret_index_of_old_stores_is_replaced(tmp_path):
+    path = str(tmp_path / "vault.db")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE entries (id INTEGER PRIMARY KEY, category TEXT NOT NULL, name TEXT NOT NULL,
+                              secret TEXT NOT NULL, changed REAL NOT NULL);
+        CREATE INDEX entries_secret ON entries (secret);
+        INSERT INTO entries (category, name, secret, changed) VALUES ('wifi', 'home', 'pw1', 0);
+    """)
+    conn.close()
+
+    vault = SqliteVault(path)
+    vault.add("passkeys", "mail", "pw1")
+    assert set(vault.reuse.users("pw1")) == {("wifi", "home"), ("passkeys", "mail")}
+    indexed = [row[0] for row in vault.conn.execute("SELECT sql FROM sqlite_master WHERE type = 'index'")]
+    assert not any("secret" in sql for sql in indexed if sql)
+    vault.close()